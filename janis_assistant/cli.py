@@ -12,7 +12,6 @@ from janis_assistant.management.workflowmanager import WorkflowManager
 from janis_assistant.management.envvariables import EnvVariables
 
 from janis_core import InputQualityType, HINTS, HintEnum, SupportedTranslation, Tool
-from janis_core.ingestion import SupportedIngestion
 from janis_core.utils.logger import Logger, LogLevel
 
 from janis_assistant.__meta__ import DOCS_URL
@@ -47,7 +46,7 @@ from janis_assistant.utils import (
     dict_to_yaml_string,
 )
 
-from janis_assistant.utils.batchrun import BatchRunRequirements
+from janis_assistant.utils.batchrun import BatchRunRequirements, BatchRunMode
 from janis_assistant.utils.dateutils import DateUtil
 from janis_assistant.validation import ValidationRequirements
 
@@ -59,6 +58,38 @@ class DefaultHelpArgParser(argparse.ArgumentParser):
         sys.exit(2)
 
 
+class LazyChoices:
+    """
+    Choices for an argument, that are only loaded when argparse needs them (the
+    argument is used, or the help is printed). For choices that come from modules
+    that are slow to import, that most commands don't otherwise need.
+    """
+
+    def __init__(self, get_choices):
+        self._get_choices = get_choices
+        self._choices = None
+
+    def get_choices(self):
+        if self._choices is None:
+            self._choices = list(self._get_choices())
+        return self._choices
+
+    def __contains__(self, item):
+        return item in self.get_choices()
+
+    def __iter__(self):
+        return iter(self.get_choices())
+
+    def __len__(self):
+        return len(self.get_choices())
+
+
+def get_supported_ingestions():
+    from janis_core.ingestion import SupportedIngestion
+
+    return SupportedIngestion.all()
+
+
 def process_args(sysargs=None):
     cmds = {
         "version": do_version,
@@ -220,6 +251,11 @@ def add_watch_args(parser):
     parser.add_argument(
         "--monochrome", help="produce non-colour text only", action="store_true"
     )
+    parser.add_argument(
+        "--expand-scatters",
+        help="show every shard of large scatters, rather than a summary of their statuses",
+        action="store_true",
+    )
     return parser
 
 
@@ -299,7 +335,7 @@ def add_translate_args(parser: argparse.ArgumentParser):
     parser.add_argument(
         "--from",
         help="Language of infile. Will be autodetected if not supplied",
-        choices=SupportedIngestion.all(),
+        choices=LazyChoices(get_supported_ingestions),
         type=str
     )
     parser.add_argument(
@@ -631,6 +667,12 @@ def add_args_for_general_wf_prepare(parser):
         help="(UNIMPLEMENTED) Janis won't use the digest cache to lookup containers. This cache is shared between tasks "
         "($JANIS_CONFIGDIR/janis.db) so it might cause locking issues if you run lots of workflows at once",
     )
+    container_args.add_argument(
+        "--skip-translation-cache",
+        action="store_true",
+        help="Translate the workflow again, rather than reusing a cached translation of the same workflow "
+        "(translation_cache_location in the janis config, $JANIS_CONFIGDIR/translation_cache by default).",
+    )
 
     engine_args = parser.add_argument_group("engine arguments")
 
@@ -656,6 +698,20 @@ def add_args_for_general_wf_prepare(parser):
         "--batchrun-groupby",
         help="Which field should we use to group the samples by, this field should be UNIQUE in the run.",
     )
+    batchrun_group.add_argument(
+        "--batchrun-mode",
+        choices=[m.value for m in BatchRunMode],
+        default=BatchRunMode.unrolled.value,
+        help="'unrolled' creates a step for each group, 'scatter' scatters a single step over the groups "
+        "(which keeps the workflow and its metadata small for large batches).",
+    )
+    batchrun_group.add_argument(
+        "--split",
+        type=int,
+        help="Split the groups into this many submissions, each with their own engine and "
+        "task database, that are submitted in the background. The submission ID that's "
+        "printed is the parent, that collects the status and outputs of the others.",
+    )
 
     # filescheme
 
@@ -699,6 +755,11 @@ def add_args_for_general_wf_prepare(parser):
         action="store_true",
         help="BETA: Ask Janis to run a managed MySQL for persistence with Cromwell",
     )
+    beta_args.add_argument(
+        "--shared-mysql",
+        action="store_true",
+        help="BETA: Like --mysql, but share one MySQL instance between your submissions on this host",
+    )
     beta_args.add_argument(
         "--no-database",
         action="store_true",
@@ -821,6 +882,12 @@ def add_query_args(parser):
     statuses = [v.value for v in TaskStatus.all()]
     parser.add_argument("--status", help="workflow status", choices=statuses)
     parser.add_argument("--name", help="workflow name")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-read the status of unfinished workflows from their task directories "
+        "(eg: if the janis process was killed before it could record its status)",
+    )
 
     return parser
 
@@ -945,7 +1012,12 @@ def do_watch(args):
     monochrome = args.monochrome
 
     wm = ConfigManager.get_from_path_or_submission_lazy(wid, readonly=False)
-    wm.watch(seconds=refresh, brief=brief, monochrome=monochrome)
+    wm.watch(
+        seconds=refresh,
+        brief=brief,
+        monochrome=monochrome,
+        expand_scatters=args.expand_scatters,
+    )
 
 
 def do_resume(args):
@@ -1044,12 +1116,19 @@ def prepare_from_args(args, run_prepare_processing: bool) -> Tuple[PreparedJob,
     if args.batchrun:
         Logger.info("Will prepare batch run")
         batchrun = BatchRunRequirements(
-            fields=args.batchrun_fields, groupby=args.batchrun_groupby
+            fields=args.batchrun_fields,
+            groupby=args.batchrun_groupby,
+            mode=args.batchrun_mode,
+            split=args.split,
         )
+    elif args.split:
+        raise Exception("The '--split' argument requires '--batchrun'")
 
     db_type: Optional[DatabaseTypeToUse] = None
     if args.no_database:
         db_type = DatabaseTypeToUse.none
+    elif args.shared_mysql:
+        db_type = DatabaseTypeToUse.shared
     elif args.mysql:
         db_type = DatabaseTypeToUse.managed
 
@@ -1083,6 +1162,7 @@ def prepare_from_args(args, run_prepare_processing: bool) -> Tuple[PreparedJob,
         container_override=parse_container_override_format(args.container_override),
         skip_digest_lookup=args.skip_digest_lookup,
         skip_digest_cache=args.skip_digest_cache,
+        skip_translation_cache=args.skip_translation_cache,
         hints={
             k[5:]: v
             for k, v in vars(args).items()
@@ -1212,7 +1292,9 @@ def do_query(args):
         status = TaskStatus(args.status.lower())
 
     name = args.name
-    tasks = ConfigManager(db_path=None).query_tasks(status=status, name=name)
+    tasks = ConfigManager(db_path=None).query_tasks(
+        status=status, name=name, refresh=args.refresh
+    )
 
     prepared = [
         (
@@ -60,6 +60,13 @@ class Container(ABC):
     def exec_command(self, command):
         pass
 
+    def remove_instance_if_exists(self):
+        """
+        Remove a container that's left over with this instancename (eg: from a
+        janis process that was killed), so we can start a new one with this name.
+        """
+        pass
+
     @abstractmethod
     def ensure_downloaded(self):
         pass
@@ -86,6 +86,17 @@ class Docker(Container):
             )
             raise e
 
+    def remove_instance_if_exists(self):
+        if not self.instancename:
+            return
+        cmd = ["docker", "rm", "-f", self.instancename]
+        try:
+            subprocess.check_output(cmd, stderr=subprocess.STDOUT)
+            Logger.info(f"Removed existing docker container '{self.instancename}'")
+        except subprocess.CalledProcessError as e:
+            # most likely there was no container with this name
+            Logger.debug(f"Didn't remove docker container '{self.instancename}': {e}")
+
     def exec_command(self, command):
 
         cmd = ["docker", "exec", "-i", self.dockerid]
@@ -144,6 +144,17 @@ class Singularity(Container):
                 f"Couldn't stop singularity instance '{self.instancename}': {e}"
             )
 
+    def remove_instance_if_exists(self):
+        if not self.instancename:
+            return
+        cmd = ["singularity", "instance", "stop", self.instancename]
+        try:
+            subprocess.check_output(cmd, stderr=subprocess.STDOUT)
+            Logger.info(f"Stopped existing singularity instance '{self.instancename}'")
+        except subprocess.CalledProcessError as e:
+            # most likely there was no instance with this name
+            Logger.debug(f"Didn't stop singularity instance '{self.instancename}': {e}")
+
     def exec_command(self, command):
         cmd = ["singularity", "run", "instance://" + self.instancename]
         cmd.extend(command) if isinstance(command, list) else cmd.append(command)
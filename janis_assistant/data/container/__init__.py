@@ -1,8 +1,11 @@
-from typing import List, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
 import os
 
 from janis_assistant.data.models.preparedjob import PreparedJob
 from janis_assistant.management.configuration import JanisConfiguration
+from janis_assistant.management.envvariables import EnvVariables
 
 from janis_assistant.data.container.parse_pattern import (
     docker_string_regex,
@@ -10,44 +13,79 @@ from janis_assistant.data.container.parse_pattern import (
 )
 from janis_assistant.data.container.info import *
 from janis_assistant.data.container.registries import *
+from janis_assistant.data.container.digestcache import (
+    DigestCache,
+    DEFAULT_DIGEST_CACHE_TTLS,
+)
 
 in_memory_cache = {}
+# {(cache_location, ttls): DigestCache}, so we only open each cache once
+digest_caches = {}
+digest_caches_lock = threading.Lock()
 
 
 def get_digests_from_containers(
-    containers: List[str], cache_location: str, skip_cache=False
+    containers: List[str],
+    cache_location: str,
+    skip_cache=False,
+    max_concurrent_lookups: Optional[int] = None,
+    cache_ttls: Optional[Dict[str, Optional[int]]] = None,
 ) -> Dict[str, str]:
+    """
+    Looks up the digests of the (unique) containers, first in the cache (in one query)
+    and then concurrently from their registries.
+    :param max_concurrent_lookups: Defaults to $JANIS_DIGESTLOOKUPCONCURRENCY (8)
+    :param cache_ttls: {tag pattern: seconds} before a cached digest expires, see DEFAULT_DIGEST_CACHE_TTLS
+    """
+    containers = list(dict.fromkeys(containers))
     retval = {}
-    for container in containers:
-        digest = get_digest_from_container(
-            container, cache_location=cache_location, skip_cache=skip_cache
+    if not skip_cache:
+        retval = try_lookup_many_in_cache(
+            containers, cache_location=cache_location, ttls=cache_ttls
+        )
+
+    to_lookup = [c for c in containers if c not in retval]
+    if not to_lookup:
+        return retval
+
+    max_workers = (
+        max_concurrent_lookups or EnvVariables.digest_lookup_concurrency.resolve(True)
+    )
+    Logger.debug(
+        f"Looking up {len(to_lookup)} container digests ({len(retval)} were cached)"
+    )
+    found = {}
+    # eg: JANIS_DIGESTLOOKUPCONCURRENCY=0, which ThreadPoolExecutor would reject
+    max_workers = max(1, min(max_workers, len(to_lookup)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        digests = executor.map(get_digest_from_registry, to_lookup)
+        for container, digest in zip(to_lookup, digests):
+            if digest:
+                found[container] = digest
+
+    if found and not skip_cache:
+        try_write_digests_to_cache(
+            cache_location=cache_location, digests=found, ttls=cache_ttls
         )
-        if digest:
-            retval[container] = digest
 
+    retval.update(found)
     return retval
 
 
 def get_digest_from_container(container: str, cache_location: str, skip_cache=False):
-    try:
-        if not skip_cache:
-            from_cache = try_lookup_in_cache(container, cache_location=cache_location)
-            if from_cache:
-                return from_cache
+    return get_digests_from_containers(
+        [container], cache_location=cache_location, skip_cache=skip_cache
+    ).get(container)
+
 
+def get_digest_from_registry(container: str) -> Optional[str]:
+    try:
         ci = ContainerInfo.parse(container)
 
         if not ci.chash:
             registry = ContainerRegistry.from_host(ci.host).to_registry()
             digest = registry.get_digest(ci)
-            new_container = ci.to_string(chash=digest)
-            if not skip_cache:
-                try_write_digest_to_cache(
-                    cache_location=cache_location,
-                    container=container,
-                    container_with_contents=new_container,
-                )
-            return new_container
+            return ci.to_string(chash=digest)
         else:
             Logger.debug(
                 f"Not getting hash for '{container}' has parsing things there's already a hash."
@@ -57,57 +95,47 @@ def get_digest_from_container(container: str, cache_location: str, skip_cache=Fa
         Logger.critical(f"Couldn't get digest for {str(container)}: {str(e)}")
 
 
-def get_cache_path_from_container(cache_location: str, container: str) -> str:
+def get_digest_cache(cache_location: str, ttls=None) -> DigestCache:
+    key = (cache_location, str(ttls))
+    with digest_caches_lock:
+        if key not in digest_caches:
+            digest_caches[key] = DigestCache(cache_location, ttls=ttls)
+        return digest_caches[key]
 
-    os.makedirs(cache_location, exist_ok=True)
-    container_cache_path = os.path.join(
-        cache_location, ContainerInfo.convert_to_filename(container)
-    )
-    return container_cache_path
+
+def try_lookup_many_in_cache(
+    containers: List[str], cache_location: str, ttls=None
+) -> Dict[str, str]:
+    found = {c: in_memory_cache[c] for c in containers if c in in_memory_cache}
+    to_lookup = [c for c in containers if c not in found]
+    if not to_lookup:
+        return found
+    try:
+        from_cache = get_digest_cache(cache_location, ttls).lookup_many(to_lookup)
+        Logger.log(f"Found {len(from_cache)} cached digests in {cache_location}")
+        in_memory_cache.update(from_cache)
+        found.update(from_cache)
+    except Exception as e:
+        Logger.debug(f"Couldn't load digests from cache ({cache_location}): {e}")
+    return found
 
 
 def try_lookup_in_cache(container: str, cache_location: str) -> Optional[str]:
-    if container in in_memory_cache:
-        return in_memory_cache[container]
+    return try_lookup_many_in_cache([container], cache_location).get(container)
 
-    container_cache_path = get_cache_path_from_container(
-        cache_location=cache_location, container=container
-    )
-    if not os.path.exists(container_cache_path):
-        return None
-    try:
-        with open(container_cache_path, "r") as f:
-            cached_container = f.read().strip()
-            Logger.log(f"Found cached digest of {container} at {container_cache_path}")
-            in_memory_cache[container] = cached_container
-            return cached_container
 
+def try_write_digests_to_cache(cache_location: str, digests: Dict[str, str], ttls=None):
+    in_memory_cache.update(digests)
+    try:
+        get_digest_cache(cache_location, ttls).write_many(digests)
     except Exception as e:
-        Logger.debug(
-            "Couldn't load container from cache, even though it existed: " + str(e)
-        )
-        return None
+        Logger.debug(f"Couldn't cache digests to ({cache_location}) for reason: {e}")
 
 
 def try_write_digest_to_cache(
     cache_location: str, container: str, container_with_contents
 ):
-    in_memory_cache[container] = container_with_contents
-    container_cache_path = get_cache_path_from_container(
-        cache_location=cache_location, container=container
-    )
-    if os.path.exists(container_cache_path):
-        return Logger.log(
-            f"Went to write digest to cache path, but this file already existed: {container_cache_path}"
-        )
-
-    try:
-        with open(container_cache_path, "w+") as f:
-            f.write(container_with_contents)
-    except Exception as e:
-        Logger.debug(
-            f"Couldn't cache digest to path ({container_cache_path}) for reason: {str(e)}"
-        )
+    try_write_digests_to_cache(cache_location, {container: container_with_contents})
 
 
 if __name__ == "__main__":
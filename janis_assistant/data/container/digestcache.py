@@ -0,0 +1,216 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from typing import Dict, List, Optional, Union
+
+from janis_core import Logger
+
+from janis_assistant.data.container.info import ContainerInfo
+from janis_assistant.data.dbproviderbase import DbProviderBase
+from janis_assistant.data.models.base import DatabaseObject, DatabaseObjectField
+from janis_assistant.utils.dateutils import DateUtil
+
+DIGEST_CACHE_FILENAME = "digests.db"
+
+# {tag pattern: seconds}, the first matching pattern is used, None means never expire.
+# Mutable tags are refreshed daily, versioned tags are cached forever.
+DEFAULT_DIGEST_CACHE_TTLS = {
+    "latest": 24 * 60 * 60,
+    "master": 24 * 60 * 60,
+    "main": 24 * 60 * 60,
+    "dev*": 24 * 60 * 60,
+    "nightly*": 24 * 60 * 60,
+    "*": None,
+}
+
+
+class DigestCacheRow(DatabaseObject):
+    @classmethod
+    def keymap(cls) -> List[DatabaseObjectField]:
+        return [
+            DatabaseObjectField("key", dbalias="container", is_primary=True),
+            DatabaseObjectField("digest"),
+            DatabaseObjectField("timestamp"),
+        ]
+
+    @classmethod
+    def table_schema(cls):
+        return """
+        container       STRING NOT NULL,
+        digest          STRING NOT NULL,
+        timestamp       STRING NOT NULL,
+        """
+
+    def __init__(self, key: str, digest: str, timestamp: Union[str, datetime] = None):
+        """
+        :param key: The container (through ContainerInfo.convert_to_filename, to match the old cache)
+        :param digest: The container with the digest
+        """
+        self.key = key
+        self.digest = digest
+
+        if not timestamp:
+            timestamp = DateUtil.now()
+        elif not isinstance(timestamp, datetime):
+            timestamp = DateUtil.parse_iso(timestamp)
+        self.timestamp = timestamp
+
+
+class DigestCacheDbProvider(DbProviderBase[DigestCacheRow]):
+    table_name = "digests"
+    CURRENT_SCHEMA_VERSION = 2
+    # SQLite's default limit of variables in a query is 999
+    QUERY_CHUNK_SIZE = 500
+
+    def __init__(self, connection, readonly=False):
+        super().__init__(
+            DigestCacheRow,
+            db=connection,
+            readonly=readonly,
+            tablename=DigestCacheDbProvider.table_name,
+            scopes={},
+        )
+
+    def get_migrations(self):
+        return {
+            2: lambda cursor: self.migrate_datetimes_to_epoch_micros(
+                cursor, ["timestamp"]
+            )
+        }
+
+    def get_by_keys(self, keys: List[str]) -> Dict[str, DigestCacheRow]:
+        rows = {}
+        for i in range(0, len(keys), self.QUERY_CHUNK_SIZE):
+            chunk = keys[i : i + self.QUERY_CHUNK_SIZE]
+            where = f"container IN ({', '.join('?' for _ in chunk)})"
+            rows.update({r.key: r for r in self.get(where=(where, chunk)) or []})
+        return rows
+
+    def upsert_many(self, rows: List[DigestCacheRow]):
+        """
+        Other janis processes might write the same key at the same time, so rather
+        than tracking which rows exist (like insert_or_update_many), we replace them.
+        """
+        keys = [t.dbalias for t in self.get_keymap()]
+        prepared = [r.prepare_changes(None)[0] for r in rows]
+        with self.with_cursor() as cursor:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {self._tablename} ({', '.join(keys)}) "
+                f"VALUES ({', '.join('?' for _ in keys)})",
+                [tuple(p.get(k) for k in keys) for p in prepared],
+            )
+        self.commit()
+
+
+class DigestCache:
+    """
+    A cache of container -> container with digest, in a single SQLite database in the
+    cache directory, that can be shared by multiple janis processes.
+
+    Digests of tags that match a pattern in ttls expire after that many seconds.
+    """
+
+    def __init__(self, cache_location: str, ttls: Dict[str, Optional[int]] = None):
+        self.cache_location = cache_location
+        self.ttls = DEFAULT_DIGEST_CACHE_TTLS if ttls is None else ttls
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_location, exist_ok=True)
+        path = os.path.join(cache_location, DIGEST_CACHE_FILENAME)
+        is_new = not os.path.exists(path)
+
+        # the timeout is how long we'll wait for another janis process to finish writing
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._provider = DigestCacheDbProvider(self._connection)
+
+        if is_new:
+            self.migrate_from_files()
+
+    @staticmethod
+    def get_key(container: str) -> str:
+        return ContainerInfo.convert_to_filename(container)
+
+    def get_ttl(self, container: str) -> Optional[int]:
+        try:
+            tag = ContainerInfo.parse(container).tag
+        except Exception:
+            tag = None
+        for pattern, ttl in self.ttls.items():
+            if fnmatch(tag or "", pattern):
+                return ttl
+        return None
+
+    def is_expired(self, container: str, row: DigestCacheRow) -> bool:
+        ttl = self.get_ttl(container)
+        if ttl is None:
+            return False
+        if row.timestamp is None:
+            return True
+        return DateUtil.secs_difference(row.timestamp, DateUtil.now()) > ttl
+
+    def lookup_many(self, containers: List[str]) -> Dict[str, str]:
+        """
+        :return: {container: container_with_digest} for the containers in the (unexpired) cache
+        """
+        keys = {c: self.get_key(c) for c in containers}
+        with self._lock:
+            rows = self._provider.get_by_keys(list(set(keys.values())))
+
+        found = {}
+        for container, key in keys.items():
+            row = rows.get(key)
+            if row is None:
+                continue
+            if self.is_expired(container, row):
+                Logger.debug(f"Cached digest of {container} has expired")
+                continue
+            found[container] = row.digest
+        return found
+
+    def write_many(self, digests: Dict[str, str]):
+        """
+        :param digests: {container: container_with_digest}
+        """
+        rows = [DigestCacheRow(self.get_key(c), d) for c, d in digests.items()]
+        with self._lock:
+            self._provider.upsert_many(rows)
+
+    def migrate_from_files(self):
+        """
+        Digests used to be cached as a file per container in the cache directory,
+        move these into the database (keeping when they were cached).
+        """
+        rows = []
+        to_remove = []
+        with os.scandir(self.cache_location) as it:
+            for entry in it:
+                if not entry.is_file() or entry.name.startswith(DIGEST_CACHE_FILENAME):
+                    continue
+                try:
+                    with open(entry.path) as f:
+                        digest = f.read().strip()
+                    mtime = entry.stat().st_mtime
+                    timestamp = datetime.fromtimestamp(mtime, timezone.utc)
+                    rows.append(DigestCacheRow(entry.name, digest, timestamp))
+                    to_remove.append(entry.path)
+                except Exception as e:
+                    Logger.debug(f"Couldn't migrate cached digest {entry.path}: {e}")
+
+        if not rows:
+            return
+
+        Logger.info(
+            f"Migrating {len(rows)} cached digests into {DIGEST_CACHE_FILENAME}"
+        )
+        with self._lock:
+            self._provider.upsert_many(rows)
+        for path in to_remove:
+            try:
+                os.remove(path)
+            except OSError as e:
+                Logger.debug(f"Couldn't remove migrated digest cache file {path}: {e}")
+
+    def close(self):
+        self._connection.close()
@@ -1,7 +1,12 @@
-from typing import Optional
+from typing import Optional, Dict, Tuple
+import base64
 import json
+import threading
+import time
 from enum import Enum
 from abc import ABC, abstractmethod
+from http import client
+from email.message import Message
 
 from urllib import request, parse, error
 
@@ -16,6 +21,153 @@ MANIFEST_LIST_V2_MEDIA_TYPE = (
 )
 
 
+class RegistryConnectionPool:
+    """
+    Keeps a keep-alive connection open per host (per thread, as http.client
+    connections can't be shared between threads), so looking up lots of
+    containers from the same registry doesn't do a TCP + TLS handshake each time.
+    """
+
+    MAX_REDIRECTS = 5
+
+    def __init__(self, timeout: int = 30):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @staticmethod
+    def get_proxy(scheme: str, host: str) -> Optional[parse.SplitResult]:
+        """
+        The proxy (from $HTTP(S)_PROXY, unless the host is in $NO_PROXY) like urlopen
+        """
+        proxy = request.getproxies().get(scheme)
+        if not proxy or request.proxy_bypass(host):
+            return None
+        if "://" not in proxy:
+            proxy = "http://" + proxy
+        return parse.urlsplit(proxy)
+
+    @staticmethod
+    def get_proxy_headers(proxy: parse.SplitResult) -> Dict[str, str]:
+        if proxy.username is None:
+            return {}
+        user = parse.unquote(proxy.username)
+        password = parse.unquote(proxy.password or "")
+        token = base64.b64encode(f"{user}:{password}".encode()).decode()
+        return {"Proxy-Authorization": f"Basic {token}"}
+
+    def create_connection(
+        self, scheme: str, host: str
+    ) -> Tuple[client.HTTPConnection, Optional[Dict[str, str]]]:
+        """
+        :return: (connection, proxy headers), the proxy headers are None unless
+            requests go to an http proxy (with the full url as the path)
+        """
+        proxy = self.get_proxy(scheme, host)
+        if proxy is None:
+            if scheme == "https":
+                return client.HTTPSConnection(host, timeout=self.timeout), None
+            return client.HTTPConnection(host, timeout=self.timeout), None
+
+        proxy_host = proxy.netloc.rsplit("@", 1)[-1]
+        if scheme == "https":
+            # tunnel through the proxy (with CONNECT), so TLS is still end to end
+            connection = client.HTTPSConnection(proxy_host, timeout=self.timeout)
+            connection.set_tunnel(host, headers=self.get_proxy_headers(proxy))
+            return connection, None
+
+        connection = client.HTTPConnection(proxy_host, timeout=self.timeout)
+        return connection, self.get_proxy_headers(proxy)
+
+    def get_connection(
+        self, scheme: str, host: str
+    ) -> Tuple[client.HTTPConnection, Optional[Dict[str, str]]]:
+        connections = self._local.__dict__.setdefault("connections", {})
+        key = (scheme, host)
+        if key not in connections:
+            connections[key] = self.create_connection(scheme, host)
+        return connections[key]
+
+    def close_connection(self, scheme: str, host: str):
+        connections = self._local.__dict__.get("connections", {})
+        connection, _ = connections.pop((scheme, host), (None, None))
+        if connection is not None:
+            connection.close()
+
+    def request(
+        self, method: str, url: str, headers: Dict[str, str] = None, redirects=0
+    ) -> Tuple[int, Message, bytes]:
+        """
+        :return: (status, headers, body), raises urllib.error.HTTPError for 4xx / 5xx
+        """
+        parsed = parse.urlsplit(url)
+        path = parsed.path + ("?" + parsed.query if parsed.query else "")
+
+        for attempt in range(2):
+            connection, proxy_headers = self.get_connection(
+                parsed.scheme, parsed.netloc
+            )
+            try:
+                if proxy_headers is None:
+                    connection.request(method, path, headers=headers or {})
+                else:
+                    connection.request(
+                        method, url, headers={**(headers or {}), **proxy_headers}
+                    )
+                response = connection.getresponse()
+                body = response.read()
+                break
+            except (client.HTTPException, OSError):
+                # the server might have closed our idle connection, so try a new one
+                self.close_connection(parsed.scheme, parsed.netloc)
+                if attempt > 0:
+                    raise
+
+        if response.status in (301, 302, 303, 307, 308):
+            if redirects >= self.MAX_REDIRECTS:
+                raise error.HTTPError(
+                    url, response.status, "Too many redirects", response.headers, None
+                )
+            location = parse.urljoin(url, response.headers.get("Location"))
+            return self.request(method, location, headers, redirects=redirects + 1)
+
+        if response.status >= 400:
+            raise error.HTTPError(
+                url, response.status, response.reason, response.headers, None
+            )
+
+        return response.status, response.headers, body
+
+
+class TokenCache:
+    """
+    Bearer tokens, by the url we requested it from (ie: per registry + repository scope)
+    """
+
+    # https://docs.docker.com/registry/spec/auth/token/#token-response-fields
+    DEFAULT_EXPIRES_IN_SECONDS = 60
+    # don't use a token that's about to expire
+    EXPIRY_MARGIN_SECONDS = 10
+
+    def __init__(self):
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            token, expires = self._tokens.get(key, (None, 0))
+        return token if expires > time.time() else None
+
+    def set(self, key: str, token: str, expires_in: Optional[int] = None):
+        expires = time.time() - self.EXPIRY_MARGIN_SECONDS
+        expires += expires_in or self.DEFAULT_EXPIRES_IN_SECONDS
+        with self._lock:
+            self._tokens[key] = (token, expires)
+
+
+connection_pool = RegistryConnectionPool()
+token_cache = TokenCache()
+
+
 class ContainerRegistry(Enum):
     dockerhub = "docker"
     quay = "quay"
@@ -81,9 +233,11 @@ class ContainerRegistryBase(ABC):
         try:
             req = self.build_request(info, token)
             Logger.debug(f"Requesting digest from: {req.full_url}")
-            with request.urlopen(req) as response:
-                rheaders = response.headers
-                digest = rheaders.get("etag", rheaders.get("Docker-Content-Digest"))
+            # a HEAD returns the same headers, without downloading the manifest
+            _, rheaders, _ = connection_pool.request(
+                "HEAD", req.full_url, headers=dict(req.header_items())
+            )
+            digest = rheaders.get("etag", rheaders.get("Docker-Content-Digest"))
 
             if digest is not None:
                 digest = digest.replace("'", "").replace('"', "")
@@ -99,11 +253,20 @@ class ContainerRegistryBase(ABC):
         req = self.build_token_request(info)
         if req is None:
             return None
+
+        token = token_cache.get(req.full_url)
+        if token:
+            return token
+
         Logger.log(f"Requesting auth token for {info}: " + req.full_url)
-        response = request.urlopen(req)
-        data = response.read()
-        res = json.loads(data.decode(response.info().get_content_charset("utf-8")))
-        return res.get("token")
+        _, headers, data = connection_pool.request(
+            "GET", req.full_url, headers=dict(req.header_items())
+        )
+        res = json.loads(data.decode(headers.get_content_charset("utf-8")))
+        token = res.get("token")
+        if token:
+            token_cache.set(req.full_url, token, res.get("expires_in"))
+        return token
 
 
 class DockerHubContainerRegistry(ContainerRegistryBase):
@@ -9,6 +9,7 @@ from typing import (
     TypeVar,
     Generic,
     Set,
+    Callable,
 )
 from abc import abstractmethod
 from sqlite3 import Connection, Cursor, OperationalError
@@ -27,6 +28,8 @@ from janis_assistant.data.models.base import (
 
 T = TypeVar("T")
 
+SCHEMA_VERSIONS_TABLENAME = "schema_versions"
+
 
 class DbBase:
     def __init__(self, db: Connection, tablename: str, readonly: bool):
@@ -34,6 +37,68 @@ class DbBase:
         self._tablename = tablename
         self._readonly = readonly
 
+    def table_exists(self, cursor: Cursor, tablename: str = None) -> bool:
+        row = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (tablename or self._tablename,),
+        ).fetchone()
+        return row is not None
+
+    def get_schema_version(self, cursor: Cursor) -> Optional[int]:
+        if not self.table_exists(cursor, SCHEMA_VERSIONS_TABLENAME):
+            return None
+        row = cursor.execute(
+            f"SELECT version FROM {SCHEMA_VERSIONS_TABLENAME} WHERE tablename = ?",
+            (self._tablename,),
+        ).fetchone()
+        return int(row[0]) if row else None
+
+    def commit_schema_changes(self):
+        # stamping the schema version (or a migration) opens a write transaction,
+        # which would hold the database's write lock until the next commit
+        if self._db.in_transaction:
+            self._db.commit()
+
+    def set_schema_version(self, cursor: Cursor, version: int):
+        cursor.execute(
+            f"""\
+            CREATE TABLE IF NOT EXISTS {SCHEMA_VERSIONS_TABLENAME} (
+                tablename   STRING NOT NULL,
+                version     INTEGER NOT NULL,
+                timestamp   STRING,
+                PRIMARY KEY (tablename)
+            )"""
+        )
+        cursor.execute(
+            f"REPLACE INTO {SCHEMA_VERSIONS_TABLENAME} (tablename, version, timestamp) VALUES (?, ?, ?)",
+            (self._tablename, version, str(DateUtil.now())),
+        )
+
+    def migrate_datetimes_to_epoch_micros(
+        self, cursor: Cursor, columns: List[str], tablename: str = None
+    ):
+        """
+        Datetimes used to be stored as str(datetime), convert them to the epoch
+        microseconds they're stored as now.
+        """
+        tablename = tablename or self._tablename
+        for column in columns:
+            rows = cursor.execute(
+                f"SELECT rowid, {column} FROM {tablename} WHERE typeof({column}) = 'text'"
+            ).fetchall()
+            updates = []
+            for rowid, value in rows:
+                if value.isdigit():
+                    continue
+                d = DateUtil.parse_iso(value)
+                if d is not None:
+                    updates.append((DateUtil.to_epoch_micros(d), rowid))
+            cursor.executemany(
+                f"UPDATE {tablename} SET {column} = ? WHERE rowid = ?", updates
+            )
+            if updates:
+                Logger.debug(f"Converted {len(updates)} {tablename}.{column} values")
+
     def commit(self):
         if self._readonly:
             Logger.critical("Attempting to commit to readonly connection")
@@ -53,6 +118,10 @@ class DbBase:
 
 
 class DbProviderBase(DbBase, Generic[T]):
+    # Bump this and add a migration in get_migrations when the table changes.
+    # Tables created before schema versions were recorded are treated as version 1.
+    CURRENT_SCHEMA_VERSION = 1
+
     def __init__(
         self,
         base_type: Type[DatabaseObject],
@@ -66,11 +135,22 @@ class DbProviderBase(DbBase, Generic[T]):
         self._base = base_type
 
         self._id_cache: Set = None
+        # {id_key: {dbalias: prepared_value}}, the values we last persisted for each row
+        self._snapshots: Dict[Tuple, Dict[str, any]] = {}
+        self._statement_cache: Dict[Tuple, str] = {}
+        self._idkeys_ordered: Optional[List[str]] = None
+        self._keymap: Optional[List[DatabaseObjectField]] = None
+        self._idkey_fields: Optional[List[DatabaseObjectField]] = None
 
         if not self._readonly:
             schema = self.table_schema()
             with self.with_cursor() as cursor:
+                table_existed = self.table_exists(cursor)
                 cursor.execute(schema)
+                self.migrate_schema_if_required(cursor, table_existed=table_existed)
+                for index_schema in self.index_schemas():
+                    cursor.execute(index_schema)
+            self.commit_schema_changes()
 
     def get(
         self,
@@ -156,22 +236,122 @@ class DbProviderBase(DbBase, Generic[T]):
         """
         return schema
 
+    def get_indexed_columns(self) -> List[Tuple[str, ...]]:
+        """
+        Every index is prefixed by the scopes (as every query is filtered by them):
+            - the id keys of tables that don't have a primary key (we match updates on them)
+            - any field that's declared with is_indexed=True
+        """
+        if self._base is None:
+            return []
+
+        dbaliases = {t.dbalias for t in self.get_keymap()}
+        scopes = [s for s in self._scopes if s in dbaliases]
+        indexes = []
+
+        if not self.get_primary_keys():
+            idkeys = self.get_id_keys_ordered()
+            indexes.append(
+                (
+                    *[s for s in scopes if s in idkeys],
+                    *[k for k in idkeys if k not in scopes],
+                )
+            )
+
+        for t in self.get_keymap():
+            if t.is_indexed:
+                indexes.append((*[s for s in scopes if s != t.dbalias], t.dbalias))
+
+        return indexes
+
+    def index_schemas(self) -> List[str]:
+        return [
+            f"CREATE INDEX IF NOT EXISTS {self._tablename}_{'_'.join(columns)}_idx "
+            f"ON {self._tablename} ({', '.join(columns)})"
+            for columns in self.get_indexed_columns()
+        ]
+
+    def get_migrations(self) -> Dict[int, Callable[[Cursor], None]]:
+        """
+        :return: {version: migration}, where the migration upgrades the table from (version - 1) to version.
+        """
+        return {}
+
+    def migrate_schema_if_required(self, cursor: Cursor, table_existed: bool):
+        version = self.get_schema_version(cursor)
+        if version is None:
+            # either brand new (so it's already the current schema), or it was created
+            # before we started recording schema versions.
+            version = 1 if table_existed else self.CURRENT_SCHEMA_VERSION
+            self.set_schema_version(cursor, version)
+
+        if version < self.CURRENT_SCHEMA_VERSION:
+            self.upgrade_schema(cursor, from_version=version)
+
+    def upgrade_schema(self, cursor: Cursor, from_version: int):
+        migrations = self.get_migrations()
+        for version in range(from_version + 1, self.CURRENT_SCHEMA_VERSION + 1):
+            migration = migrations.get(version)
+            if migration:
+                Logger.info(
+                    f"Upgrading the '{self._tablename}' table from version {version - 1} to {version}"
+                )
+                migration(cursor)
+            self.set_schema_version(cursor, version)
+        self.commit()
+
     def populate_cache_if_required(self):
         if self._id_cache is not None:
             return False
         self.populate_cache()
         return True
 
+    def get_id_keys_ordered(self) -> List[str]:
+        if self._idkeys_ordered is None:
+            # dict.fromkeys removes duplicates but keeps a stable order
+            self._idkeys_ordered = list(dict.fromkeys(self.get_id_keys()))
+        return self._idkeys_ordered
+
+    def get_keymap(self) -> List[DatabaseObjectField]:
+        if self._keymap is None:
+            self._keymap = self._base.keymap()
+        return self._keymap
+
     def populate_cache(self):
+        """
+        Load the id keys AND the currently persisted values of every row, so we
+        can work out which rows (and which columns) have changed since.
+        """
         self._id_cache = set()
-        idkeys = set(self.get_id_keys())
-        idkeys_ordered = list(idkeys)
-        prows = f"SELECT {', '.join(idkeys_ordered)} FROM {self._tablename}"
+        self._snapshots = {}
+
+        idkeys_ordered = self.get_id_keys_ordered()
+        keys = [t.dbalias for t in self.get_keymap()]
+        keys.extend(k for k in idkeys_ordered if k not in keys)
+        id_indices = [keys.index(k) for k in idkeys_ordered]
+
+        prows = f"SELECT {', '.join(keys)} FROM {self._tablename}"
         with self.with_cursor() as cursor:
             Logger.log("Running query: " + str(prows))
             rows = cursor.execute(prows).fetchall()
             for row in rows:
-                self._id_cache.add(row)
+                el_idkey = tuple(row[i] for i in id_indices)
+                self._id_cache.add(el_idkey)
+                self._snapshots[el_idkey] = {
+                    k: v for k, v in zip(keys, row) if v is not None
+                }
+
+    def get_id_key_for(self, el: T) -> Tuple:
+        if self._idkey_fields is None:
+            dbalias_map: Dict[str, DatabaseObjectField] = {
+                t.dbalias: t for t in self.get_keymap()
+            }
+            self._idkey_fields = [dbalias_map[k] for k in self.get_id_keys_ordered()]
+
+        return tuple(
+            prep_object_for_db(getattr(el, t.name), encode=t.encode)
+            for t in self._idkey_fields
+        )
 
     def filter_updates(
         self, jobs: List[T], add_inserts_to_cache=True
@@ -181,143 +361,152 @@ class DbProviderBase(DbBase, Generic[T]):
         updates = []
         inserts = []
 
-        idkeys = set(self.get_id_keys())
-        idkeys_ordered = list(idkeys)
-        dbalias_map: Dict[str, DatabaseObjectField] = {
-            t.dbalias: t for t in self._base.keymap()
-        }
-
-        prep_el_idkey = lambda job: tuple(
-            [
-                prep_object_for_db(
-                    getattr(job, dbalias_map[_k].name), encode=dbalias_map[_k].encode,
-                )
-                for _k in idkeys_ordered
-            ]
-        )
-
         for job in jobs:
-            el_idkey = prep_el_idkey(job)
+            el_idkey = self.get_id_key_for(job)
             if el_idkey in self._id_cache:
                 updates.append(job)
             else:
                 inserts.append(job)
-
-        for job in inserts:
-            el_idkey = prep_el_idkey(job)
-            self._id_cache.add(el_idkey)
+                if add_inserts_to_cache:
+                    self._id_cache.add(el_idkey)
 
         return updates, inserts
 
-    def insert_or_update_many(self, els: List[T]):
-        if len(els) == 0:
-            return
-        queries: Dict[str, List[List[any]]] = {}
-        update_separator = ",\n"
-        tab = "\t"
-
-        idkeys = set(self.get_id_keys())
-        idkeys_ordered = list(idkeys)
-        pkeys_ordered = self.get_primary_keys()
-        existing_keys = set()  # (*pkeys_ordered)
+    def get_update_statement(
+        self,
+        set_keys: Tuple[str, ...],
+        id_keys: Tuple[str, ...],
+        null_keys: Tuple[str, ...],
+    ) -> str:
+        """
+        Statements are cached per set of columns, which means that rows with the
+        same set of changes are grouped into the same executemany.
+        """
+        cache_key = ("UPDATE", set_keys, id_keys, null_keys)
+        statement = self._statement_cache.get(cache_key)
+        if statement is None:
+            # problem is we want to update matching on some fields when they are NULL, our WHERE statement
+            # should be something like:
+            #   WHERE id1 = ? AND id2 = ? AND id3 is null AND id4 is null
+            where = [
+                *(f"{k} = ?" for k in id_keys),
+                *(f"{k} is NULL" for k in null_keys),
+            ]
+            statement = f"""
+            UPDATE {self._tablename}
+                SET {', '.join(f'{k} = ?' for k in set_keys)}
+            WHERE
+                {" AND ".join(where)}
+            """
+            self._statement_cache[cache_key] = statement
+        return statement
+
+    def get_insert_statement(self, keys: Tuple[str, ...]) -> str:
+        cache_key = ("INSERT", keys)
+        statement = self._statement_cache.get(cache_key)
+        if statement is None:
+            statement = f"""
+            INSERT INTO {self._tablename}
+                ({', '.join(keys)})
+            VALUES
+                ({', '.join('?' for _ in keys)});
+            """
+            self._statement_cache[cache_key] = statement
+        return statement
 
-        # get all primary keys
+    def insert_or_update_many(self, els: List[T]) -> bool:
+        """
+        Insert the new rows, and update the columns that changed in existing ones.
+        :return: Whether any row was written
+        """
+        if len(els) == 0:
+            return False
+        # {statement: [(values, id_key, row_snapshot)]}
+        queries: Dict[str, List[Tuple[Tuple, Tuple, Dict[str, any]]]] = {}
 
-        dbalias_map: Dict[str, DatabaseObjectField] = {
-            t.dbalias: t for t in self._base.keymap()
-        }
+        idkeys_ordered = self.get_id_keys_ordered()
+        idkeys = set(idkeys_ordered)
+        keymap = self.get_keymap()
 
         updates, inserts = self.filter_updates(els)
 
-        def add_query(query, values):
+        def add_query(query, values, el_idkey, row):
             if query in queries:
-                queries[query].append(values)
+                queries[query].append((values, el_idkey, row))
             else:
-                queries[query] = [values]
+                queries[query] = [(values, el_idkey, row)]
 
+        nupdates, nskipped = 0, 0
         for job in updates:
-            keys, values = job.prepare_insert()
-            # el_pkeys = [getattr(job, dbalias_map[_k]) for _k in idkeys_ordered]
-
-            keys_np, values_np = [], []
-            for k, v in zip(keys, values):
-                if k in idkeys:
-                    continue
-
-                keys_np.append(k)
-                values_np.append(v)
-
-            # problem is we want to update matching on some fields when they are NULL, our WHERE statement
-            # should be something like:
-            #   WHERE id1 = ? AND id2 = ? AND id3 is null AND id4 is null
-
-            id_keyvalues = {
-                pkey: prep_object_for_db(
-                    getattr(job, dbalias_map[pkey].name),
-                    encode=dbalias_map[pkey].encode,
-                )
-                for pkey in idkeys_ordered
-            }
-            id_withvalues_keyvalue_ordered = [
-                (idkey, idvalue)
-                for idkey, idvalue in id_keyvalues.items()
-                if idvalue is not None
-            ]
-            id_withvalues_updater_keys = [
-                f"{idkey} = ?" for idkey, _ in id_withvalues_keyvalue_ordered
-            ]
-            id_withvalues_updater_values = [
-                idvalue for _, idvalue in id_withvalues_keyvalue_ordered
-            ]
-            id_novalues_updater_keys = [
-                f"{idkey} is NULL"
-                for idkey, idvalue in id_keyvalues.items()
-                if idvalue is None
-            ]
-
-            prepared_statement = f"""
-            UPDATE {self._tablename}
-                SET {', '.join(f'{k} = ?' for k in keys_np)}
-            WHERE
-                {" AND ".join([*id_withvalues_updater_keys, *id_novalues_updater_keys])}
-            """
+            el_idkey = self.get_id_key_for(job)
+            snapshot = self._snapshots.get(el_idkey)
+            row, changes = job.prepare_changes(snapshot, keymap=keymap)
+            set_keys = tuple(k for k in changes if k not in idkeys)
+            if not set_keys:
+                nskipped += 1
+                continue
+
+            nupdates += 1
+            id_keyvalues = list(zip(idkeys_ordered, el_idkey))
+            id_withvalues_keys = tuple(k for k, v in id_keyvalues if v is not None)
+            id_novalues_keys = tuple(k for k, v in id_keyvalues if v is None)
+
+            prepared_statement = self.get_update_statement(
+                set_keys, id_withvalues_keys, id_novalues_keys
+            )
             vtuple = (
-                *values_np,
-                *id_withvalues_updater_values,
+                *(changes[k] for k in set_keys),
+                *(v for v in el_idkey if v is not None),
             )
 
-            add_query(prepared_statement, vtuple)
+            add_query(prepared_statement, vtuple, el_idkey, row)
 
         for job in inserts:
-            keys, values = job.prepare_insert()
-            # el_pkeys = [getattr(job, dbalias_map[_k]) for _k in idkeys_ordered]
-            prepared_statement = f"""
-            INSERT INTO {self._tablename}
-                ({', '.join(keys)})
-            VALUES
-                ({', '.join(f'?' for _ in keys)});
-            """
-            add_query(prepared_statement, values)
+            row, _ = job.prepare_changes(None, keymap=keymap)
+            keys = tuple(row.keys())
+            add_query(
+                self.get_insert_statement(keys),
+                tuple(row.values()),
+                self.get_id_key_for(job),
+                row,
+            )
+
+        if nskipped:
+            Logger.log(
+                f"DB {self._tablename}: Skipped {nskipped} rows as they hadn't changed"
+            )
+        if not queries:
+            return False
 
         Logger.log(
-            f"DB {self._tablename}: Inserting {len(inserts)} and updating {len(updates)} rows"
+            f"DB {self._tablename}: Inserting {len(inserts)} and updating {nupdates} rows"
         )
+        written = False
         with self.with_cursor() as cursor:
             start = DateUtil.now()
-            if len(inserts) + len(updates) > 300:
+            if len(inserts) + nupdates > 300:
                 Logger.warn(
-                    f"DB '{self._tablename}' is inserting {len(inserts)} and updating {len(updates)} rows, this might take a while"
+                    f"DB '{self._tablename}' is inserting {len(inserts)} and updating {nupdates} rows, this might take a while"
                 )
-            for query, vvalues in queries.items():
+            for query, prepared in queries.items():
                 try:
-                    Logger.log(f"Running query: {query}\n\t: values: {vvalues}")
-                    cursor.executemany(query, vvalues)
+                    Logger.log(f"Running query ({len(prepared)} rows): {query}")
+                    cursor.executemany(query, [p[0] for p in prepared])
                 except OperationalError as e:
                     Logger.log_ex(e)
+                    continue
+
+                written = True
+                # only remember what we've successfully written
+                for _, el_idkey, row in prepared:
+                    self._snapshots[el_idkey] = {
+                        **self._snapshots.get(el_idkey, {}),
+                        **row,
+                    }
             seconds = (DateUtil.now() - start).total_seconds()
             if seconds > 2:
                 Logger.warn(
-                    f"DB '{self._tablename}' took {second_formatter(seconds)} to insert {len(inserts)} and update {len(updates)} rows"
+                    f"DB '{self._tablename}' took {second_formatter(seconds)} to insert {len(inserts)} and update {nupdates} rows"
                 )
 
-        return True
+        return written
@@ -5,5 +5,6 @@ class DatabaseTypeToUse(Enum):
     none = "none"
     existing = "existing"
     managed = "managed"
+    shared = "shared"
     filebased = "filebased"
     from_script = "from_script"
@@ -77,7 +77,7 @@ class TaskStatus(Enum):
             TaskStatus.ABORTING.value: "~x",
             TaskStatus.SUSPENDED.value: "II",
             TaskStatus.PREPARED.value: ":",
-            TaskStatus.EXECUTION_ENDED_SUCCESSFULLY: "%%",
+            TaskStatus.EXECUTION_ENDED_SUCCESSFULLY.value: "%%",
         }
         return __str[self.value]
 
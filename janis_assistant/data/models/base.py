@@ -4,10 +4,12 @@ import pickle
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
-from typing import List, Tuple, Union, Optional, Set
+from typing import List, Tuple, Union, Optional, Set, Dict
 
 from janis_core import Logger
 
+from janis_assistant.utils.dateutils import DateUtil
+
 
 def prep_object_for_db(val, encode: bool):
     prepped = _prepare_for_serialization(val)
@@ -23,7 +25,8 @@ def _prepare_for_serialization(val) -> Optional[any]:
     elif isinstance(val, Enum):
         return val.value
     elif isinstance(val, datetime):
-        return str(val)
+        # epoch microseconds, which are much cheaper to read back than a string
+        return DateUtil.to_epoch_micros(val)
     elif isinstance(val, list):
         return [_prepare_for_serialization(el) for el in val]
     elif isinstance(val, dict):
@@ -65,18 +68,76 @@ def unpickle_obj(obj):
         return None
 
 
+# Values of a KVDatabaseObject are prefixed with their format and its version.
+# Plain values (str, int, float, bool, and lists / dicts of them) are JSON, so
+# they're readable and don't depend on any Python classes, anything else is
+# pickled. Values without a prefix were written before this (as protocol 2 pickles).
+ENCODING_JSON_V1 = b"json1:"
+ENCODING_PICKLE_V1 = b"pickle1:"
+PICKLE_PROTOCOL = 4
+
+
+def _is_plain_value(obj) -> bool:
+    if obj is None or type(obj) in (str, int, float, bool):
+        return True
+    if type(obj) is list:
+        return all(_is_plain_value(o) for o in obj)
+    if type(obj) is dict:
+        return all(type(k) is str and _is_plain_value(v) for k, v in obj.items())
+    return False
+
+
+def encode_value(obj) -> Optional[bytes]:
+    if obj is None:
+        return None
+    if _is_plain_value(obj):
+        return ENCODING_JSON_V1 + json.dumps(obj).encode("utf-8")
+    try:
+        return ENCODING_PICKLE_V1 + pickle.dumps(obj, protocol=PICKLE_PROTOCOL)
+    except Exception as ex:
+        Logger.warn(f"Couldn't pickle {repr(obj)} as encountered {repr(ex)}")
+        return None
+
+
+def decode_value(value):
+    if value is None:
+        return None
+    value = bytes(value)
+    try:
+        if value.startswith(ENCODING_JSON_V1):
+            return json.loads(value[len(ENCODING_JSON_V1) :].decode("utf-8"))
+        if value.startswith(ENCODING_PICKLE_V1):
+            return pickle.loads(value[len(ENCODING_PICKLE_V1) :])
+    except Exception as ex:
+        Logger.warn(f"Couldn't decode {repr(value)} as encountered {repr(ex)}")
+        return None
+    return unpickle_obj(value)
+
+
 class DatabaseObjectField:
     def __init__(
-        self, name, dbalias=None, is_primary=False, encode=False, is_id_key=False
+        self,
+        name,
+        dbalias=None,
+        is_primary=False,
+        encode=False,
+        is_id_key=False,
+        track_changes=True,
+        is_indexed=False,
     ):
         """
         :param is_id_key: Sometimes it can't be an primary key, but it's worth trying to match on it.
+        :param is_indexed: Create a secondary index (prefixed by the provider's scopes) for this field.
+        :param track_changes: If False, a change to ONLY this field won't cause the row to be rewritten
+                (eg: a last updated timestamp), but it's still written alongside any other change.
         """
         self.name = name
         self.dbalias = dbalias or name
         self.is_primary = is_primary
         self.encode = encode
         self.is_id_key = is_id_key
+        self.track_changes = track_changes
+        self.is_indexed = is_indexed
 
 
 class DatabaseObject(ABC):
@@ -109,6 +170,36 @@ class DatabaseObject(ABC):
 
         return keys, values
 
+    def prepare_changes(
+        self,
+        snapshot: Optional[Dict[str, any]],
+        keymap: Optional[List[DatabaseObjectField]] = None,
+    ) -> Tuple[Dict[str, any], Dict[str, any]]:
+        """
+        Compare this object against the values that were last persisted for it.
+
+        :param snapshot: {dbalias: prepared_value} of the row we last persisted, or None if unknown
+        :param keymap: Precomputed keymap, to avoid rebuilding it for every object
+        :return: (row, changes), where row is every (non-null) prepared value (to be kept as
+                the new snapshot), and changes is the fields that need to be written. Changes
+                will be empty if no tracked field has changed.
+        """
+        row = {}
+        changes = {}
+        is_dirty = snapshot is None
+
+        for t in keymap or self.keymap():
+            val = getattr(self, t.name)
+            if val is None:
+                continue
+            prepared_val = prep_object_for_db(val, encode=t.encode)
+            row[t.dbalias] = prepared_val
+            if snapshot is None or snapshot.get(t.dbalias) != prepared_val:
+                changes[t.dbalias] = prepared_val
+                is_dirty = is_dirty or t.track_changes
+
+        return row, (changes if is_dirty else {})
+
     @classmethod
     def deserialize(cls, keys: List[str], row: List, **kwargs):
         if len(keys) != len(row):
@@ -134,46 +225,85 @@ class DatabaseObject(ABC):
 class KVDatabaseObject(ABC):
     def __init__(self, **kwargs):
         self._changes = {}
+        # {field: encoded value}, of the fields_to_decode_lazily that were loaded,
+        # a field that's not in __dict__ is decoded (by __getattr__) when it's used
+        self._encoded: Dict[str, bytes] = {}
         for k, v in kwargs.items():
             self.__setattr__(k, v)
 
     def __setattr__(self, key, value):
         super().__setattr__(key, value)
         if not key.startswith("_"):
+            self._encoded.pop(key, None)
             self._changes[key] = value
 
+    def __getattr__(self, key):
+        # only called when the field isn't in __dict__, ie: it hasn't been decoded
+        encoded = self.__dict__.get("_encoded")
+        if encoded is None or key not in encoded:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{key}'"
+            )
+        value = decode_value(encoded[key])
+        super().__setattr__(key, value)
+        return value
+
     def discard_changes(self):
         self._changes = {}
 
-    def get_encoded_changes(self):
-        return self.encode_field_dict(self._changes)
+    def get_changes(self) -> dict:
+        return dict(self._changes)
 
-    def get_encoded_rows(self):
-        return self.encode_field_dict(self.__dict__)
+    def get_encoded_changes(self, exclude: Set[str] = None):
+        return self.encode_field_dict(self._changes, exclude=exclude)
+
+    def get_encoded_rows(self, exclude: Set[str] = None):
+        rows = self.encode_field_dict(self.__dict__, exclude=exclude)
+        # fields that were never decoded are saved as they were loaded
+        rows.extend(
+            (k, v)
+            for k, v in self._encoded.items()
+            if k not in self.__dict__ and k not in (exclude or ())
+        )
+        return rows
 
     @classmethod
-    def encode_field_dict(cls, d: dict) -> (str, str):
-        encode_fields = set(cls.fields_to_encode() or [])
-        fields_to_ignore = set(cls.fields_to_ignore() or [])
+    def encode_field_dict(cls, d: dict, exclude: Set[str] = None) -> (str, bytes):
+        fields_to_ignore = set(cls.fields_to_ignore() or []).union(exclude or [])
         rows = []
         for k, v in d.items():
             if k.startswith("_") or v is None or k in fields_to_ignore:
                 continue
 
-            rows.append((k, pickle_obj(v)))
+            rows.append((k, encode_value(v)))
 
         return rows
 
     @classmethod
-    def decode_rows_to_dict(cls, rows: List[Tuple[str, str]]):
-        kwargs = {k: unpickle_obj(v) for k, v in rows}
-        return cls(**kwargs)
-
-    def update_from_rows(self, rows: List[Tuple[str, str]]):
+    def decode_rows_to_dict(cls, rows: List[Tuple[str, bytes]]):
+        lazy = set(cls.fields_to_decode_lazily() or [])
+        kwargs = {k: decode_value(v) for k, v in rows if k not in lazy}
+        obj = cls(**kwargs)
+        obj.set_encoded_fields({k: v for k, v in rows if k in lazy})
+        return obj
+
+    def update_from_rows(self, rows: List[Tuple[str, bytes]]):
+        lazy = set(self.fields_to_decode_lazily() or [])
+        self.set_encoded_fields({k: v for k, v in rows if k in lazy})
         for k, v in rows:
-            self.__setattr__(k, unpickle_obj(v))
+            if k not in lazy:
+                self.__setattr__(k, decode_value(v))
         return self
 
+    def set_encoded_fields(self, fields: Dict[str, bytes]):
+        for k, v in fields.items():
+            if self._encoded.get(k) == v:
+                # unchanged, so keep the value if it's already been decoded
+                continue
+            self._encoded[k] = v
+            self.__dict__.pop(k, None)
+            self._changes.pop(k, None)
+
     @classmethod
     def fields_to_encode(cls) -> Optional[Set[str]]:
         pass
@@ -181,3 +311,11 @@ class KVDatabaseObject(ABC):
     @classmethod
     def fields_to_ignore(cls) -> Optional[Set[str]]:
         pass
+
+    @classmethod
+    def fields_to_decode_lazily(cls) -> Optional[Set[str]]:
+        """
+        Large fields that are only decoded when they're used, rather than every
+        time the object is loaded or updated from the database.
+        """
+        pass
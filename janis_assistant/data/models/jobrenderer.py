@@ -0,0 +1,155 @@
+from statistics import median
+from typing import Dict, List, Optional, Tuple
+
+from janis_assistant.data.enums.taskstatus import TaskStatus
+from janis_assistant.data.models.workflowjob import (
+    RunJobModel,
+    UnimplementedStatusException,
+)
+from janis_assistant.utils import second_formatter
+from janis_assistant.utils.dateutils import DateUtil
+
+# scatters with more shards than this are summarised on one line
+SCATTER_COLLAPSE_THRESHOLD = 20
+
+
+class JobTreeRenderer:
+    """
+    Formats the tree of jobs (RunJobModel) in a run as lines of text.
+
+    The lines of every job are remembered (keyed on the fields that are displayed),
+    so when the same renderer is used for each refresh of 'janis watch', only the
+    subtrees that changed since the last refresh are formatted again.
+
+    Scatters with more than collapse_scatters_over shards are summarised on a single
+    line (counts per status, and the min / median / max runtime of the shards),
+    unless expand_scatters is set.
+    """
+
+    tb = "    "
+
+    def __init__(
+        self,
+        monochrome=False,
+        brief=False,
+        expand_scatters=False,
+        collapse_scatters_over: int = SCATTER_COLLAPSE_THRESHOLD,
+        **kwargs,
+    ):
+        self.monochrome = monochrome
+        self.brief = brief
+        self.expand_scatters = expand_scatters
+        self.collapse_scatters_over = collapse_scatters_over
+
+        # {(submission_id, run_id, job id, shard, pre): (signature, version, lines)}
+        self._cache: Dict[Tuple, Tuple[Tuple, int, List[str]]] = {}
+        self._version = 0
+
+    def render_jobs(self, jobs: List[RunJobModel], pre: str) -> List[str]:
+        if not jobs:
+            return []
+        lines = []
+        for j in sorted(jobs, key=lambda j: j.start or DateUtil.now()):
+            lines.extend(self.render_job(j, pre, njobs_in_parent=len(jobs)))
+        return lines
+
+    def render_job(
+        self, job: RunJobModel, pre: str, layer=0, njobs_in_parent=None
+    ) -> List[str]:
+        return self._render(job, pre, layer, njobs_in_parent)[1]
+
+    def is_collapsible_scatter(self, job: RunJobModel) -> bool:
+        return (
+            not self.expand_scatters
+            and len(job.jobs) > self.collapse_scatters_over
+            and all(j.shard is not None for j in job.jobs)
+        )
+
+    def _render(
+        self, job: RunJobModel, pre: str, layer: int, njobs_in_parent: Optional[int]
+    ) -> Tuple[int, List[str]]:
+        """
+        :return: (version, lines), the version changes whenever the lines do, so the
+                parent can cheaply tell whether any of its children have changed.
+        """
+        status = job.get_status()
+        show_children = bool(job.jobs) and (
+            status != TaskStatus.COMPLETED
+            or self.brief is False
+            or (layer == 0 and njobs_in_parent == 1)
+        )
+
+        # the displayed runtime of an unfinished job changes with the time
+        runtime = job.get_runtime() if not job.finish else None
+        signature = (
+            status,
+            job.start,
+            job.finish,
+            job.attempt,
+            runtime,
+            show_children,
+        )
+
+        children = []
+        if show_children:
+            if self.is_collapsible_scatter(job):
+                signature += (
+                    tuple((j.get_status(), j.start, j.finish) for j in job.jobs),
+                )
+            else:
+                ppre = pre + self.tb
+                subs = sorted(
+                    job.jobs,
+                    key=lambda j: (
+                        j.shard or 0,
+                        j.start if j.start else DateUtil.now(),
+                    ),
+                )
+                children = [self._render(j, ppre, layer + 1, None) for j in subs]
+                signature += (tuple(v for v, _ in children),)
+
+        key = (job.submission_id, job.run_id, job.id_, job.shard, pre)
+        cached = self._cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2]
+
+        col, uncol = job.get_colours(status, monochrome=self.monochrome)
+        header = job.format_header(pre, status)
+        if show_children:
+            lines = [col + header + uncol]
+            if self.is_collapsible_scatter(job):
+                lines.append(self.format_scatter_summary(job, pre + self.tb))
+            for _, child_lines in children:
+                lines.extend(child_lines)
+        else:
+            try:
+                fields = job.format_fields(pre, status)
+                lines = [col + line + uncol for line in (header, *fields)]
+            except UnimplementedStatusException as e:
+                lines = [header + str(e)]
+
+        self._version += 1
+        self._cache[key] = (signature, self._version, lines)
+        return self._version, lines
+
+    def format_scatter_summary(self, job: RunJobModel, pre: str) -> str:
+        counts: Dict[TaskStatus, int] = {}
+        runtimes = []
+        for j in job.jobs:
+            status = j.get_status()
+            counts[status] = counts.get(status, 0) + 1
+            if j.start and j.finish:
+                runtimes.append(j.get_runtime())
+
+        # in the order they're declared in TaskStatus
+        statuses = ", ".join(
+            f"{counts[s]} {s.value}" for s in TaskStatus.all() if s in counts
+        )
+        summary = f"{pre}[{len(job.jobs)} shards] {statuses}"
+        if runtimes:
+            summary += (
+                f" | runtime: min {second_formatter(min(runtimes))}"
+                f", median {second_formatter(round(median(runtimes)))}"
+                f", max {second_formatter(max(runtimes))}"
+            )
+        return summary
@@ -47,6 +47,8 @@ class PreparedJob(Serializable):
         environment: JanisConfigurationEnvironment = None,
         run_in_background: bool = None,
         digest_cache_location: str = None,
+        digest_cache_ttls: Dict[str, Optional[int]] = None,
+        translation_cache_location: str = None,
         # job information
         inputs: Dict = None,
         output_dir: str = None,
@@ -57,6 +59,7 @@ class PreparedJob(Serializable):
         container_override: Dict[str, str] = None,
         skip_digest_lookup: bool = None,
         skip_digest_cache: bool = None,
+        skip_translation_cache: bool = None,
         batchrun: Union[BatchRunRequirements, Dict] = None,
         store_in_central_db: bool = None,
         skip_file_check: bool = None,
@@ -67,7 +70,8 @@ class PreparedJob(Serializable):
         container_type: str = None,
         workflow_reference: str = None,
         post_run_script: str = None,
-        nextflow: JanisConfigurationNextflow = None
+        nextflow: JanisConfigurationNextflow = None,
+        batch_parent: Dict[str, str] = None,
     ):
         """
 
@@ -80,6 +84,8 @@ class PreparedJob(Serializable):
         :param notifications:
         :param run_in_background:
         :param digest_cache_location:
+        :param digest_cache_ttls:
+        :param translation_cache_location:
         :param inputs: YAML or JSON inputs file to provide values for the workflow (can specify multiple times)
         :param keep_intermediate_files: Do not remove execution directory on successful complete
         :param recipes:
@@ -88,6 +94,7 @@ class PreparedJob(Serializable):
         :param container_override:
         :param skip_digest_lookup:
         :param skip_digest_cache:
+        :param skip_translation_cache:
         :param batchrun:
         :param store_in_central_db:
         :param skip_file_check:
@@ -96,6 +103,8 @@ class PreparedJob(Serializable):
         :param should_watch_if_background:
         :param cromwell_db_type:
         :param post_run_script:
+        :param batch_parent: {submission_id, execution_dir} of the parent submission,
+                when this is one part of a split batch run
         """
         self.config_dir = config_dir
         self.db_path = db_path
@@ -142,6 +151,7 @@ class PreparedJob(Serializable):
         self.container_override = container_override
         self.skip_digest_lookup = skip_digest_lookup
         self.skip_digest_cache = skip_digest_cache
+        self.skip_translation_cache = skip_translation_cache
         self.batchrun: Optional[BatchRunRequirements] = parse_if_dict(
             BatchRunRequirements, batchrun, "batchrun"
         )
@@ -155,9 +165,12 @@ class PreparedJob(Serializable):
 
         self.run_in_background = run_in_background
         self.digest_cache_location = digest_cache_location
+        self.digest_cache_ttls = digest_cache_ttls
+        self.translation_cache_location = translation_cache_location
         self.call_caching_enabled = call_caching_enabled
 
         self.post_run_script = post_run_script
+        self.batch_parent = batch_parent
 
         self.container_type = ContainerType(container_type)
         self._container = get_container_by_name(container_type)
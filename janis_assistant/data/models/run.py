@@ -10,6 +10,7 @@ from janis_assistant.data.enums.taskstatus import TaskStatus
 from janis_assistant.data.models.inputs import WorkflowInputModel
 from janis_assistant.data.models.outputs import WorkflowOutputModel
 from janis_assistant.data.models.workflowjob import RunJobModel
+from janis_assistant.data.models.jobrenderer import JobTreeRenderer
 
 
 class RunStatusUpdate(DatabaseObject):
@@ -56,7 +57,7 @@ class RunModel(DatabaseObject):
             DatabaseObjectField("error"),
             DatabaseObjectField("labels", encode=True),
             DatabaseObjectField("tags", encode=True),
-            DatabaseObjectField("last_updated"),
+            DatabaseObjectField("last_updated", track_changes=False),
             DatabaseObjectField("name"),
         ]
 
@@ -108,7 +109,7 @@ class RunModel(DatabaseObject):
         self.inputs = inputs
         self.outputs = outputs
 
-        if isinstance(last_updated, str):
+        if last_updated is not None and not isinstance(last_updated, datetime):
             last_updated = DateUtil.parse_iso(last_updated)
 
         self.last_updated = last_updated
@@ -143,15 +144,28 @@ class RunModel(DatabaseObject):
             for el in ar:
                 el.set_ids(submission_id=self.submission_id, run_id=self.id_)
 
-    def format(self, tb, **kwargs):
-        if not self.jobs:
-            return ""
-        nl = "\n"
-
-        return nl.join(
-            j.format(tb, njobs_in_parent=len(self.jobs), **kwargs)
-            for j in sorted(self.jobs, key=lambda j: j.start or DateUtil.now())
-        )
+    def format(
+        self,
+        tb,
+        renderer: Optional[JobTreeRenderer] = None,
+        show_header=False,
+        **kwargs,
+    ):
+        """
+        :param renderer: Reuse a renderer between calls (eg: janis watch) so only
+                the jobs that have changed are formatted again
+        :param show_header: Show the status and name of the run above its jobs, for
+                when a submission has more than one run (eg: a split batch run)
+        """
+        lines = []
+        if show_header:
+            status = self.status or TaskStatus.PROCESSING
+            lines.append(f"{tb}[{status.symbol()}] {self.name or self.id_}")
+            tb += "    "
+        if self.jobs:
+            renderer = renderer or JobTreeRenderer(**kwargs)
+            lines.extend(renderer.render_jobs(self.jobs, tb))
+        return "\n".join(lines)
 
 
 class SubmissionModel(DatabaseObject):
@@ -227,9 +241,10 @@ class SubmissionModel(DatabaseObject):
         engine      STRING,
         """
 
-    def format(self, **kwargs):
+    def format(self, renderer: Optional[JobTreeRenderer] = None, **kwargs):
         tb = "    "
         nl = "\n"
+        renderer = renderer or JobTreeRenderer(**kwargs)
 
         start, finish = None, DateUtil.now()
         last_updated = None
@@ -290,7 +305,7 @@ Finish:     {finish.isoformat() if finish else "N/A"}
 Updated:    {updated_text}
 
 Jobs: 
-{nl.join(j.format(tb, **kwargs) for j in sorted(self.runs, key=lambda j: j.start or DateUtil.now()))}       
+{nl.join(j.format(tb, renderer=renderer, show_header=len(self.runs) > 1) for j in sorted(self.runs, key=lambda j: j.start or DateUtil.now()))}       
 
 
 {("Error: " + ers) if ers else ''}
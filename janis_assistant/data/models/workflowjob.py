@@ -15,7 +15,7 @@ class RunJobModel(DatabaseObject):
             DatabaseObjectField("id_", "id", is_id_key=True),
             DatabaseObjectField("submission_id", is_id_key=True),
             DatabaseObjectField("run_id", is_id_key=True),
-            DatabaseObjectField("parent"),
+            DatabaseObjectField("parent", is_indexed=True),
             DatabaseObjectField("name"),
             DatabaseObjectField("batchid"),
             DatabaseObjectField("shard"),
@@ -34,7 +34,7 @@ class RunJobModel(DatabaseObject):
             DatabaseObjectField("analysis"),
             DatabaseObjectField("error"),
             DatabaseObjectField("returncode"),
-            DatabaseObjectField("lastupdated"),
+            DatabaseObjectField("lastupdated", track_changes=False),
             DatabaseObjectField("workdir"),
         ]
 
@@ -133,14 +133,14 @@ analysis        STRING,
         self.workdir = workdir
 
         self.lastupdated = lastupdated or DateUtil.now()
-        if isinstance(lastupdated, str):
+        if lastupdated and not isinstance(lastupdated, datetime):
             self.lastupdated = DateUtil.parse_iso(lastupdated)
 
         self.start = start
         self.finish = finish
-        if start and isinstance(start, str):
+        if start and not isinstance(start, datetime):
             self.start = DateUtil.parse_iso(start)
-        if finish and isinstance(finish, str):
+        if finish and not isinstance(finish, datetime):
             self.finish = DateUtil.parse_iso(finish)
 
         self.script = script
@@ -163,30 +163,30 @@ analysis        STRING,
     def from_row(row):
         return RunJobModel(*row[1:])
 
-    def format(
-        self,
-        pre,
-        monochrome=False,
-        brief=False,
-        layer=0,
-        njobs_in_parent=None,
-        **kwargs,
-    ):
-
-        tb = "    "
-        fin = self.finish if self.finish else DateUtil.now()
-        time = round(DateUtil.secs_difference(self.start, fin)) if self.start else None
-        # percentage = (
-        #     (round(1000 * time / self.supertime) / 10)
-        #     if (self.start and self.supertime)
-        #     else None
-        # )
-        status = self.status or (
+    def get_status(self) -> TaskStatus:
+        return self.status or (
             sorted(self.events, key=lambda e: e.timestamp)[-1].status
             if self.events
             else TaskStatus.PROCESSING
         )
 
+    def get_runtime(self) -> Optional[int]:
+        if not self.start:
+            return None
+        fin = self.finish if self.finish else DateUtil.now()
+        return round(DateUtil.secs_difference(self.start, fin))
+
+    def get_colours(self, status: TaskStatus, monochrome=False) -> Tuple[str, str]:
+        if monochrome:
+            return "", ""
+        col = ""
+        if status == TaskStatus.FAILED:
+            col = _bcolors.FAIL
+        elif status == TaskStatus.COMPLETED:
+            col = _bcolors.OKGREEN
+        return col, _bcolors.ENDC
+
+    def format_header(self, pre, status: TaskStatus) -> str:
         name = self.name
         opts = []
         if self.shard is not None and self.shard >= 0:
@@ -196,51 +196,14 @@ analysis        STRING,
         if len(opts) > 0:
             name += f" ({', '.join(opts)})"
 
-        standard = pre + f"[{status.symbol()}] {name} ({second_formatter(time)})"
-
-        col = ""
-        uncol = ""
-
-        if not monochrome:
-            if status == TaskStatus.FAILED:
-                col = _bcolors.FAIL
-            elif status == TaskStatus.COMPLETED:
-                col = _bcolors.OKGREEN
-            # else:
-            # col = _bcolors.UNDERLINE
-            uncol = _bcolors.ENDC
-
-        if (
-            status != TaskStatus.COMPLETED
-            or brief is False
-            or (layer == 0 and njobs_in_parent == 1)
-        ):
-            if self.jobs:
-                ppre = pre + tb
-                subs: List[RunJobModel] = sorted(
-                    self.jobs,
-                    key=lambda j: (
-                        j.shard or 0,
-                        j.start if j.start else DateUtil.now(),
-                    ),
-                    reverse=False,
-                )
-
-                return (
-                    col
-                    + standard
-                    + "".join(
-                        [
-                            "\n"
-                            + j.format(
-                                ppre, monochrome, brief, layer=layer + 1, **kwargs
-                            )
-                            for j in subs
-                        ]
-                    )
-                    + uncol
-                )
+        runtime = second_formatter(self.get_runtime())
+        return pre + f"[{status.symbol()}] {name} ({runtime})"
 
+    def format_fields(self, pre, status: TaskStatus) -> List[str]:
+        """
+        The detail lines (rc, stderr, etc) shown when we're not showing the children
+        """
+        tb = "    "
         fields: List[Tuple[str, str]] = []
 
         if status == TaskStatus.COMPLETED:
@@ -265,24 +228,41 @@ analysis        STRING,
             pass
 
         else:
-            return (
-                standard
-                + f" :: Unimplemented status: '{status}' for task: '{self.name}'"
+            raise UnimplementedStatusException(
+                f" :: Unimplemented status: '{status}' for task: '{self.name}'"
             )
 
-        ppre = "\n" + " " * len(pre) + 2 * tb
+        ppre = " " * len(pre) + 2 * tb
 
         max_row_header_length = 0
         if len(fields) > 0:
             max_row_header_length = max(len(t[0]) for t in fields) + 0
 
-        retval = standard + "".join(
+        return [
             f"{ppre}{f[0]}:{' ' * (max_row_header_length - len(f[0]))} {f[1]}"
             for f in fields
             if f[1]
+        ]
+
+    def format(
+        self,
+        pre,
+        monochrome=False,
+        brief=False,
+        layer=0,
+        njobs_in_parent=None,
+        **kwargs,
+    ):
+        from janis_assistant.data.models.jobrenderer import JobTreeRenderer
+
+        renderer = JobTreeRenderer(monochrome=monochrome, brief=brief, **kwargs)
+        return "\n".join(
+            renderer.render_job(self, pre, layer=layer, njobs_in_parent=njobs_in_parent)
         )
 
-        return col + retval + uncol
+
+class UnimplementedStatusException(Exception):
+    pass
 
 
 class WorkflowJobEventModel:
@@ -290,7 +270,7 @@ class WorkflowJobEventModel:
         self.jid = jid
         self.status = status
         self.timestamp = timestamp
-        if timestamp and isinstance(timestamp, str):
+        if timestamp and not isinstance(timestamp, datetime):
             self.timestamp = DateUtil.parse_iso(timestamp)
 
     @staticmethod
@@ -63,8 +63,3 @@ class InputDbProvider(DbProviderBase[WorkflowInputModel]):
                 for k, v in inputs.items()
             ]
         )
-
-    def upgrade_schema(self, from_version: int):
-        # if from_version < 2:
-        #     self.migrate_to_2()
-        return
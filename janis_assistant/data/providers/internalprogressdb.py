@@ -30,7 +30,7 @@ from janis_assistant.data.keyvaluedbproviderbase import KvDB
 
 
 class InternalProgressDb(DbProviderBase):
-    CURRENT_SCHEMA_VERSION = 1
+    CURRENT_SCHEMA_VERSION = 2
 
     def table_schema(self):
         return """\
@@ -52,6 +52,13 @@ class InternalProgressDb(DbProviderBase):
         )
         self.submission_id = submission_id
 
+    def get_migrations(self):
+        return {
+            2: lambda cursor: self.migrate_datetimes_to_epoch_micros(
+                cursor, ["timestamp"]
+            )
+        }
+
     def has(self, key: ProgressKeys):
         with self.with_cursor() as cursor:
             cursor.execute(
@@ -77,7 +84,11 @@ class InternalProgressDb(DbProviderBase):
         with self.with_cursor() as cursor:
             cursor.execute(
                 self._insert_statement,
-                (self.submission_id, key.value, str(DateUtil.now())),
+                (
+                    self.submission_id,
+                    key.value,
+                    DateUtil.to_epoch_micros(DateUtil.now()),
+                ),
             )
 
     _insert_statement = """\
@@ -86,8 +97,3 @@ class InternalProgressDb(DbProviderBase):
         VALUES
             (?, ?, ?)
         """
-
-    def upgrade_schema(self, from_version: int):
-        # if from_version < 2:
-        #     self.migrate_to_2()
-        return
@@ -1,16 +1,25 @@
 from datetime import datetime
 from typing import Tuple, Optional, List, Union
 
+from janis_assistant.data.enums import TaskStatus
 from janis_assistant.utils.dateutils import DateUtil
 
 from janis_assistant.data.dbproviderbase import DbProviderBase
 
 # different to archivable
-from janis_assistant.data.models.base import DatabaseObject, DatabaseObjectField
+from janis_assistant.data.models.base import (
+    DatabaseObject,
+    DatabaseObjectField,
+    prep_object_for_db,
+)
 from janis_assistant.utils import Logger, fully_qualify_filename
 
 
 class TaskRow(DatabaseObject):
+    # the fields that summarise the task (kept up to date by the WorkflowManager),
+    # so 'janis query' doesn't have to open every task.db
+    SUMMARY_KEYS = ["status", "name", "start", "finish", "labels", "last_updated"]
+
     @classmethod
     def keymap(cls) -> List[DatabaseObjectField]:
         return [
@@ -18,6 +27,12 @@ class TaskRow(DatabaseObject):
             DatabaseObjectField("output_dir"),
             DatabaseObjectField("execution_dir"),
             DatabaseObjectField("timestamp"),
+            DatabaseObjectField("status", is_indexed=True),
+            DatabaseObjectField("name"),
+            DatabaseObjectField("start"),
+            DatabaseObjectField("finish"),
+            DatabaseObjectField("labels", encode=True),
+            DatabaseObjectField("last_updated", is_indexed=True),
         ]
 
     @classmethod
@@ -27,6 +42,12 @@ class TaskRow(DatabaseObject):
         output_dir      text,
         execution_dir   text,
         timestamp       text,
+        status          text,
+        name            text,
+        start           text,
+        finish          text,
+        labels          text,
+        last_updated    text,
         """
 
     def __init__(
@@ -35,6 +56,12 @@ class TaskRow(DatabaseObject):
         output_dir: str,
         execution_dir: str,
         timestamp: Optional[Union[str, datetime]] = None,
+        status: Optional[Union[str, TaskStatus]] = None,
+        name: Optional[str] = None,
+        start: Optional[Union[str, datetime]] = None,
+        finish: Optional[Union[str, datetime]] = None,
+        labels: Optional[List[str]] = None,
+        last_updated: Optional[Union[str, datetime]] = None,
     ):
         self.submission_id = submission_id
         self.output_dir = output_dir
@@ -42,13 +69,40 @@ class TaskRow(DatabaseObject):
 
         if not timestamp:
             timestamp = DateUtil.now()
-        elif isinstance(timestamp, str):
+        elif not isinstance(timestamp, datetime):
             timestamp = DateUtil.parse_iso(timestamp)
         self.timestamp = timestamp
 
+        self.status = TaskStatus(status) if status is not None else None
+        self.name = name
+        self.start = DateUtil.parse_iso(start)
+        self.finish = DateUtil.parse_iso(finish)
+        self.labels = labels
+        self.last_updated = DateUtil.parse_iso(last_updated)
+
+    def has_summary(self) -> bool:
+        return self.last_updated is not None
+
+    def matches(
+        self, status: Optional[TaskStatus] = None, name: Optional[str] = None
+    ) -> bool:
+        """
+        The same filter as TasksDbProvider.query, for rows that aren't in the database
+        """
+        if status and self.status != status:
+            return False
+        if name and not (self.name or "").lower().startswith(name.lower()):
+            return False
+        return True
+
 
 class TasksDbProvider(DbProviderBase):
     table_name = "tasks"
+    CURRENT_SCHEMA_VERSION = 3
+
+    # the columns from before the summary was added, a readonly connection
+    # can't migrate an older database, so we only select these when we can
+    BASE_KEYS = ["id", "output_dir", "execution_dir", "timestamp"]
 
     def __init__(self, connection, readonly):
         super().__init__(
@@ -59,14 +113,92 @@ class TasksDbProvider(DbProviderBase):
             scopes={},
         )
 
+    def get_migrations(self):
+        return {
+            2: self.migrate_to_2,
+            3: lambda cursor: self.migrate_datetimes_to_epoch_micros(
+                cursor, ["timestamp", "start", "finish", "last_updated"]
+            ),
+        }
+
+    def migrate_to_2(self, cursor):
+        """
+        Add the summary columns (status, name, etc), these are populated by the
+        WorkflowManager on the next status change, or by 'janis query'.
+        """
+        for key in TaskRow.SUMMARY_KEYS:
+            cursor.execute(f"ALTER TABLE {self._tablename} ADD COLUMN {key} text")
+
     def get_by_id(self, id_) -> Optional[TaskRow]:
-        rows = self.get(where=("id = ?", [id_]))
-        if len(rows) != 1:
+        rows = self.get(keys=self.BASE_KEYS, where=("id = ?", [id_]))
+        if not rows or len(rows) != 1:
             return None
         return rows[0]
 
     def get_all_tasks(self) -> [TaskRow]:
-        return self.get()
+        return self.get(keys=self.BASE_KEYS)
+
+    def has_summary_columns(self) -> bool:
+        with self.with_cursor() as cursor:
+            columns = cursor.execute(f"PRAGMA table_info({self._tablename})").fetchall()
+        return "last_updated" in {c[1] for c in columns}
+
+    def query(
+        self, status: Optional[TaskStatus] = None, name: Optional[str] = None
+    ) -> List[TaskRow]:
+        """
+        If the table hasn't been migrated (only a readonly connection can see an
+        older table), none of the rows have a summary, so only those without a
+        filter are returned.
+        """
+        if not self.has_summary_columns():
+            Logger.debug("The janis database hasn't been migrated, so no summaries")
+            rows = self.get(keys=self.BASE_KEYS, allow_operational_errors=False)
+            return [r for r in rows or [] if r.matches(status=status, name=name)]
+
+        clauses, values = [], []
+        if status:
+            clauses.append("status = ?")
+            values.append(status.value)
+        if name:
+            # LIKE is case-insensitive (for ASCII), which matches the old behaviour
+            escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            values.append(escaped + "%")
+
+        where = (" AND ".join(clauses), values) if clauses else None
+        return self.get(where=where, allow_operational_errors=False) or []
+
+    def update_summaries(self, rows: List[TaskRow]) -> None:
+        """
+        Only update the summary columns, the output and execution directories are
+        owned by whoever created the task.
+        """
+        if not rows:
+            return
+        km = {t.name: t for t in TaskRow.keymap()}
+        fields = [km[k] for k in TaskRow.SUMMARY_KEYS]
+        values = []
+        for row in rows:
+            row.last_updated = DateUtil.now()
+            values.append(
+                (
+                    *(
+                        prep_object_for_db(getattr(row, f.name), encode=f.encode)
+                        for f in fields
+                    ),
+                    row.submission_id,
+                )
+            )
+
+        with self.with_cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {self._tablename} SET "
+                + ", ".join(f"{f.dbalias} = ?" for f in fields)
+                + " WHERE id = ?",
+                values,
+            )
+        self.commit()
 
     def insert_task(self, task: TaskRow) -> None:
         return self.insert_or_update_many([task])
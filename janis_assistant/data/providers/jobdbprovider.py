@@ -31,6 +31,8 @@ def groupby(
 
 
 class JobDbProvider(DbProviderBase):
+    CURRENT_SCHEMA_VERSION = 3
+
     job_cache_warnings = [10, 100, 500, 1000]
 
     def __init__(self, db, readonly, submission_id):
@@ -44,12 +46,6 @@ class JobDbProvider(DbProviderBase):
         self.submission_id = submission_id
         self.job_cache_last_idx = 0
 
-        """
-        We seem to persistently have problems with updating the DB, we can't use
-        newer versions of SQLite because of a stakeholder issue.
-        """
-        self._cache_completed_ids: Dict[Tuple, str] = {}
-
     def number_of_jobs(self):
         query = "SELECT COUNT(*) FROM jobs WHERE submission_id = ?"
         values = [self.submission_id]
@@ -147,75 +143,46 @@ class JobDbProvider(DbProviderBase):
 
     ## FILTERING
 
-    def populate_cache_if_required(self):
-        if self._cache_completed_ids is not None:
-            return False
-        self.populate_cache()
-        return True
-
-    def populate_cache(self):
-        self._cache_completed_ids = {}
-        idkeys = set(self.get_id_keys())
-        idkeys_ordered = list(idkeys)
-        prows = f"SELECT {', '.join(idkeys_ordered)}, status FROM {self._tablename}"
-        with self.with_cursor() as cursor:
-            rows = cursor.execute(prows).fetchall()
-
-            if len(rows) == 0:
-                return
-
-            for row in rows:
-                idkeys = tuple(row[:-2])
-                # is_updateable = not TaskStatus(row[-1]).is_in_final_state()
-                self._cache_completed_ids[idkeys] = row[-1]
-
     def filter_updates(
         self, jobs: List[RunJobModel], add_inserts_to_cache=True
     ) -> Tuple[List[RunJobModel], List[RunJobModel]]:
-        # don't call super, it'll break because of the cache
-
-        updates = []
-        inserts = []
-
-        if len(jobs) == 0:
-            return updates, inserts
-
-        self.populate_cache_if_required()
-
-        idkeys = set(self.get_id_keys())
-        idkeys_ordered = list(idkeys)
-        dbalias_map = {t.dbalias: t.name for t in self._base.keymap()}
-        skipped = 0
-
-        for job in jobs:
-            el_idkey = tuple([getattr(job, dbalias_map[_k]) for _k in idkeys_ordered])
-
-            jstatus = self._cache_completed_ids.get(el_idkey)
-            if jstatus is None:
-                inserts.append(job)
-            elif job.status.value != jstatus:
-                updates.append(job)
-            elif jstatus:
-                skipped += 1
-            self._cache_completed_ids[el_idkey] = job.status.value
-
-        if skipped:
-            Logger.log(
-                f"Skipped updating {skipped} jobs as those jobs were already in a final state"
-            )
-        memory = getsizeof(self._cache_completed_ids) // 1024
-        if (
-            self.job_cache_last_idx < len(self.job_cache_warnings)
-            and memory > self.job_cache_warnings[self.job_cache_last_idx]
-        ):
-            Logger.warn(f"Job cache is using {memory} MB")
-            self.job_cache_last_idx += 1
+        # Unchanged jobs are dropped by the snapshots in insert_or_update_many,
+        # so we only need to split into inserts and updates here.
+        updates, inserts = super().filter_updates(
+            jobs, add_inserts_to_cache=add_inserts_to_cache
+        )
+
+        if self.job_cache_last_idx < len(self.job_cache_warnings):
+            memory = self.estimate_snapshots_size() // 1024
+            if memory > self.job_cache_warnings[self.job_cache_last_idx]:
+                Logger.warn(f"Job cache is using about {memory} KB")
+                self.job_cache_last_idx += 1
 
         return updates, inserts
 
-        # We'll remove all updates
+    def estimate_snapshots_size(self) -> int:
+        """
+        The (approximate) bytes used by the snapshots of persisted jobs. getsizeof
+        doesn't include what a dict contains, and measuring every row on each update
+        would be slow, so we multiply the size of one row by the number of rows.
+        """
+        if not self._snapshots:
+            return getsizeof(self._snapshots)
+        key, snapshot = next(iter(self._snapshots.items()))
+        row = (
+            getsizeof(key)
+            + sum(getsizeof(k) for k in key)
+            + getsizeof(snapshot)
+            + sum(getsizeof(v) for v in snapshot.values())
+        )
+        return getsizeof(self._snapshots) + row * len(self._snapshots)
+
+    ## MIGRATIONS
 
-    def upgrade_schema(self, from_version: int):
-        # if from_version < 2:
-        #     self.migrate_to_2()
-        return
+    def get_migrations(self):
+        # version 2 added the (non-unique) id key index, which is created for us
+        return {
+            3: lambda cursor: self.migrate_datetimes_to_epoch_micros(
+                cursor, ["start", "finish", "lastupdated"]
+            ),
+        }
@@ -1,6 +1,6 @@
 import json
 from datetime import datetime
-from typing import List
+from typing import List, Tuple
 
 from janis_assistant.data.dbproviderbase import DbProviderBase
 from janis_assistant.data.models.outputs import WorkflowOutputModel
@@ -8,7 +8,7 @@ from janis_assistant.utils.dateutils import DateUtil
 
 
 class OutputDbProvider(DbProviderBase[WorkflowOutputModel]):
-    CURRENT_SCHEMA_VERSION = 1
+    CURRENT_SCHEMA_VERSION = 2
 
     def __init__(self, db, readonly, submission_id):
         super().__init__(
@@ -20,30 +20,41 @@ class OutputDbProvider(DbProviderBase[WorkflowOutputModel]):
         )
         self.submission_id = submission_id
 
+    def get_migrations(self):
+        return {
+            2: lambda cursor: self.migrate_datetimes_to_epoch_micros(
+                cursor, ["timestamp"]
+            )
+        }
+
     def insert_many(self, outputs: List[WorkflowOutputModel]):
         return self.insert_or_update_many(outputs)
 
     def update_paths(
         self, run_id: str, tag: str, original_path: str, new_path: str, value: any
     ):
-        model = WorkflowOutputModel(
-            id_=tag,
-            submission_id=self.submission_id,
-            run_id=run_id,
-            original_path=original_path,
-            new_path=new_path,
-            timestamp=datetime.now(),
-            value=value,
-            # empty fields
-            extension=None,
-            is_copyable=None,
-            output_folder=None,
-            output_name=None,
-            secondaries=None,
-        )
-        self.insert_or_update_many([model])
+        self.update_many_paths(run_id, [(tag, original_path, new_path, value)])
 
-    def upgrade_schema(self, from_version: int):
-        # if from_version < 2:
-        #     self.migrate_to_2()
-        return
+    def update_many_paths(self, run_id: str, paths: List[Tuple[str, str, str, any]]):
+        """
+        :param paths: List of (tag, original_path, new_path, value)
+        """
+        models = [
+            WorkflowOutputModel(
+                id_=tag,
+                submission_id=self.submission_id,
+                run_id=run_id,
+                original_path=original_path,
+                new_path=new_path,
+                timestamp=datetime.now(),
+                value=value,
+                # empty fields
+                extension=None,
+                is_copyable=None,
+                output_folder=None,
+                output_name=None,
+                secondaries=None,
+            )
+            for tag, original_path, new_path, value in paths
+        ]
+        self.insert_or_update_many(models)
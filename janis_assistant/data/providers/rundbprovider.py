@@ -10,6 +10,8 @@ from janis_assistant.data.dbproviderbase import DbProviderBase
 
 
 class RunDbProvider(DbProviderBase[RunModel]):
+    CURRENT_SCHEMA_VERSION = 2
+
     def __init__(self, db, readonly, submission_id: str):
         super().__init__(
             base_type=RunModel,
@@ -19,13 +21,22 @@ class RunDbProvider(DbProviderBase[RunModel]):
             scopes={"submission_id": submission_id},
         )
 
-    def insert_or_update_many(self, els: List[RunModel]):
+    def get_migrations(self):
+        return {
+            2: lambda cursor: self.migrate_datetimes_to_epoch_micros(
+                cursor, ["last_updated"]
+            )
+        }
+
+    def insert_or_update_many(self, els: List[RunModel]) -> bool:
         for el in els:
             el.last_updated = DateUtil.now()
         return super().insert_or_update_many(els)
 
 
 class RunStatusDbProvider(DbProviderBase[RunStatusUpdate]):
+    CURRENT_SCHEMA_VERSION = 2
+
     def __init__(self, db, readonly, submission_id: str):
         super().__init__(
             base_type=RunStatusUpdate,
@@ -37,6 +48,11 @@ class RunStatusDbProvider(DbProviderBase[RunStatusUpdate]):
 
         self.submission_id = submission_id
 
+    def get_migrations(self):
+        return {
+            2: lambda cursor: self.migrate_datetimes_to_epoch_micros(cursor, ["date"])
+        }
+
     def update(self, run_id: str, status: TaskStatus):
         return self.insert_or_update_many(
             [
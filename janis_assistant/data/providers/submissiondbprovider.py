@@ -10,7 +10,7 @@ from janis_assistant.data.dbproviderbase import DbProviderBase
 
 
 class SubmissionDbProvider(DbProviderBase[SubmissionModel]):
-    CURRENT_SCHEMA_VERSION = 2
+    CURRENT_SCHEMA_VERSION = 3
 
     def __init__(self, db, readonly):
         super().__init__(
@@ -21,6 +21,13 @@ class SubmissionDbProvider(DbProviderBase[SubmissionModel]):
             scopes={},
         )
 
+    def get_migrations(self):
+        return {
+            3: lambda cursor: self.migrate_datetimes_to_epoch_micros(
+                cursor, ["timestamp"]
+            )
+        }
+
     def get_by_id(
         self, submission_id, allow_operational_errors=True
     ) -> Optional[SubmissionModel]:
@@ -1,11 +1,17 @@
-from typing import Optional, Set
+from sqlite3 import OperationalError
+from typing import Dict, Optional, Set, Tuple
 
 from janis_core import Logger
 
 from janis_assistant.data.enums import TaskStatus
 from janis_assistant.data.keyvaluedbproviderbase import KvDB
-from janis_assistant.data.models.base import KVDatabaseObject, unpickle_obj
+from janis_assistant.data.models.base import (
+    KVDatabaseObject,
+    decode_value,
+    prep_object_for_db,
+)
 from janis_assistant.data.models.preparedjob import PreparedJob
+from janis_assistant.utils.dateutils import DateUtil
 from janis_assistant.management.configuration import (
     DatabaseTypeToUse,
     JanisDatabaseConfigurationHelper,
@@ -31,6 +37,7 @@ class SubmissionDbMetadata(KVDatabaseObject):
         submission_resources=None,
         error=None,
         db_configuration: JanisDatabaseConfigurationHelper = None,
+        batch_children: Dict[str, str] = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -55,6 +62,9 @@ class SubmissionDbMetadata(KVDatabaseObject):
         self.submission_inputs = submission_inputs
         self.submission_resources = submission_resources
 
+        # {submission_id: execution_dir}, when this submission is a split batch run
+        self.batch_children = batch_children
+
     @classmethod
     def fields_to_encode(cls) -> Optional[Set[str]]:
         return {
@@ -66,8 +76,25 @@ class SubmissionDbMetadata(KVDatabaseObject):
             "status",
         }
 
+    @classmethod
+    def fields_to_decode_lazily(cls) -> Optional[Set[str]]:
+        return {"prepared_job", "engine", "db_configuration"}
+
 
 class SubmissionMetadataDbProvider(KvDB):
+    """
+    Most fields of the SubmissionDbMetadata are rows of (field, encoded value), but
+    the small fields that are read on every refresh (TYPED_FIELDS) are columns of
+    the STATE_TABLENAME table, so they can be read without decoding anything.
+    """
+
+    STATE_TABLENAME = "submission_state"
+    TYPED_FIELDS = ["name", "status", "last_updated", "engine_id", "error"]
+
+    # 2: the TYPED_FIELDS moved to the STATE_TABLENAME table
+    # 3: last_updated is stored as epoch microseconds
+    CURRENT_SCHEMA_VERSION = 3
+
     def __init__(
         self,
         db,
@@ -83,17 +110,160 @@ class SubmissionMetadataDbProvider(KvDB):
             scopes={"submission_id": submission_id, "run_id": run_id},
         )
 
+        if not readonly:
+            with self.with_cursor() as cursor:
+                cursor.execute(self.state_schema())
+                version = self.get_schema_version(cursor)
+                if version is None or version < 2:
+                    self.migrate_typed_fields(cursor)
+                if version is None or version < 3:
+                    self.migrate_datetimes_to_epoch_micros(
+                        cursor, ["last_updated"], tablename=self.STATE_TABLENAME
+                    )
+                if version != self.CURRENT_SCHEMA_VERSION:
+                    self.set_schema_version(cursor, self.CURRENT_SCHEMA_VERSION)
+            self.commit_schema_changes()
+
         self.metadata = metadata if metadata is not None else self.get()
 
+    def state_schema(self):
+        return f"""
+CREATE TABLE IF NOT EXISTS {self.STATE_TABLENAME} (
+    submission_id STRING NOT NULL,
+    run_id STRING NOT NULL,
+    name TEXT,
+    status TEXT,
+    last_updated INTEGER,
+    engine_id TEXT,
+    error TEXT,
+    PRIMARY KEY (submission_id, run_id)
+);
+"""
+
+    def migrate_typed_fields(self, cursor):
+        """
+        Move the TYPED_FIELDS (of every submission) out of the key-value rows
+        """
+        qs = ", ".join("?" for _ in self.TYPED_FIELDS)
+        rows = cursor.execute(
+            f"SELECT submission_id, run_id, id, value FROM {self._tablename} "
+            f"WHERE id IN ({qs})",
+            self.TYPED_FIELDS,
+        ).fetchall()
+        if not rows:
+            return
+
+        Logger.debug(f"Migrating {len(rows)} fields to {self.STATE_TABLENAME}")
+        by_scope = {}
+        for submission_id, run_id, key, value in rows:
+            by_scope.setdefault((submission_id, run_id), {})[key] = decode_value(value)
+        for (submission_id, run_id), values in by_scope.items():
+            self.save_state(cursor, values, (submission_id, run_id))
+
+        cursor.execute(
+            f"DELETE FROM {self._tablename} WHERE id IN ({qs})", self.TYPED_FIELDS
+        )
+
+    def save_state(self, cursor, values: dict, scope: Tuple[str, str] = None):
+        values = {
+            k: prep_object_for_db(v, encode=False)
+            for k, v in values.items()
+            if k in self.TYPED_FIELDS and v is not None
+        }
+        if not values or self._readonly:
+            return
+        scope = list(scope or (self._scopes["submission_id"], self._scopes["run_id"]))
+        keys = list(values.keys())
+        cursor.execute(
+            f"INSERT OR IGNORE INTO {self.STATE_TABLENAME} (submission_id, run_id) "
+            f"VALUES (?, ?)",
+            scope,
+        )
+        cursor.execute(
+            f"UPDATE {self.STATE_TABLENAME} SET {', '.join(f'{k} = ?' for k in keys)} "
+            f"WHERE submission_id = ? AND run_id = ?",
+            [*(values[k] for k in keys), *scope],
+        )
+
+    def get_state_row(self, keys=None) -> Optional[dict]:
+        """
+        The (undecoded) TYPED_FIELDS, or None if they haven't been migrated from
+        the key-value rows yet (ie: this is a readonly connection to an older
+        database).
+        """
+        keys = keys or self.TYPED_FIELDS
+        query = (
+            f"SELECT {', '.join(keys)} FROM {self.STATE_TABLENAME} "
+            f"WHERE submission_id = ? AND run_id = ?"
+        )
+        scope = [self._scopes["submission_id"], self._scopes["run_id"]]
+        with self.with_cursor() as cursor:
+            try:
+                row = cursor.execute(query, scope).fetchone()
+            except OperationalError as e:
+                if "no such table" in str(e):
+                    return None
+                raise
+        return dict(zip(keys, row)) if row else {}
+
+    @staticmethod
+    def decode_state_value(key: str, value):
+        if value is None:
+            return None
+        if key == "status":
+            return TaskStatus(value)
+        if key == "last_updated":
+            return DateUtil.parse_iso(value)
+        return value
+
+    def get_state(self) -> Optional[dict]:
+        row = self.get_state_row()
+        if row is None:
+            return None
+        return {k: self.decode_state_value(k, v) for k, v in row.items()}
+
     def get_uncached_status(self) -> TaskStatus:
-        scopes_dict = {**self._scopes, "id": "status"}
+        return self.get_uncached_value("status")
+
+    def get_uncached_batch_children(self) -> Optional[Dict[str, str]]:
+        return self.get_uncached_value("batch_children")
+
+    def get_uncached_value(self, key: str):
+        if key in self.TYPED_FIELDS:
+            row = self.get_state_row([key])
+            if row is not None:
+                return self.decode_state_value(key, row.get(key))
+
+        scopes_dict = {**self._scopes, "id": key}
         scope_keys = list(scopes_dict.keys())
         scopes = " AND ".join(f"{k} = ?" for k in scope_keys)
         scope_values = [scopes_dict[k] for k in scope_keys]
         query = f"SELECT value FROM {self._tablename} WHERE {scopes}"
         with self.with_cursor() as cursor:
             row = cursor.execute(query, scope_values).fetchone()
-            return unpickle_obj(row[0])
+            return decode_value(row[0]) if row else None
+
+    def get_uncached_version(self) -> Tuple:
+        """
+        A cheap way to tell whether the submission has changed (without decoding
+        anything), the status and last_updated fields change whenever the
+        monitor saves new metadata or the status changes.
+        """
+        keys = ["status", "last_updated"]
+        row = self.get_state_row(keys)
+        if row is not None:
+            return tuple(row.get(k) for k in keys)
+
+        scope_keys = list(self._scopes.keys())
+        scopes = " AND ".join(f"{k} = ?" for k in scope_keys)
+        scope_values = [self._scopes[k] for k in scope_keys]
+        query = (
+            f"SELECT id, value FROM {self._tablename} "
+            f"WHERE {scopes} AND id IN ({', '.join('?' for _ in keys)})"
+        )
+        with self.with_cursor() as cursor:
+            rows = dict(cursor.execute(query, [*scope_values, *keys]).fetchall())
+        return tuple(rows.get(k) for k in keys)
 
     def set_metadata(self, obj: SubmissionDbMetadata):
         self.metadata = obj
@@ -101,17 +271,33 @@ class SubmissionMetadataDbProvider(KvDB):
 
     def update(self):
         self.metadata.update_from_rows(self.get_rows())
+        for k, v in (self.get_state() or {}).items():
+            if v is not None:
+                setattr(self.metadata, k, v)
         self.metadata.discard_changes()
 
     def get(self) -> SubmissionDbMetadata:
-        return SubmissionDbMetadata.decode_rows_to_dict(self.get_rows())
+        metadata = SubmissionDbMetadata.decode_rows_to_dict(self.get_rows())
+        for k, v in (self.get_state() or {}).items():
+            if v is not None:
+                setattr(metadata, k, v)
+        return metadata
 
     def save(self):
-        self.save_encoded_rows(self.metadata.get_encoded_rows())
+        typed_fields = set(self.TYPED_FIELDS)
+        with self.with_cursor() as cursor:
+            self.save_state(
+                cursor, {k: getattr(self.metadata, k, None) for k in typed_fields}
+            )
+        self.save_encoded_rows(self.metadata.get_encoded_rows(exclude=typed_fields))
 
     def save_changes(self):
-        rows = self.metadata.get_encoded_changes()
-        Logger.log(f"Updating workflow fields: {rows}")
+        typed_fields = set(self.TYPED_FIELDS)
+        changes = self.metadata.get_changes()
+        rows = self.metadata.get_encoded_changes(exclude=typed_fields)
+        Logger.log(f"Updating workflow fields: {[*changes.keys()]}")
+        with self.with_cursor() as cursor:
+            self.save_state(cursor, changes)
         self.save_encoded_rows(rows)
         self.metadata.discard_changes()
 
@@ -25,6 +25,44 @@ class CromwellConfiguration(Serializable):
         "soft-link",
     ]
 
+    @staticmethod
+    def slurm_check_alive(
+        interval: int = 30,
+        squeue: str = "squeue",
+        cache: str = None,
+    ):
+        """
+        A check-alive that answers from a cache of the user's jobs, so there is one
+        squeue every interval seconds instead of an scontrol per running job.
+
+        The first line of the cache is when it was refreshed, followed by
+        '<job id> <state>' for each job. Only one check refreshes an old cache (the
+        others keep using it), and a job that isn't in it (eg: it was submitted since)
+        falls back to scontrol.
+        """
+        cache = cache or "/tmp/janis-squeue-$(id -un)"
+        return f"""\
+cache="{cache}"
+now=$(date +%s)
+updated=0
+[ -f "$cache" ] && updated=$(head -n 1 "$cache")
+if [ $((now - updated)) -ge {interval} ]; then
+    find "$cache.lock" -maxdepth 0 -mmin +1 -exec rmdir {{}} \\; 2> /dev/null
+    if mkdir "$cache.lock" 2> /dev/null; then
+        {{ echo "$now" && {squeue} -h -u "$(id -un)" -o '%i %T'; }} > "$cache.$$" \\
+            && mv "$cache.$$" "$cache"
+        rm -f "$cache.$$"
+        rmdir "$cache.lock"
+    fi
+fi
+state=$(awk -v id="${{job_id}}" 'NR > 1 && $1 == id {{ print $2 }}' "$cache" 2> /dev/null)
+if [ -n "$state" ]; then
+    echo "$state"
+    exit 0
+fi
+scontrol show job ${{job_id}}
+"""
+
     def output(self):
 
         d = self.to_dict()
@@ -337,7 +375,13 @@ hsqldb.script_format=3
                 afternotokaycatch: bool = True,
                 call_caching_method: str = None,
                 sbatch: str = "sbatch",
+                check_alive_interval: Optional[int] = 30,
+                squeue: str = "squeue",
             ):
+                """
+                :param check_alive_interval: How often (seconds) the state of every job is
+                    refreshed with a single squeue, or None to call scontrol for each job
+                """
                 emailextra = (
                     f'--mail-user "{jobemail}" --mail-type FAIL' if jobemail else ""
                 )
@@ -389,7 +433,13 @@ JOBID=$({sbatch} \\
 """,
                         kill="scancel ${job_id}",
                         kill_docker="scancel ${job_id}",
-                        check_alive="scontrol show job ${job_id}",
+                        check_alive=(
+                            CromwellConfiguration.slurm_check_alive(
+                                interval=check_alive_interval, squeue=squeue
+                            )
+                            if check_alive_interval
+                            else "scontrol show job ${job_id}"
+                        ),
                         job_id_regex="Submitted batch job (\\d+).*",
                         filesystems=cls.Config.Filesystem.default_filesystem(
                             call_caching_method
@@ -408,6 +458,8 @@ JOBID=$({sbatch} \\
                 afternotokaycatch: bool = True,
                 call_caching_method: str = None,
                 sbatch: str = "sbatch",
+                check_alive_interval: Optional[int] = 30,
+                squeue: str = "squeue",
             ):
                 slurm = cls.slurm(
                     jobemail=jobemail,
@@ -415,6 +467,8 @@ JOBID=$({sbatch} \\
                     afternotokaycatch=afternotokaycatch,
                     call_caching_method=call_caching_method,
                     sbatch=sbatch,
+                    check_alive_interval=check_alive_interval,
+                    squeue=squeue,
                 )
 
                 partition_string = ""
@@ -1,6 +1,8 @@
+import copy
 import json
 import os.path
-from typing import Union, List, Dict, Optional
+from datetime import datetime
+from typing import Union, List, Dict, Optional, Callable
 
 from janis_assistant.data.enums.taskstatus import TaskStatus
 from janis_assistant.data.models.run import RunModel
@@ -34,7 +36,35 @@ def cromwell_status_to_status(status: str) -> TaskStatus:
         return TaskStatus.FAILED
 
 
+CROMWELL_TERMINAL_STATUSES = {"succeeded", "failed", "aborted"}
+
+
 class CromwellMetadata:
+    # These are the only keys we parse in CromwellMetadata.standard, so when polling
+    # we ask Cromwell to leave out everything else (eg: inputs, outputs, call caching hashes).
+    # Cromwell matches these as key prefixes, at the workflow AND call level.
+    POLLING_INCLUDE_KEYS = [
+        "id",
+        "status",
+        "start",
+        "end",
+        "workflowName",
+        "workflowRoot",
+        "failures",
+        "executionStatus",
+        "shardIndex",
+        "attempt",
+        "jobId",
+        "stdout",
+        "stderr",
+        "callRoot",
+        "returnCode",
+        "callCaching:hit",
+        "dockerImageUsed",
+        "runtimeAttributes:docker",
+        "subWorkflowId",
+    ]
+
     def __init__(self, metadata_dictionary: dict):
 
         if not isinstance(metadata_dictionary, dict):
@@ -159,6 +189,10 @@ class CromwellMetadata:
             message += CromwellMetadata.unwrap_caused_by(causedby)
         return message
 
+    @staticmethod
+    def is_terminal(meta: dict) -> bool:
+        return str(meta.get("status")).lower() in CROMWELL_TERMINAL_STATUSES
+
     @classmethod
     def parse_standard_call(cls, parentid, stepname, call):
         parent = parentid
@@ -365,3 +399,95 @@ class CromwellMetadata:
         #     shard=shard,
         # )
         # return [j]
+
+
+class CromwellIncrementalMetadata:
+    """
+    Polls the metadata of a workflow WITHOUT expanding subworkflows (and only with the
+    keys we parse), then separately fetches the metadata of subworkflows that haven't
+    finished yet. Finished subworkflows are kept between polls and never refetched.
+
+    Only jobs that have changed since the previous poll are returned in the RunModel.
+    """
+
+    def __init__(self, fetch: Callable[[str], Optional[dict]]):
+        """
+        :param fetch: Returns the unexpanded metadata dictionary for a (sub)workflow id, or None if it couldn't
+        """
+        self.fetch = fetch
+        self.finished_subworkflows: Dict[str, dict] = {}
+        self.job_snapshots: Dict[str, Dict[str, any]] = {}
+        # {job id: start}, the first start we gave a job that Cromwell hadn't started
+        self.placeholder_starts: Dict[str, datetime] = {}
+
+    def poll(self, identifier) -> Optional[RunModel]:
+        meta = self.fetch_expanded(identifier)
+        if meta is None:
+            return None
+
+        # a job without a start is given DateUtil.now() when it's parsed
+        polled_at = DateUtil.now()
+        model = CromwellMetadata(meta).standard()
+        model.jobs = self.filter_changed_jobs(model.jobs or [], polled_at=polled_at)
+        return model
+
+    def fetch_expanded(self, identifier) -> Optional[dict]:
+        if identifier in self.finished_subworkflows:
+            return self.finished_subworkflows[identifier]
+
+        meta = self.fetch(identifier)
+        if meta is None:
+            return None
+
+        for calls in (meta.get("calls") or {}).values():
+            for call in calls:
+                subworkflow_id = call.get("subWorkflowId")
+                if not subworkflow_id or "subWorkflowMetadata" in call:
+                    continue
+                submeta = self.fetch_expanded(subworkflow_id)
+                if submeta is None:
+                    # don't report a partial tree, we'll get it next time
+                    Logger.debug(
+                        f"Couldn't get metadata for Cromwell subworkflow '{subworkflow_id}', skipping this poll"
+                    )
+                    return None
+                call["subWorkflowMetadata"] = submeta
+
+        if CromwellMetadata.is_terminal(meta):
+            self.finished_subworkflows[identifier] = meta
+
+        return meta
+
+    def filter_changed_jobs(
+        self, jobs: List[RunJobModel], polled_at: Optional[datetime] = None
+    ) -> List[RunJobModel]:
+        """
+        Flattens the job tree, and returns (a shallow copy, without children) of every
+        job that has changed since the last poll.
+
+        :param polled_at: When the jobs were parsed. Cromwell only reports starts from
+                before then, so a later start is a placeholder for a job that hasn't
+                started, and we keep the first one so the job doesn't change every poll.
+        """
+        changed = []
+        to_check = list(jobs)
+        while to_check:
+            job = to_check.pop(0)
+            if job.jobs:
+                to_check.extend(job.jobs)
+
+            if polled_at and job.start and job.start >= polled_at:
+                job.start = self.placeholder_starts.setdefault(job.id_, job.start)
+            else:
+                self.placeholder_starts.pop(job.id_, None)
+
+            row, changes = job.prepare_changes(self.job_snapshots.get(job.id_))
+            if not changes:
+                continue
+            self.job_snapshots[job.id_] = row
+
+            changed_job = copy.copy(job)
+            changed_job.jobs = None
+            changed.append(changed_job)
+
+        return changed
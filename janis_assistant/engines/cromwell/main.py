@@ -9,7 +9,7 @@ import sys
 import threading
 from datetime import datetime
 from glob import glob
-from typing import Optional, List, Tuple, Union
+from typing import Optional, List, Tuple, Union, Dict
 from urllib import request, parse
 
 from janis_assistant.data.models.run import RunModel
@@ -22,15 +22,16 @@ from janis_assistant.data.models.run import RunModel
 from janis_assistant.engines.cromwell.cromwellmetadata import (
     cromwell_status_to_status,
     CromwellMetadata,
+    CromwellIncrementalMetadata,
 )
 from janis_assistant.engines.enginetypes import EngineType
 from janis_assistant.management.envvariables import EnvVariables
 from janis_assistant.utils import (
+    BufferedLogSink,
     ProcessLogger,
     find_free_port,
 )
 from janis_assistant.utils.dateutils import DateUtil
-from janis_assistant.utils.fileutil import tail
 from .cromwellconfiguration import CromwellConfiguration
 from janis_assistant.data.enums.dbtype import DatabaseTypeToUse
 
@@ -56,6 +57,9 @@ class Cromwell(Engine):
         self._process = None
         self._timer_thread = None
         self._start_time = DateUtil.now()
+        self._incremental_metadata = {}
+        # engines pickled before incremental polling existed
+        self.incremental_polling = state.get("incremental_polling", False)
 
     def __init__(
         self,
@@ -69,6 +73,7 @@ class Cromwell(Engine):
         execution_dir: str = None,
         polling_interval: Optional[int] = None,
         db_type: DatabaseTypeToUse = None,
+        incremental_polling: bool = False,
     ):
 
         super().__init__(
@@ -114,6 +119,10 @@ class Cromwell(Engine):
         self.polling_interval = polling_interval
         self._start_time = None
 
+        # Only fetch the metadata keys / subworkflows we need, and only report changed jobs
+        self.incremental_polling = incremental_polling
+        self._incremental_metadata: Dict[str, CromwellIncrementalMetadata] = {}
+
         self.connectionerrorcount = 0
         self.metadataerrorcount = 0
 
@@ -277,6 +286,8 @@ class Cromwell(Engine):
         )
 
         self._logfp = open(self.logfile, "a+")
+        # shared with the ProcessLogger, that takes over once Cromwell has started
+        logsink = BufferedLogSink(self._logfp)
         Logger.info(
             f"Will log Cromwell output to the file: {self.logfile}"
             if bool(self._logfp)
@@ -298,14 +309,12 @@ class Cromwell(Engine):
                     Logger.critical(
                         f"Cromwell has exited with rc={rc}. {critical_suffix}The last lines of the logfile ({self.logfile}):"
                     )
-                    Logger.critical("".join(tail(self._logfp, 10)))
+                    Logger.critical("\n".join(logsink.get_recent_lines(10)))
+                    logsink.close()
                     return False
                 continue
 
-            if self._logfp and not self._logfp.closed:
-                self._logfp.write(line + "\n")
-                self._logfp.flush()
-                os.fsync(self._logfp.fileno())
+            logsink.write(line)
 
             Logger.debug("Cromwell: " + line)
 
@@ -326,6 +335,7 @@ class Cromwell(Engine):
                 process=self._process,
                 prefix="Cromwell: ",
                 logfp=self._logfp,
+                sink=logsink,
                 # exit_function=self.something_has_happened_to_cromwell,
             )
 
@@ -394,11 +404,12 @@ class Cromwell(Engine):
     def url_test(self):
         return f"http://{self.host}/engine/v1/version"
 
-    def url_metadata(self, identifier, expand_subworkflows=True):
-        return (
-            self.url_base()
-            + f"/{identifier}/metadata?expandSubWorkflows={expand_subworkflows}"
-        )
+    def url_metadata(
+        self, identifier, expand_subworkflows=True, include_keys: List[str] = None
+    ):
+        params = [("expandSubWorkflows", str(expand_subworkflows).lower())]
+        params.extend(("includeKey", k) for k in include_keys or [])
+        return self.url_base() + f"/{identifier}/metadata?" + parse.urlencode(params)
 
     def url_abort(self, identifier):
         return self.url_base() + f"/{identifier}/abort"
@@ -465,7 +476,10 @@ class Cromwell(Engine):
 
         for engine_id_to_poll in self.progress_callbacks:
             try:
-                meta = self.metadata(engine_id_to_poll)
+                if self.incremental_polling:
+                    meta = self.incremental_metadata(engine_id_to_poll)
+                else:
+                    meta = self.metadata(engine_id_to_poll)
                 if meta:
                     for callback in self.progress_callbacks[engine_id_to_poll]:
                         callback(meta)
@@ -706,9 +720,12 @@ class Cromwell(Engine):
         identifier,
         expand_subworkflows=True,
         metadata_export_file_path: Optional[str] = None,
+        include_keys: List[str] = None,
     ) -> Optional[CromwellMetadata]:
         url = self.url_metadata(
-            identifier=identifier, expand_subworkflows=expand_subworkflows
+            identifier=identifier,
+            expand_subworkflows=expand_subworkflows,
+            include_keys=include_keys,
         )
 
         if not self.last_contacted:
@@ -817,6 +834,30 @@ class Cromwell(Engine):
         )
         return raw.standard() if raw else raw
 
+    def incremental_metadata(self, identifier) -> Optional[RunModel]:
+        """
+        Like metadata, but only returns the jobs that have changed since the last call,
+        see CromwellIncrementalMetadata for more information.
+        """
+        if self.error_message:
+            return self.metadata(identifier)
+
+        if identifier not in self._incremental_metadata:
+
+            def fetch(wid):
+                raw = self.raw_metadata(
+                    wid,
+                    expand_subworkflows=False,
+                    include_keys=CromwellMetadata.POLLING_INCLUDE_KEYS,
+                )
+                return raw.meta if raw else None
+
+            self._incremental_metadata[identifier] = CromwellIncrementalMetadata(
+                fetch
+            )
+
+        return self._incremental_metadata[identifier].poll(identifier)
+
     def terminate_task(self, identifier) -> TaskStatus:
         from time import sleep
 
@@ -55,10 +55,7 @@ class CWLToolLogger(ProcessLogger):
                         break
                     continue
 
-                if self.logfp and not self.logfp.closed:
-                    self.logfp.write(line + "\n")
-                    self.logfp.flush()
-                    os.fsync(self.logfp.fileno())
+                self.write_log(line)
 
                 lowline = line.lower().lstrip()
                 if lowline.startswith("error"):
@@ -74,8 +71,8 @@ class CWLToolLogger(ProcessLogger):
                     Logger.info("cwltool: " + line)
                     self.process_metadataupdate_if_match(line)
 
-                else:
-                    Logger.debug("cwltool: " + line)
+                # other lines (the output of tools, etc) are only in the engine log,
+                # as they can be very frequent
 
                 if iserroring:
                     self.error = (self.error or "") + "\n" + line
@@ -97,10 +94,7 @@ class CWLToolLogger(ProcessLogger):
                         continue
                     line = c.decode("utf-8").rstrip()
                     Logger.debug(line)
-                    if self.logfp and not self.logfp.closed:
-                        self.logfp.write(line + "\n")
-                        self.logfp.flush()
-                        os.fsync(self.logfp.fileno())
+                    self.write_log(line)
                     j += line
                     try:
                         self.outputs = json.loads(j)
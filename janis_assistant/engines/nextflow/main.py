@@ -7,7 +7,8 @@ import subprocess
 import socketserver
 import socket
 import random
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from http.server import BaseHTTPRequestHandler
 
@@ -35,6 +36,11 @@ def make_request_handler(nextflow_logger):
             body_as_str = post_body.decode("utf-8")
             body_as_json = json.loads(body_as_str)
 
+            # acknowledge straight away, the event is only queued for the engine (see
+            # Nextflow.task_did_update) so Nextflow isn't kept waiting on Janis
+            self.send_response(200)
+            self.end_headers()
+
             # Logger.debug(body_as_json)
 
             event = body_as_json.get("event")
@@ -57,7 +63,6 @@ def make_request_handler(nextflow_logger):
                 exit_code = trace.get("exit")
                 process_id = trace.get("native_id")
                 container = trace.get("container")
-                err_message = self.read_error_message(work_dir)
 
                 janis_status = self.read_process_status(body_as_json)
                 start, finish = self.set_start_finish_time(janis_status)
@@ -82,7 +87,6 @@ def make_request_handler(nextflow_logger):
                         batchid=process_id,
                         container=container,
                         returncode=exit_code,
-                        error=err_message
                     )
 
                     nextflow_logger.metadata_callback(nextflow_logger, job)
@@ -91,16 +95,9 @@ def make_request_handler(nextflow_logger):
             else:
                 raise Exception(f"Unknown weblog request event {event}")
 
-        @classmethod
-        def read_error_message(cls, work_dir: str) -> Optional[str]:
-            err_message = None
-
-            file_path = os.path.join(work_dir, ".err")
-            if os.path.exists(file_path):
-                with open(file_path, "r") as f:
-                    err_message = f.read()
-
-            return err_message
+        def log_message(self, format, *args):
+            # one line per weblog event is too noisy for stderr
+            Logger.log(format % args, LogLevel.VERBOSE)
 
         def read_cached_process(self, data: dict):
             processes = data.get("metadata", {}).get("workflow", {}).get("workflowStats", {}).get("processes", [])
@@ -294,6 +291,11 @@ class NextFlowTaskMonitor:
 
 
 class Nextflow(Engine):
+
+    # weblog events are coalesced, and only the jobs that changed are passed to the
+    # progress callbacks, at most once every CALLBACK_INTERVAL_MS
+    CALLBACK_INTERVAL_MS = 500
+
     def __init__(
             self,
             execution_dir: str,
@@ -316,6 +318,11 @@ class Nextflow(Engine):
 
         self.taskmeta = {}
 
+        self._pending_jobs: Dict[str, RunJobModel] = {}
+        self._pending_lock = threading.Lock()
+        self._callback_lock = threading.Lock()
+        self._callback_timer = None
+
         self.find_or_generate_config(config)
 
     def find_or_generate_config(self, config: NextflowConfiguration):
@@ -419,7 +426,12 @@ class Nextflow(Engine):
 
         return wid
 
-    def metadata(self, identifier) -> RunModel:
+    def metadata(self, identifier, jobs: List[RunJobModel] = None) -> RunModel:
+        """
+        :param jobs: only include these jobs, rather than every job in the run
+        """
+        if jobs is None:
+            jobs = list(self.taskmeta.get("jobs", {}).values())
         return RunModel(
             id_=identifier,
             engine_id=identifier,
@@ -427,7 +439,7 @@ class Nextflow(Engine):
             submission_id=None,
             name=identifier,
             status=self.taskmeta.get("status"),
-            jobs=list(self.taskmeta.get("jobs", {}).values()),
+            jobs=jobs,
             error=self.taskmeta.get("error"),
         )
 
@@ -514,9 +526,24 @@ class Nextflow(Engine):
 
         return outputs
 
+    @staticmethod
+    def read_error_message(work_dir: str) -> Optional[str]:
+        err_message = None
+
+        file_path = os.path.join(work_dir, ".err")
+        if os.path.exists(file_path):
+            with open(file_path, "r") as f:
+                err_message = f.read()
+
+        return err_message
+
     def task_did_exit(self, logger: NextflowLogger):
         Logger.debug("Shell fired 'did exit'")
 
+        # the final metadata below has every job, but the errors of the pending jobs
+        # still need to be read
+        self.flush_job_updates(logger.sid)
+
         if logger.nf_monitor is not None:
             self.taskmeta["status"] = logger.nf_monitor.status
             self.taskmeta["finish"] = DateUtil.now()
@@ -532,7 +559,48 @@ class Nextflow(Engine):
 
     def task_did_update(self, logger: NextflowLogger, job: RunJobModel):
         Logger.debug(f"Updated task {job.id_} with status={job.status}")
-        self.taskmeta["jobs"][job.id_] = job
 
-        for callback in self.progress_callbacks.get(logger.sid, []):
-            callback(self.metadata(logger.sid))
+        with self._pending_lock:
+            previous = self._pending_jobs.get(job.id_) or self.taskmeta["jobs"].get(
+                job.id_
+            )
+            if previous is not None:
+                # an event only has the time of the transition it describes
+                job.start = job.start or previous.start
+                job.finish = job.finish or previous.finish
+
+            self.taskmeta["jobs"][job.id_] = job
+            self._pending_jobs[job.id_] = job
+
+            if self._callback_timer is None:
+                self._callback_timer = threading.Timer(
+                    self.CALLBACK_INTERVAL_MS / 1000,
+                    self.flush_job_updates,
+                    args=(logger.sid,),
+                )
+                self._callback_timer.daemon = True
+                self._callback_timer.start()
+
+    def flush_job_updates(self, sid: str):
+        """
+        Pass the jobs that have changed since the last flush to the progress callbacks.
+        """
+        # a flush from task_did_exit can't overtake one from the timer
+        with self._callback_lock:
+            with self._pending_lock:
+                if self._callback_timer is not None:
+                    self._callback_timer.cancel()
+                    self._callback_timer = None
+                jobs = list(self._pending_jobs.values())
+                self._pending_jobs = {}
+
+            if not jobs:
+                return
+
+            for job in jobs:
+                if job.error is None and job.workdir and job.status.is_in_final_state():
+                    job.error = self.read_error_message(job.workdir)
+
+            meta = self.metadata(sid, jobs=jobs)
+            for callback in self.progress_callbacks.get(sid, []):
+                callback(meta)
@@ -9,6 +9,7 @@
 import os
 import sys
 import time
+from copy import copy
 from datetime import datetime
 from inspect import isclass
 from typing import Optional, Type, Tuple, Any
@@ -32,9 +33,8 @@ from janis_assistant.modifiers.remotefilemodifier import RemoteFileLocatorModifi
 from janis_assistant.modifiers.inputtransformermodifier import InputTransformerModifier
 from janis_assistant.validation import ValidationRequirements
 
-from janis_assistant.utils.batchrun import BatchRunRequirements
+from janis_assistant.utils.batchrun import BatchRunRequirements, split_batch_inputs
 from janis_core import InputQualityType, Tool, DynamicWorkflow, LogLevel, JanisShed
-from janis_core import ingestion
 from janis_core import translations
 
 import janis_assistant.templates as janistemplates
@@ -232,6 +232,10 @@ def ingest(
     if format == 'janis':
         return infile
     else:
+        # importing ingestion (galaxy, cwl-utils, etc) takes a few seconds, so only
+        # do it for the commands that need it
+        from janis_core import ingestion
+
         return ingestion.ingest(
             infile,
             format,
@@ -282,6 +286,7 @@ def translate(
             container_override,
             cache_location=config.digest_cache_location,
             skip_digest_cache=skip_digest_cache,
+            cache_ttls=config.digest_cache_ttls,
         )
 
     translations.translate(
@@ -557,35 +562,155 @@ def run_from_jobfile(
     if not workflow:
         raise Exception("Couldn't find workflow with name: " + str(workflow))
 
+    if jobfile.batchrun and (jobfile.batchrun.split or 1) > 1:
+        return run_split_batch_from_jobfile(
+            workflow,
+            jobfile,
+            engine=engine,
+            wait=wait,
+            cromwell_jar=cromwell_jar,
+            cromwell_url=cromwell_url,
+        )
+
     row = cm.create_task_base(wf=workflow, job=jobfile,)
 
     jobfile.execution_dir = row.execution_dir
     jobfile.output_dir = row.output_dir
 
-    # set logger for submit
+    set_submission_logging(row.execution_dir)
+    print(row.submission_id, file=sys.stdout)
+
+    return submit_task(
+        workflow,
+        jobfile,
+        submission_id=row.submission_id,
+        engine=engine,
+        wait=wait,
+        cromwell_jar=cromwell_jar,
+        cromwell_url=cromwell_url,
+    )
+
+
+def run_split_batch_from_jobfile(
+    workflow: j.Tool,
+    jobfile: PreparedJob,
+    engine: Optional[str | Engine] = None,
+    wait: bool = False,
+    cromwell_jar: Optional[str] = None,
+    cromwell_url: Optional[str] = None,
+):
+    """
+    Split a batch run into (batchrun.split) child submissions, that each run a
+    contiguous chunk of the groupby values with their own task.db and engine, and
+    are submitted in the background through the template.
+
+    The parent submission doesn't run anything, the children push their status up
+    to it, and it collects their outputs once they've all finished.
+    """
+    if not jobfile.run_in_background:
+        raise Exception(
+            "Splitting a batch run requires running in the background, try adding "
+            "the '--background' argument"
+        )
+
+    cm = ConfigManager(db_path=jobfile.db_path)
+    inputs = jobfile.inputs or {}
+    splits = split_batch_inputs(inputs, jobfile.batchrun, jobfile.batchrun.split)
+
+    parent_row = cm.create_task_base(wf=workflow, job=jobfile)
+    jobfile.execution_dir = parent_row.execution_dir
+    jobfile.output_dir = parent_row.output_dir
+
+    set_submission_logging(parent_row.execution_dir)
+    print(parent_row.submission_id, file=sys.stdout)
+
+    parent = WorkflowManager.create_batch_parent(
+        submission_id=parent_row.submission_id,
+        tool=workflow,
+        prepared_submission=jobfile,
+    )
+    Logger.info(
+        f"Splitting batch run '{parent_row.submission_id}' into {len(splits)} submissions"
+    )
+
+    for idx, split_inputs in enumerate(splits):
+        child_job = copy(jobfile)
+        child_job.inputs = split_inputs
+        # each child is a regular batch run of its share of the groups
+        child_job.batchrun = BatchRunRequirements(
+            fields=jobfile.batchrun.fields,
+            groupby=jobfile.batchrun.groupby,
+            mode=jobfile.batchrun.mode,
+        )
+        child_job.execution_dir = os.path.join(
+            parent_row.execution_dir, "batches", str(idx)
+        )
+        child_job.should_watch_if_background = False
+        child_job.batch_parent = {
+            "submission_id": parent_row.submission_id,
+            "execution_dir": parent_row.execution_dir,
+        }
+
+        row = cm.create_task_base(wf=workflow, job=child_job)
+        child_job.execution_dir = row.execution_dir
+        child_job.output_dir = row.output_dir
+
+        # before submitting, so the child can always find itself in the parent
+        parent.add_batch_child(row.submission_id, row.execution_dir)
+        submit_task(
+            workflow,
+            child_job,
+            submission_id=row.submission_id,
+            engine=engine,
+            cromwell_jar=cromwell_jar,
+            cromwell_url=cromwell_url,
+        )
+
+    parent.refresh_batch_status()
+
+    if wait:
+        Logger.info("WAITING until task finishes before returning")
+        while not parent.database.get_uncached_status().is_in_final_state():
+            time.sleep(2)
+    elif jobfile.should_watch_if_background:
+        parent.show_status_screen()
+
+    return parent
+
+
+def set_submission_logging(execution_dir: str):
     Logger.set_write_level(Logger.CONSOLE_LEVEL)
     logpath = os.path.join(
         WorkflowManager.get_path_for_component_and_dir(
-            row.execution_dir, WorkflowManager.WorkflowManagerPath.logs
+            execution_dir, WorkflowManager.WorkflowManagerPath.logs
         ),
         "janis-submit.log",
     )
     Logger.WRITE_LEVELS = {Logger.CONSOLE_LEVEL: (logpath, open(logpath, "a"))}
     Logger.debug(f"Set submission logging to '{logpath}'")
-    print(row.submission_id, file=sys.stdout)
 
+
+def submit_task(
+    workflow: j.Tool,
+    jobfile: PreparedJob,
+    submission_id: str,
+    engine: Optional[str | Engine] = None,
+    wait: bool = False,
+    cromwell_jar: Optional[str] = None,
+    cromwell_url: Optional[str] = None,
+):
     eng = get_engine_from_eng(
         engine or jobfile.engine,
-        wid=row.submission_id,
+        wid=submission_id,
         execdir=WorkflowManager.get_path_for_component_and_dir(
-            row.execution_dir, WorkflowManager.WorkflowManagerPath.execution
+            jobfile.execution_dir, WorkflowManager.WorkflowManagerPath.execution
         ),
         confdir=WorkflowManager.get_path_for_component_and_dir(
-            row.execution_dir, WorkflowManager.WorkflowManagerPath.configuration
+            jobfile.execution_dir, WorkflowManager.WorkflowManagerPath.configuration
         ),
         logfile=os.path.join(
             WorkflowManager.get_path_for_component_and_dir(
-                row.execution_dir, WorkflowManager.WorkflowManagerPath.logs
+                jobfile.execution_dir, WorkflowManager.WorkflowManagerPath.logs
             ),
             "engine.log",
         ),
@@ -596,7 +721,7 @@ def run_from_jobfile(
     try:
 
         wm = WorkflowManager.from_janis(
-            submission_id=row.submission_id,
+            submission_id=submission_id,
             tool=workflow,
             engine=eng,
             prepared_submission=jobfile,
@@ -654,6 +779,7 @@ def prepare_job(
     source_hints: Optional[list[str]] = None,
     post_run_script: Optional[str] = None,
     localise_all_files: bool = False,
+    skip_translation_cache: bool = False,
 ):
 
     # organise inputs
@@ -734,6 +860,8 @@ def prepare_job(
         ),
         run_in_background=should_run_in_background,
         digest_cache_location=jc.digest_cache_location,
+        digest_cache_ttls=jc.digest_cache_ttls,
+        translation_cache_location=jc.translation_cache_location,
         # job information
         inputs=inputsdict,
         output_dir=output_dir,
@@ -744,6 +872,7 @@ def prepare_job(
         container_override=container_override,
         skip_digest_lookup=skip_digest_lookup,
         skip_digest_cache=skip_digest_cache,
+        skip_translation_cache=skip_translation_cache,
         batchrun=batchrun_reqs,
         store_in_central_db=not no_store,
         skip_file_check=not check_files,
@@ -808,6 +937,7 @@ def get_engine_from_eng(
             host=url,
             cromwelljar=cromwell_jar,
             execution_dir=execdir,
+            incremental_polling=PreparedJob.instance().cromwell.incremental_polling,
         )
     elif engid == EngineType.nextflow.value:
         return get_engine_type(eng)(logfile=logfile, execution_dir=execdir, configuration_dir=confdir)
@@ -1,8 +1,9 @@
 import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from shutil import rmtree
-from typing import Dict, Optional, Union, List
+from typing import Dict, Optional, Union, List, Set, Tuple
 from contextlib import contextmanager
 
 from janis_assistant.management.envvariables import EnvVariables
@@ -11,9 +12,10 @@ from janis_assistant.data.models.preparedjob import PreparedJob
 from janis_assistant.engines import Engine
 from janis_core import Workflow, Logger, Tool
 
-from janis_assistant.data.models.run import RunModel
+from janis_assistant.data.enums import TaskStatus
 from janis_assistant.data.providers.janisdbprovider import TasksDbProvider, TaskRow
 from janis_assistant.management.configuration import JanisConfiguration
+from janis_assistant.management.workflowdbmanager import WorkflowDbManager
 from janis_assistant.management.workflowmanager import WorkflowManager
 from janis_assistant.utils import generate_new_id, fully_qualify_filename
 from janis_assistant.utils.batchrun import BatchRunRequirements
@@ -263,31 +265,90 @@ class ConfigManager:
     #         f"Couldn't find task with id='{submission_id}', and no directory was found "
     #     )
 
-    def query_tasks(self, status, name) -> Dict[str, RunModel]:
+    def query_tasks(
+        self,
+        status: Optional[TaskStatus],
+        name: Optional[str],
+        refresh: bool = False,
+        max_workers: int = 8,
+    ) -> Dict[str, TaskRow]:
+        """
+        Query the summaries of tasks in the central database (kept up to date by each
+        WorkflowManager when its status changes).
 
-        rows: List[TaskRow] = self.get_lazy_db_connection().get_all_tasks()
+        :param refresh: Re-read the summary of every task that hasn't finished from its
+                task.db, in case its WorkflowManager was killed before it could update it.
+                Tasks without a summary (eg: from before we stored it) are always refreshed.
+        :param max_workers: The number of task databases to read at once when refreshing
+        """
+        db = self.get_lazy_db_connection()
+
+        rows = db.query()
+        to_refresh = [
+            row
+            for row in rows
+            if not row.has_summary()
+            or (refresh and not (row.status and row.status.is_in_final_state()))
+        ]
+        summaries, failed = [], set()
+        if to_refresh:
+            summaries, failed = self.refresh_task_summaries(
+                to_refresh, max_workers=max_workers
+            )
 
-        failed = []
-        relevant = {}
+        if summaries and self.readonly:
+            # the refreshed summaries weren't stored, so filter them here
+            refreshed = {row.submission_id: row for row in summaries}
+            return {
+                row.submission_id: row
+                for row in (refreshed.get(r.submission_id, r) for r in rows)
+                if row.submission_id not in failed
+                and row.matches(status=status, name=name)
+            }
+
+        return {
+            row.submission_id: row
+            for row in db.query(status=status, name=name)
+            if row.submission_id not in failed
+        }
+
+    def refresh_task_summaries(
+        self, rows: List[TaskRow], max_workers: int = 8
+    ) -> Tuple[List[TaskRow], Set[str]]:
+        """
+        :return: The refreshed summaries (stored unless we're readonly), and the ids
+                of the tasks we couldn't get a summary for
+        """
+        Logger.info(f"Refreshing the summaries of {len(rows)} tasks")
 
-        for row in rows:
+        def get_summary(row: TaskRow) -> Optional[TaskRow]:
             if not os.path.exists(row.execution_dir):
-                failed.append(row.submission_id)
-                continue
+                return None
             try:
-                metadb = WorkflowManager.has(
-                    row.execution_dir,
-                    submission_id=row.submission_id,
-                    name=name,
-                    status=status,
+                database = WorkflowDbManager(
+                    row.submission_id, row.execution_dir, readonly=True
                 )
-                if metadb:
-                    model = metadb
-                    model.outdir = row.output_dir
-                    relevant[row.submission_id] = model
+                try:
+                    return database.get_task_summary()
+                finally:
+                    database.connection.close()
             except Exception as e:
                 Logger.critical(f"Couldn't check workflow '{row.submission_id}': {e}")
-                failed.append(row.submission_id)
+                return None
+
+        failed = []
+        summaries = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for row, summary in zip(rows, executor.map(get_summary, rows)):
+                if summary is None:
+                    failed.append(row.submission_id)
+                else:
+                    summaries.append(summary)
+
+        if self.readonly:
+            Logger.debug("Not storing refreshed summaries as the janis db is readonly")
+        else:
+            self.get_lazy_db_connection().update_summaries(summaries)
 
         if failed:
             failedstr = ", ".join(failed)
@@ -296,7 +357,7 @@ class ConfigManager:
                 f"'janis cleanup' to clean up your tasks."
             )
 
-        return relevant
+        return summaries, set(failed)
 
     def cleanup_missing_tasks(self):
         from tabulate import tabulate
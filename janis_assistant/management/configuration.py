@@ -1,7 +1,7 @@
 import os.path
 from copy import copy
 from enum import Enum
-from typing import Optional, List, Union, Type
+from typing import Optional, List, Union, Type, Dict
 import ruamel.yaml
 
 from janis_assistant.containers import get_container_by_name
@@ -125,6 +125,7 @@ class JanisConfigurationCromwell(Serializable):
         db_type: DatabaseTypeToUse = DatabaseTypeToUse.filebased,
         mysql_credentials: Union[dict, MySqlInstanceConfig] = None,
         additional_config_lines: str = None,
+        incremental_polling: bool = False,
     ):
         """
         :param url: Use an existing Cromwell instance with this URL (with port). Use the BASE url, do NOT include http.
@@ -135,12 +136,14 @@ class JanisConfigurationCromwell(Serializable):
         :param call_caching_method: (Default: "fingerprint") Cromwell caching strategy to use, see `Call cache strategy options for local filesystem <https://cromwell.readthedocs.io/en/stable/Configuring/#call-cache-strategy-options-for-local-filesystem>`_ for more information.
         :param timeout: Suspend a Janis workflow if unable to contact cromwell for <timeout> MINTUES.
         :param polling_interval: How often to poll Cromwell, by default this starts at 5 seconds, and gradually falls to 60 seconds over 30 minutes. For more information, see the ``janis_assistant.Cromwell.get_poll_interval`` `method <https://github.com/PMCC-BioinformaticsCore/janis-assistant/blob/master/janis_assistant/engines/cromwell/main.py#L179>`_
-        :param db_type: (Default: filebased) DB type to use for Janis. "none" -> no database; "existing" -> use mysql credentials from ``cromwell.mysql_credentials``; "managed" -> Janis will start and manage a containerised MySQL instance; "filebased": Use the HSQLDB filebased db through Cromwell for SMALL workflows only (NB: this can produce large files, and timeout for large workflows); "from_script": Call the script ``$JANIS_DBCREDENTIALSGENERATOR`` for credentials. See `get_config_from_script <https://github.com/PMCC-BioinformaticsCore/janis-assistant/blob/master/janis_assistant/management/configuration.py#L621>`_ for more information.
-        :type db_type: "none" | "existing" | "managed" | "filebased" | "from_script"
+        :param db_type: (Default: filebased) DB type to use for Janis. "none" -> no database; "existing" -> use mysql credentials from ``cromwell.mysql_credentials``; "managed" -> Janis will start and manage a containerised MySQL instance; "shared" -> like managed, but a single MySQL instance (per user and host) is shared between submissions, each with their own database; "filebased": Use the HSQLDB filebased db through Cromwell for SMALL workflows only (NB: this can produce large files, and timeout for large workflows); "from_script": Call the script ``$JANIS_DBCREDENTIALSGENERATOR`` for credentials. See `get_config_from_script <https://github.com/PMCC-BioinformaticsCore/janis-assistant/blob/master/janis_assistant/management/configuration.py#L621>`_ for more information.
+        :type db_type: "none" | "existing" | "managed" | "shared" | "filebased" | "from_script"
         :param mysql_credentials: A dictionary of MySQL credentials
         :type mysql_credentials: MySqlInstanceConfig
         :param additional_config_lines: A string to add to the bottom of a generated Cromwell configuration. This is NOT used for an existing cromwell instance, or a config is supplied.
         :type additional_config_lines: str
+        :param incremental_polling: (Default: False) Only request the metadata keys Janis uses, fetch each subworkflow separately (skipping finished subworkflows), and only store the jobs that changed between polls. Recommended for large or heavily scattered workflows.
+        :type incremental_polling: bool
         """
         self.jar = jar
         self.config_path = config_path
@@ -158,6 +161,7 @@ class JanisConfigurationCromwell(Serializable):
                 MySqlInstanceConfig, mysql_credentials, "cromwell.mysql_credentials"
             )
         self.additional_params = additional_config_lines
+        self.incremental_polling = incremental_polling
 
     def get_database_config_helper(self):
 
@@ -393,6 +397,8 @@ class JanisConfiguration(NoAttributeErrors, Serializable):
         environment: Union[JanisConfigurationEnvironment, dict] = None,
         run_in_background: bool = None,
         digest_cache_location: str = None,
+        digest_cache_ttls: Dict[str, Optional[int]] = None,
+        translation_cache_location: str = None,
         container: Union[str, Container] = None,
         search_paths: List[str] = None,
         nextflow: Union[JanisConfigurationNextflow, dict] = None,
@@ -417,6 +423,10 @@ class JanisConfiguration(NoAttributeErrors, Serializable):
         :type run_in_background: bool
         :param digest_cache_location: A cache of docker tags to its digest that Janis uses replaces your docker tag with it's `digest <https://docs.docker.com/engine/reference/commandline/pull/#pull-an-image-by-digest-immutable-identifier>`_.
         :type digest_cache_location: str
+        :param digest_cache_ttls: How long (in seconds) a cached digest is used for, by the pattern of its tag (eg: ``{"latest": 86400, "*": null}``). The first matching pattern is used, null means the digest never expires. Defaults to refreshing mutable tags (latest, master, main, dev*, nightly*) daily.
+        :type digest_cache_ttls: Dict[str, int]
+        :param translation_cache_location: A cache of translated workflows (keyed on the workflow definition, translator and options), so submitting the same workflow again doesn't have to translate it. Defaults to ``$JANIS_CONFIGDIR/translation_cache``.
+        :type translation_cache_location: str
         :param container: Container technology to use, important for checking if container environment is available and running mysql instance.
         :type container: "docker" | "singularity"
         :param search_paths: A list of paths to check when looking for python files and input files
@@ -428,6 +438,12 @@ class JanisConfiguration(NoAttributeErrors, Serializable):
         self.digest_cache_location = digest_cache_location
         if not digest_cache_location:
             self.digest_cache_location = os.path.join(self.config_dir, "digest_cache")
+        self.digest_cache_ttls = digest_cache_ttls
+        self.translation_cache_location = translation_cache_location
+        if not translation_cache_location:
+            self.translation_cache_location = os.path.join(
+                self.config_dir, "translation_cache"
+            )
 
         self.output_dir = output_dir
         self.execution_dir = execution_dir
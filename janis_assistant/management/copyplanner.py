@@ -0,0 +1,115 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional
+
+from janis_core.utils.logger import Logger
+
+from janis_assistant.management.filescheme import FileScheme
+
+
+class PlannedCopy:
+    def __init__(self, fs: FileScheme, source: str, dest: str):
+        self.fs = fs
+        self.source = source
+        self.dest = dest
+        self.attempts = 0
+        self.error: Optional[Exception] = None
+
+    def __repr__(self):
+        return f"{self.source} -> {self.dest} ({self.fs.id()})"
+
+
+class CopyPlan:
+    """
+    Collects every (source, destination) pair to copy first, then executes them
+    on a bounded thread pool per FileScheme (see FileScheme.MAX_CONCURRENT_COPIES).
+    """
+
+    def __init__(
+        self,
+        nretries: int = 3,
+        retry_delay_seconds: float = 2,
+        report_interval_seconds: float = 30,
+    ):
+        """
+        :param nretries: Number of times to try each copy before giving up on it
+        :param retry_delay_seconds: Wait (retry_delay_seconds * attempt) before trying a failed copy again
+        :param report_interval_seconds: Log the progress at most this often
+        """
+        self.nretries = nretries
+        self.retry_delay_seconds = retry_delay_seconds
+        self.report_interval_seconds = report_interval_seconds
+        self.copies: List[PlannedCopy] = []
+
+    def add(self, fs: FileScheme, source: str, dest: str):
+        self.copies.append(PlannedCopy(fs, source, dest))
+
+    def __len__(self):
+        return len(self.copies)
+
+    def execute(self) -> List[PlannedCopy]:
+        """
+        :return: The copies that failed (after retrying)
+        """
+        if not self.copies:
+            return []
+
+        by_filescheme: Dict[str, List[PlannedCopy]] = {}
+        for c in self.copies:
+            by_filescheme.setdefault(c.fs.id(), []).append(c)
+
+        total = len(self.copies)
+        Logger.info(
+            f"Copying {total} files ({', '.join(f'{k}: {len(v)}' for k, v in by_filescheme.items())})"
+        )
+
+        executors = []
+        futures = []
+        try:
+            for copies in by_filescheme.values():
+                executor = ThreadPoolExecutor(
+                    max_workers=copies[0].fs.MAX_CONCURRENT_COPIES
+                )
+                executors.append(executor)
+                futures.extend(executor.submit(self.copy, c) for c in copies)
+
+            failed = []
+            last_report = time.time()
+            for ncompleted, future in enumerate(as_completed(futures), start=1):
+                copy = future.result()
+                if copy.error is not None:
+                    failed.append(copy)
+
+                if time.time() - last_report > self.report_interval_seconds:
+                    last_report = time.time()
+                    Logger.info(f"Copied {ncompleted} / {total} files")
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+
+        Logger.info(f"Copied {total - len(failed)} / {total} files")
+        return failed
+
+    def copy(self, copy: PlannedCopy) -> PlannedCopy:
+        while copy.attempts < self.nretries:
+            copy.attempts += 1
+            try:
+                copy.fs.cp_from(copy.source, copy.dest, force=True)
+                # some FileSchemes (eg: local) only log an error, and don't raise
+                if not os.path.lexists(copy.dest):
+                    raise FileNotFoundError(f"'{copy.dest}' wasn't created")
+                copy.error = None
+                return copy
+            except Exception as e:
+                copy.error = e
+                if copy.attempts < self.nretries:
+                    Logger.warn(
+                        f"Couldn't copy {copy} (attempt {copy.attempts} / {self.nretries}), retrying: {repr(e)}"
+                    )
+                    time.sleep(self.retry_delay_seconds * copy.attempts)
+
+        Logger.critical(
+            f"Couldn't copy {copy} after {copy.attempts} attempts: {repr(copy.error)}"
+        )
+        return copy
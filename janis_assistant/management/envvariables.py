@@ -49,6 +49,13 @@ class EnvVariables(HashableEnum):
     db_script_generator = "JANIS_DBCREDENTIALSGENERATOR"
     db_script_generator_cleanup = "JANIS_DBCREDENTIALSGENERATORCLEANUP"
 
+    #: (Default: 8) How many container digests Janis will look up from registries at once
+    digest_lookup_concurrency = "JANIS_DIGESTLOOKUPCONCURRENCY"
+    #: (Default: 4) How many ranges of a large file Janis will download at once over HTTP
+    http_download_connections = "JANIS_HTTPDOWNLOADCONNECTIONS"
+    #: Use this endpoint for S3 (eg: for MinIO), instead of AWS
+    s3_endpoint_url = "JANIS_S3ENDPOINTURL"
+
     def __str__(self):
         return self.value
 
@@ -69,6 +76,10 @@ class EnvVariables(HashableEnum):
             return []
         elif self == EnvVariables.recipe_directory:
             return []
+        elif self == EnvVariables.digest_lookup_concurrency:
+            return 8
+        elif self == EnvVariables.http_download_connections:
+            return 4
 
         raise Exception(f"Couldn't determine default() for '{self.value}'")
 
@@ -80,4 +91,9 @@ class EnvVariables(HashableEnum):
             return value.split(",") if value else None
         if self == EnvVariables.recipe_directory:
             return value.split(",") if value else None
+        if self in (
+            EnvVariables.digest_lookup_concurrency,
+            EnvVariables.http_download_connections,
+        ):
+            return int(value) if value else None
         return value
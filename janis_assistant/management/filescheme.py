@@ -2,13 +2,18 @@ import abc
 import os
 import shutil
 import subprocess
+import threading
 from enum import Enum
-from shutil import copyfile, rmtree
-from typing import Optional, Callable
+from shutil import rmtree
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, List, Dict
 
 from janis_core.utils.logger import Logger
 
 from janis_assistant.management import Archivable
+from janis_assistant.management.envvariables import EnvVariables
+from janis_assistant.utils.filecopy import copy_file
+from janis_assistant.utils.httpdownload import head, download
 
 try:
     from google.cloud import storage
@@ -17,6 +22,13 @@ try:
 except:
     has_google_cloud = False
 
+try:
+    import boto3
+
+    has_boto3 = True
+except ImportError:
+    has_boto3 = False
+
 
 class FileScheme(Archivable, abc.ABC):
     class FileSchemeType(Enum):
@@ -29,6 +41,13 @@ class FileScheme(Archivable, abc.ABC):
         def __str__(self):
             return self.value
 
+    # How many cp_from / cp_to calls Janis will make at once (eg: when copying outputs)
+    MAX_CONCURRENT_COPIES = 4
+    # How many exists (HEAD / stat) calls Janis will make at once (see exists_many)
+    MAX_CONCURRENT_REQUESTS = 16
+    # If at least this many paths (in exists_many) share a directory, list the directory instead
+    LIST_DIRECTORY_THRESHOLD = 16
+
     def __init__(self, identifier: str, fstype: FileSchemeType):
         self.identifier = identifier
         self.fstype = fstype
@@ -40,6 +59,31 @@ class FileScheme(Archivable, abc.ABC):
     def exists(self, path):
         pass
 
+    def exists_many(self, paths: List[str]) -> Dict[str, bool]:
+        """
+        Check whether many paths exist, by default with concurrent calls to exists.
+        FileSchemes may override this to list directories that contain lots of the paths.
+        :return: {path: exists}
+        """
+        paths = list(dict.fromkeys(paths))
+        if len(paths) <= 1:
+            return {p: self.exists(p) for p in paths}
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.MAX_CONCURRENT_REQUESTS, len(paths))
+        ) as executor:
+            return dict(zip(paths, executor.map(self.exists, paths)))
+
+    @staticmethod
+    def group_by_directory(paths: List[str]) -> Dict[str, List[str]]:
+        grouped = {}
+        for p in paths:
+            # a directory with a trailing slash is in its parent, not itself
+            stripped = p.rstrip("/")
+            directory = stripped.rsplit("/", 1)[0] if "/" in stripped else ""
+            grouped.setdefault(directory, []).append(p)
+        return grouped
+
     @abc.abstractmethod
     def cp_from(
         self,
@@ -126,6 +170,8 @@ class FileScheme(Archivable, abc.ABC):
 
 
 class LocalFileScheme(FileScheme):
+    MAX_CONCURRENT_COPIES = 8
+
     def __init__(self):
         super().__init__("local", FileScheme.FileSchemeType.local)
 
@@ -171,7 +217,7 @@ class LocalFileScheme(FileScheme):
     @staticmethod
     def link_copy_or_fail(source: str, dest: str, force=False):
         """
-        Eventually move this to some generic util class
+        Hard link, or copy using the fastest method available (see utils.filecopy)
         :param source: Source to link from
         :param dest: Place to link to
         :param force: Overwrite destination if it exists
@@ -179,15 +225,17 @@ class LocalFileScheme(FileScheme):
         """
         try:
 
+            # (source, dest, is_dir) - is_dir comes from scandir, None if we don't know
             to_copy = [
                 (
                     LocalFileScheme.prepare_path(source),
                     LocalFileScheme.prepare_path(dest),
+                    None,
                 )
             ]
 
             while len(to_copy) > 0:
-                s, d = to_copy.pop(0)
+                s, d, is_dir = to_copy.pop()
 
                 # Check if path is Null/None
                 if not s:
@@ -196,31 +244,34 @@ class LocalFileScheme(FileScheme):
                 if not d:
                     continue
 
-                if os.path.exists(d) and force:
+                if force and os.path.exists(d):
                     Logger.debug(f"Destination exists, overwriting '{d}'")
                     if os.path.isdir(d):
                         rmtree(d)
                     else:
                         os.remove(d)
-                Logger.log(f"Hard linking {s} → {d}")
 
-                if os.path.isdir(s):
+                if is_dir is None:
+                    is_dir = os.path.isdir(s)
+
+                if is_dir:
                     os.makedirs(d, exist_ok=True)
-                    for f in os.listdir(s):
-                        to_copy.append((os.path.join(s, f), os.path.join(d, f)))
+                    with os.scandir(s) as it:
+                        for entry in it:
+                            to_copy.append(
+                                (
+                                    entry.path,
+                                    os.path.join(d, entry.name),
+                                    entry.is_dir(),
+                                )
+                            )
                     continue
                 try:
-                    os.link(s, d)
+                    copy_file(s, d)
                 except FileExistsError:
                     Logger.critical(
-                        "The file 'd' already exists. The force flag is required to overwrite."
+                        f"The file '{d}' already exists. The force flag is required to overwrite."
                     )
-                except Exception as e:
-                    Logger.warn("Couldn't link file: " + str(e))
-
-                    # if this fails, it should error
-                    Logger.log(f"Copying file {s} → {d}")
-                    copyfile(s, d)
         except Exception as e:
             Logger.critical(
                 f"An unexpected error occurred when link/copying {source} -> {dest}: {e}"
@@ -243,8 +294,45 @@ class LocalFileScheme(FileScheme):
     def exists(self, path):
         return os.path.exists(LocalFileScheme.prepare_path(path))
 
+    def exists_many(self, paths: List[str]) -> Dict[str, bool]:
+        """
+        Stat each path, except where lots of paths share a directory, we'll list the
+        directory once (which is much cheaper on network filesystems).
+        """
+        results = {}
+        to_stat = []
+        grouped = self.group_by_directory([self.prepare_path(p) for p in paths])
+        for directory, dir_paths in grouped.items():
+            if len(dir_paths) < self.LIST_DIRECTORY_THRESHOLD:
+                to_stat.extend(dir_paths)
+                continue
+            try:
+                with os.scandir(directory or ".") as it:
+                    # symlinks might be broken, so we'll stat them separately
+                    entries = {e.name: e.is_symlink() for e in it}
+            except OSError:
+                entries = {}
+            for p in dir_paths:
+                is_symlink = entries.get(os.path.basename(p.rstrip("/")))
+                if is_symlink is None:
+                    results[p] = False
+                elif is_symlink or p.endswith("/"):
+                    # a trailing slash only exists if it's a directory
+                    to_stat.append(p)
+                else:
+                    results[p] = True
+
+        results.update(super().exists_many(to_stat))
+        return {p: results[self.prepare_path(p)] for p in paths}
+
 
 class HTTPFileScheme(FileScheme):
+    """
+    Downloads are resumable, and large files are downloaded as parallel ranges
+    (see utils.httpdownload). The result of a HEAD request is briefly shared
+    between exists, get_file_size and last_modified.
+    """
+
     def __init__(self, credentials: any = None):
         super().__init__("http", FileScheme.FileSchemeType.http)
         self._credentials = credentials
@@ -254,7 +342,8 @@ class HTTPFileScheme(FileScheme):
         return prefix.startswith("http://") or prefix.startswith("https://")
 
     def get_file_size(self, path) -> Optional[int]:
-        return None
+        result = head(path)
+        return result.size if result.exists else None
 
     def cp_from(
         self,
@@ -263,15 +352,18 @@ class HTTPFileScheme(FileScheme):
         force=False,
         report_progress: Optional[Callable[[float], None]] = None,
     ):
-        import urllib.request
-
         if os.path.exists(dest):
             if not force:
                 return Logger.info(f"File already exists, skipping download ('{dest}')")
 
             os.remove(dest)
 
-        return urllib.request.urlretrieve(url=source, filename=dest)
+        return download(
+            source,
+            dest,
+            connections=EnvVariables.http_download_connections.resolve(True),
+            report_progress=report_progress,
+        )
 
     def cp_to(
         self,
@@ -294,32 +386,18 @@ class HTTPFileScheme(FileScheme):
         return None
 
     def exists(self, path):
-        import urllib.request
-
-        try:
-            req = urllib.request.Request(path, method="HEAD")
-            response = urllib.request.urlopen(req)
-            return response.getcode() == 200
-        except:
-            return False
+        return head(path).exists
 
     @staticmethod
     def last_modified(path: str) -> Optional[str]:
-        import urllib.request
-
-        try:
-            req = urllib.request.Request(path, method="HEAD")
-            response = urllib.request.urlopen(req)
-            if response.getheader("Last-Modified"):
-                return response.getheader("Last-Modified")
-            else:
-                return None
-
-        except:
-            return None
+        result = head(path)
+        return result.last_modified if result.exists else None
 
 
 class SSHFileScheme(FileScheme):
+    # each copy is a separate scp connection
+    MAX_CONCURRENT_COPIES = 2
+
     def __init__(self, identifier, connectionstring):
         super().__init__(identifier, FileScheme.FileSchemeType.ssh)
         self.connectionstring = connectionstring
@@ -416,7 +494,10 @@ class GCSFileScheme(FileScheme):
     def get_public_client(self):
         from google.cloud.storage import Client
 
-        return Client.create_anonymous_client()
+        # reuse the client (and its connection pool) for every request
+        if getattr(self, "_client", None) is None:
+            self._client = Client.create_anonymous_client()
+        return self._client
 
     def get_blob_from_link(self, link):
         bucket, blob = self.parse_gcs_link(link)
@@ -447,8 +528,31 @@ class GCSFileScheme(FileScheme):
         return bucket, blob
 
     def exists(self, path):
-        blob = self.get_blob_from_link(path)
-        return blob.exists()
+        bucket, blob = self.parse_gcs_link(path)
+        return self.get_public_client().bucket(bucket).blob(blob).exists()
+
+    def exists_many(self, paths: List[str]) -> Dict[str, bool]:
+        """
+        HEAD each blob, except where lots of blobs share a "directory", we'll list the
+        blobs with that prefix (one level) instead.
+        """
+        self.check_if_has_gcp()
+        results = {}
+        to_head = []
+        client = self.get_public_client()
+        for directory, dir_paths in self.group_by_directory(paths).items():
+            if len(dir_paths) < self.LIST_DIRECTORY_THRESHOLD:
+                to_head.extend(dir_paths)
+                continue
+            bucket, prefix = self.parse_gcs_link(directory + "/")
+            blobs = client.list_blobs(bucket, prefix=prefix, delimiter="/")
+            names = {f"gs://{bucket}/{b.name}" for b in blobs}
+            # the "directories" are only known once the blobs have been listed
+            names.update(f"gs://{bucket}/{p.rstrip('/')}" for p in blobs.prefixes)
+            results.update({p: p.rstrip("/") in names for p in dir_paths})
+
+        results.update(super().exists_many(to_head))
+        return results
 
     def cp_from(
         self,
@@ -491,20 +595,297 @@ class GCSFileScheme(FileScheme):
         raise NotImplementedError("Cannot remove directories through GCS filescheme")
 
 
+class _TransferProgress:
+    """
+    Turns the bytes reported by (the threads of) a transfer into the fraction of
+    all the transfers that report_progress expects
+    """
+
+    def __init__(self, total: int, report_progress: Callable[[float], None]):
+        self.total = total
+        self.report_progress = report_progress
+        self.transferred = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, nbytes: int):
+        with self.lock:
+            self.transferred += nbytes
+            if self.total:
+                self.report_progress(min(1.0, self.transferred / self.total))
+
+
 class S3FileScheme(FileScheme):
     """
-    Placeholder for S3 File schema, almost for sure going to need the 'aws' package,
-    probably a credentials file to access the files. Should call the report_progress param on cp
+    Objects are transferred through boto3's managed transfers, which split large
+    files into parts that are uploaded / downloaded in parallel. A different
+    endpoint (eg: MinIO) can be given, or set with $JANIS_S3ENDPOINTURL.
     """
 
+    # and each transfer can use TRANSFER_CONCURRENCY threads
+    MAX_CONCURRENT_COPIES = 4
+    TRANSFER_CONCURRENCY = 8
+    # files at least this big are transferred in parts
+    MULTIPART_THRESHOLD = 64 * 1024 * 1024
+    # S3 needs parts to be at least 5 MB, and at most 10,000 parts per object
+    MIN_PART_SIZE = 16 * 1024 * 1024
+    MAX_PARTS = 10000
+    # delete_objects accepts at most 1000 keys
+    DELETE_BATCH_SIZE = 1000
+
+    def __init__(self, identifier: str = "s3", endpoint_url: Optional[str] = None):
+        super().__init__(identifier, fstype=FileScheme.FileSchemeType.s3)
+        self.endpoint_url = endpoint_url or EnvVariables.s3_endpoint_url.resolve()
+
+    @staticmethod
+    def check_if_has_boto3():
+        if has_boto3:
+            return True
+        raise ImportError(
+            "You've tried to use the S3 filesystem, but don't have the 'boto3' library. "
+            "This can be installed with 'pip install janis-pipelines.runner[s3]'."
+        )
+
     @staticmethod
     def is_valid_prefix(prefix: str):
         return prefix.lower().startswith("s3://")
 
+    @staticmethod
+    def parse_s3_link(s3_link: str):
+        bucket, _, key = s3_link[5:].partition("/")
+        if not s3_link.lower().startswith("s3://") or not bucket:
+            raise Exception(
+                f"Janis was unable to validate your S3 link '{s3_link}', as it couldn't "
+                f"determine the BUCKET and KEY."
+            )
+        return bucket, key
+
+    def get_client(self):
+        # clients are thread safe, so reuse it (and its connection pool)
+        if getattr(self, "_client", None) is None:
+            self.check_if_has_boto3()
+            from botocore import UNSIGNED
+            from botocore.config import Config
+
+            config = Config(
+                max_pool_connections=max(
+                    self.MAX_CONCURRENT_REQUESTS,
+                    self.MAX_CONCURRENT_COPIES * self.TRANSFER_CONCURRENCY,
+                ),
+                retries={"max_attempts": 5, "mode": "standard"},
+            )
+            session = boto3.session.Session()
+            if session.get_credentials() is None:
+                # we can still read public buckets
+                config = config.merge(Config(signature_version=UNSIGNED))
+            self._client = session.client(
+                "s3", endpoint_url=self.endpoint_url, config=config
+            )
+        return self._client
+
+    def get_transfer_config(self, size: Optional[int]):
+        from boto3.s3.transfer import TransferConfig
+
+        part_size = self.MIN_PART_SIZE
+        if size:
+            # bigger parts (in whole MB) for files that would need too many
+            mb = 1024 * 1024
+            part_size = max(part_size, -(-size // (self.MAX_PARTS * mb)) * mb)
+        return TransferConfig(
+            multipart_threshold=self.MULTIPART_THRESHOLD,
+            multipart_chunksize=part_size,
+            max_concurrency=self.TRANSFER_CONCURRENCY,
+        )
+
+    def head(self, path) -> Optional[dict]:
+        """
+        :return: the head_object response, or None if the object doesn't exist
+        """
+        from botocore.exceptions import ClientError
+
+        bucket, key = self.parse_s3_link(path)
+        if not key or key.endswith("/"):
+            return None
+        try:
+            return self.get_client().head_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+
+    def list_objects(self, bucket: str, prefix: str, delimiter: Optional[str] = None):
+        """
+        :return: ([objects], [common prefixes])
+        """
+        paginator = self.get_client().get_paginator("list_objects_v2")
+        kwargs = {"Bucket": bucket, "Prefix": prefix}
+        if delimiter:
+            kwargs["Delimiter"] = delimiter
+        objects, prefixes = [], []
+        for page in paginator.paginate(**kwargs):
+            objects.extend(page.get("Contents", []))
+            prefixes.extend(p["Prefix"] for p in page.get("CommonPrefixes", []))
+        return objects, prefixes
+
+    def is_directory(self, path) -> bool:
+        bucket, key = self.parse_s3_link(path)
+        prefix = key.rstrip("/") + "/" if key else ""
+        response = self.get_client().list_objects_v2(
+            Bucket=bucket, Prefix=prefix, MaxKeys=1
+        )
+        return response.get("KeyCount", 0) > 0
+
+    def exists(self, path):
+        return self.head(path) is not None or self.is_directory(path)
+
+    def exists_many(self, paths: List[str]) -> Dict[str, bool]:
+        """
+        HEAD each object, except where lots of objects share a "directory", we'll
+        list the objects with that prefix (one level) instead.
+        """
+        results = {}
+        to_head = []
+        for directory, dir_paths in self.group_by_directory(paths).items():
+            if len(dir_paths) < self.LIST_DIRECTORY_THRESHOLD:
+                to_head.extend(dir_paths)
+                continue
+            bucket, prefix = self.parse_s3_link(directory + "/")
+            objects, prefixes = self.list_objects(bucket, prefix, delimiter="/")
+            names = {f"s3://{bucket}/{o['Key']}" for o in objects}
+            names.update(f"s3://{bucket}/{p.rstrip('/')}" for p in prefixes)
+            results.update({p: p.rstrip("/") in names for p in dir_paths})
+
+        results.update(super().exists_many(to_head))
+        return results
+
     def get_file_size(self, path) -> Optional[int]:
-        return None
+        obj = self.head(path)
+        return obj["ContentLength"] if obj else None
 
-    def mkdirs(self, directory):
-        pass
+    def last_modified(self, path: str) -> Optional[str]:
+        obj = self.head(path)
+        return obj["LastModified"].isoformat() if obj else None
+
+    def run_transfers(
+        self,
+        transfer: Callable,
+        transfers: List[tuple],
+        report_progress: Optional[Callable[[float], None]],
+    ):
+        """
+        :param transfers: [(source, dest, size)], each is passed to transfer with a
+            callback for the bytes transferred
+        """
+        callback = None
+        if report_progress:
+            total = sum(size or 0 for _, _, size in transfers)
+            callback = _TransferProgress(total, report_progress)
+
+        if len(transfers) == 1:
+            return transfer(*transfers[0], callback)
 
-    pass
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_COPIES) as executor:
+            futures = [executor.submit(transfer, *t, callback) for t in transfers]
+            for future in futures:
+                future.result()
+
+    def cp_from(
+        self,
+        source,
+        dest,
+        force=False,
+        report_progress: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Download an object, or every object under a prefix (to the same
+        structure under dest)
+        """
+        bucket, key = self.parse_s3_link(source)
+        obj = self.head(source)
+        if obj is not None:
+            transfers = [(source, dest, obj["ContentLength"])]
+        else:
+            prefix = key.rstrip("/") + "/" if key else ""
+            objects, _ = self.list_objects(bucket, prefix)
+            if not objects:
+                raise Exception(f"Couldn't find S3 object or prefix '{source}'")
+            transfers = [
+                (
+                    f"s3://{bucket}/{o['Key']}",
+                    os.path.join(dest, *o["Key"][len(prefix) :].split("/")),
+                    o["Size"],
+                )
+                for o in objects
+                # "folders" created by the S3 console
+                if not o["Key"].endswith("/")
+            ]
+
+        def download(source, dest, size, callback):
+            if os.path.exists(dest):
+                if not force:
+                    return Logger.info(
+                        f"File already exists, skipping download ('{dest}')"
+                    )
+                os.remove(dest)
+            os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+            Logger.debug(f"Downloading {source} -> {dest} ({size} bytes)")
+            self.get_client().download_file(
+                *self.parse_s3_link(source),
+                dest,
+                Config=self.get_transfer_config(size),
+                Callback=callback,
+            )
+
+        self.run_transfers(download, transfers, report_progress)
+
+    def cp_to(
+        self,
+        source,
+        dest,
+        force=False,
+        report_progress: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Upload a file, or every file in a directory (to the same structure under dest)
+        """
+        source = LocalFileScheme.prepare_path(source)
+        if os.path.isdir(source):
+            transfers = []
+            for root, _, files in os.walk(source):
+                for f in files:
+                    path = os.path.join(root, f)
+                    relpath = os.path.relpath(path, source).replace(os.sep, "/")
+                    transfers.append(
+                        (path, f"{dest.rstrip('/')}/{relpath}", os.path.getsize(path))
+                    )
+        else:
+            transfers = [(source, dest, os.path.getsize(source))]
+
+        def upload(source, dest, size, callback):
+            if not force and self.head(dest) is not None:
+                return Logger.info(f"Object already exists, skipping upload ('{dest}')")
+            Logger.debug(f"Uploading {source} -> {dest} ({size} bytes)")
+            self.get_client().upload_file(
+                source,
+                *self.parse_s3_link(dest),
+                Config=self.get_transfer_config(size),
+                Callback=callback,
+            )
+
+        self.run_transfers(upload, transfers, report_progress)
+
+    def rm_dir(self, directory):
+        bucket, key = self.parse_s3_link(directory)
+        prefix = key.rstrip("/") + "/" if key else ""
+        Logger.info(f"Removing S3 objects under 's3://{bucket}/{prefix}'")
+        objects, _ = self.list_objects(bucket, prefix)
+        client = self.get_client()
+        for i in range(0, len(objects), self.DELETE_BATCH_SIZE):
+            batch = objects[i : i + self.DELETE_BATCH_SIZE]
+            client.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": o["Key"]} for o in batch], "Quiet": True},
+            )
+
+    def mkdirs(self, directory):
+        # S3 doesn't have directories
+        return None
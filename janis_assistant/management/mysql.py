@@ -1,21 +1,34 @@
 # Data directory: :/var/lib/mysql
 # Port forward: 3306
-from time import sleep
+import json
+import os
+import re
+import socket
+from contextlib import contextmanager
+from time import sleep, time
+from typing import Dict, Type, Optional, List
 
 from janis_core import Logger
 
 from janis_assistant.containers.base import Container
-from typing import Dict, Type
-
 from janis_assistant.containers.docker import Docker
 from janis_assistant.containers.singularity import Singularity
 from janis_assistant.management.configuration import JanisConfiguration
 from janis_assistant.templates.base import SingularityEnvironmentTemplate
+from janis_assistant.utils import find_free_port
+from janis_assistant.utils.dateutils import DateUtil
 
 
 class MySql(object):
 
     MYSQL_CONTAINERNAME = "mariadb:10.2.27"
+    DATABASE_NAME = "cromwell"
+
+    # Waiting for MySQL to accept connections, we check quickly at first (reusing
+    # an existing data directory only takes a couple of seconds), then back off.
+    READINESS_INITIAL_INTERVAL = 0.25
+    READINESS_MAX_INTERVAL = 5
+    READINESS_TIMEOUT = 300
 
     def __init__(
         self,
@@ -25,9 +38,8 @@ class MySql(object):
         forwardedport: int,
         confdir: str,
         containerdir: str,  # for singularity containers
+        instancename: Optional[str] = None,
     ):
-        import os.path
-
         Logger.debug(
             f"Preparing {container.__name__} MySQL container with info: wid={wid}, port={forwardedport}, confdir={confdir}"
         )
@@ -36,18 +48,20 @@ class MySql(object):
 
         self.container: Container = container(
             self.MYSQL_CONTAINERNAME,
-            instancename="mariadb-" + wid,
+            instancename=instancename or "mariadb-" + wid,
             containerdir=containerdir,
         )
         self.datadirectory = datadirectory
         self.forwardedport = forwardedport
         self.confdir = confdir
+        self.database = self.DATABASE_NAME
         self.startupscriptsdir = os.path.join(self.confdir, "startup")
         self.sqlconfdir = os.path.join(self.confdir, "conf")
         self.mysqldoverride = os.path.join(self.confdir, "mysqld")
 
     def start(self):
         """
+        Start the MySQL container, and wait until it's accepting connections.
         """
 
         self.prepare_mysql_dirs()
@@ -72,36 +86,77 @@ class MySql(object):
         self.container.environment_variables["MYSQL_INITDB_SKIP_TZINFO"] = 1
 
         self.container.start_container()
-        # Have to wait for it to initialise
-        sleep(10)
+        self.wait_until_ready()
+
+    def is_port_open(self) -> bool:
+        try:
+            with socket.create_connection(("127.0.0.1", self.forwardedport), 1):
+                return True
+        except OSError:
+            return False
+
+    def ping(self) -> bool:
+        """
+        The port can be open before MySQL is ready (eg: docker's proxy, or the
+        temporary server while a new data directory is being initialised doesn't
+        listen on TCP), so we confirm with mysqladmin.
+        """
+        if not self.is_port_open():
+            return False
         cmd = [
             "mysqladmin",
             "ping",
             "-h",
-            f"127.0.0.1",
+            "127.0.0.1",
+            "-P",
+            str(self.forwardedport),
+            "-u",
+            "root",
+        ]
+        (response, rc) = self.container.exec_command(cmd)
+        return rc == 0 and response == "mysqld is alive"
+
+    def wait_until_ready(self, timeout: Optional[float] = None):
+        timeout = timeout or self.READINESS_TIMEOUT
+        start = time()
+        interval = self.READINESS_INITIAL_INTERVAL
+        while not self.ping():
+            elapsed = time() - start
+            if elapsed > timeout:
+                raise Exception(
+                    f"MySQL didn't accept connections on port {self.forwardedport} within {timeout} seconds"
+                )
+            Logger.debug(
+                f"MySQL isn't ready yet ({round(elapsed)}s), checking again in {interval}s"
+            )
+            sleep(interval)
+            interval = min(interval * 2, self.READINESS_MAX_INTERVAL)
+
+        Logger.info(f"MySQL is ready after {round(time() - start, 1)} seconds")
+
+    def execute_sql(self, sql: str):
+        cmd = [
+            "mysql",
+            "-h",
+            "127.0.0.1",
             "-P",
             str(self.forwardedport),
             "-u",
             "root",
-            "--wait=60",
+            "-e",
+            sql,
         ]
-        while True:
-            (response, rc) = self.container.exec_command(cmd)
-            if response == "mysqld is alive":
-                return
-            if response:
-                Logger.critical("MySQL error: " + str(response))
-                raise Exception(response)
-            else:
-                Logger.critical(rc)
+        (response, rc) = self.container.exec_command(cmd)
+        if rc != 0:
+            raise Exception(f"Couldn't execute '{sql}' in MySQL: {response}")
+        return response
 
     def stop(self):
         Logger.debug("Received STOP request for mySQL container")
         self.container.stop_container()
 
     def prepare_mysql_dirs(self):
-        import os
-
+        os.makedirs(self.datadirectory, exist_ok=True)
         os.makedirs(self.startupscriptsdir, exist_ok=True)
         os.makedirs(self.mysqldoverride, exist_ok=True)
         os.makedirs(self.sqlconfdir, exist_ok=True)
@@ -121,3 +176,215 @@ CREATE DATABASE IF NOT EXISTS cromwell;
 [mysqld]
 port={PORT}
 """
+
+
+class SharedMySql(object):
+    """
+    A MySQL instance shared between every submission of this user on this host,
+    where each submission has its own database (schema).
+
+    The first submission starts the instance, and every submission holds a lease
+    (a file named by the submission ID) while it's using it. The instance is stopped
+    when the last lease is released, but the data directory is kept, so the next
+    start doesn't have to initialise MySQL again.
+
+    A submission's database is dropped when it's stopped with drop_database=True
+    (ie: the submission has finished), but kept when it's suspended so it can be
+    resumed. Databases of submissions that were killed can be removed with
+    'DROP DATABASE cromwell_<wid>'.
+
+        <basedirectory>/<hostname>/
+            instance.json       - port and container of the running instance
+            leases/<wid>        - a lease for each submission using the instance
+            data/, conf/        - mounted into the MySQL container
+    """
+
+    INSTANCE_FILENAME = "instance.json"
+    LOCK_FILENAME = "lock"
+    LEASES_DIRNAME = "leases"
+
+    def __init__(
+        self,
+        wid: str,
+        container: Type[Container],
+        basedirectory: str,
+        containerdir: str,  # for singularity containers
+        username: Optional[str] = None,
+    ):
+        self.wid = wid
+        self._containertype = container
+        self.containerdir = containerdir
+        self.directory = os.path.join(basedirectory, socket.gethostname())
+        self.username = username or SharedMySql.get_username()
+
+        self.database = "cromwell_" + re.sub("[^A-Za-z0-9_]", "_", wid)
+        self.forwardedport: Optional[int] = None
+        self._mysql: Optional[MySql] = None
+
+    @staticmethod
+    def get_username():
+        try:
+            from janis_assistant.utils.getuser import lookup_username
+
+            return re.sub("[^A-Za-z0-9_.-]", "_", lookup_username())
+        except Exception as e:
+            Logger.debug(f"Couldn't get username for shared MySQL instance: {e}")
+            return "janis"
+
+    def get_mysql(self, port: int, dockerid: Optional[str] = None) -> MySql:
+        mysql = MySql(
+            wid=self.wid,
+            container=self._containertype,
+            datadirectory=os.path.join(self.directory, "data"),
+            forwardedport=port,
+            confdir=os.path.join(self.directory, "conf"),
+            containerdir=self.containerdir,
+            instancename=f"mariadb-janis-{self.username}",
+        )
+        if dockerid and isinstance(mysql.container, Docker):
+            mysql.container.dockerid = dockerid
+        return mysql
+
+    @contextmanager
+    def lock(self):
+        import fcntl
+
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, self.LOCK_FILENAME), "a+") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def read_instance(self) -> Optional[Dict]:
+        path = os.path.join(self.directory, self.INSTANCE_FILENAME)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except Exception as e:
+            Logger.warn(f"Couldn't read shared MySQL instance from {path}: {e}")
+            return None
+
+    def write_instance(self, mysql: MySql):
+        instance = {
+            "port": mysql.forwardedport,
+            "container": mysql.container.__class__.__name__,
+            "dockerid": getattr(mysql.container, "dockerid", None),
+            "started": str(DateUtil.now()),
+        }
+        with open(os.path.join(self.directory, self.INSTANCE_FILENAME), "w+") as f:
+            json.dump(instance, f)
+
+    def remove_instance(self):
+        path = os.path.join(self.directory, self.INSTANCE_FILENAME)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def get_leases_dir(self):
+        return os.path.join(self.directory, self.LEASES_DIRNAME)
+
+    def write_lease(self):
+        os.makedirs(self.get_leases_dir(), exist_ok=True)
+        with open(os.path.join(self.get_leases_dir(), self.wid), "w+") as f:
+            json.dump({"pid": os.getpid(), "timestamp": str(DateUtil.now())}, f)
+
+    def remove_lease(self):
+        path = os.path.join(self.get_leases_dir(), self.wid)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def get_active_leases(self) -> List[str]:
+        """
+        The leases of submissions that are still running, and remove the leases of
+        janis processes that have died (the instance is per host, so we can check).
+        """
+        leasesdir = self.get_leases_dir()
+        if not os.path.exists(leasesdir):
+            return []
+
+        active = []
+        for wid in os.listdir(leasesdir):
+            path = os.path.join(leasesdir, wid)
+            try:
+                with open(path) as f:
+                    pid = json.load(f)["pid"]
+                os.kill(pid, 0)
+                active.append(wid)
+            except ProcessLookupError:
+                Logger.info(f"Removing stale shared MySQL lease for '{wid}'")
+                os.remove(path)
+            except PermissionError:
+                # the process exists, but isn't ours
+                active.append(wid)
+            except Exception as e:
+                Logger.debug(f"Couldn't check shared MySQL lease '{path}': {e}")
+                active.append(wid)
+
+        return active
+
+    def start(self):
+        with self.lock():
+            mysql = None
+            instance = self.read_instance()
+            if instance:
+                mysql = self.get_mysql(instance["port"], instance.get("dockerid"))
+                if mysql.ping():
+                    Logger.info(
+                        f"Reusing shared MySQL instance on port {mysql.forwardedport}"
+                    )
+                else:
+                    Logger.info(
+                        "The shared MySQL instance isn't responding, starting a new one"
+                    )
+                    try:
+                        mysql.stop()
+                    except Exception as e:
+                        Logger.debug(f"Couldn't stop old shared MySQL instance: {e}")
+                    self.remove_instance()
+                    mysql = None
+
+            if mysql is None:
+                mysql = self.get_mysql(find_free_port())
+                # a container from an instance we lost track of would clash on name
+                mysql.container.remove_instance_if_exists()
+                mysql.start()
+                self.write_instance(mysql)
+
+            self.write_lease()
+
+        self._mysql = mysql
+        self.forwardedport = mysql.forwardedport
+        mysql.execute_sql(f"CREATE DATABASE IF NOT EXISTS {self.database};")
+
+    def drop_database(self):
+        if self._mysql is None:
+            return
+        try:
+            self._mysql.execute_sql(f"DROP DATABASE IF EXISTS {self.database};")
+        except Exception as e:
+            Logger.warn(f"Couldn't drop the database '{self.database}': {e}")
+
+    def stop(self, drop_database=False):
+        with self.lock():
+            if drop_database:
+                self.drop_database()
+            self.remove_lease()
+            leases = self.get_active_leases()
+            if leases:
+                return Logger.info(
+                    f"Leaving shared MySQL instance running for {len(leases)} other submission(s)"
+                )
+
+            mysql = self._mysql
+            if mysql is None:
+                instance = self.read_instance()
+                if not instance:
+                    return
+                mysql = self.get_mysql(instance["port"], instance.get("dockerid"))
+
+            Logger.info("Stopping shared MySQL instance as no submissions are using it")
+            mysql.stop()
+            self.remove_instance()
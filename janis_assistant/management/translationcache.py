@@ -0,0 +1,340 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import re
+import shutil
+from enum import Enum
+from types import FunctionType, MethodType, ModuleType
+from typing import Dict, Optional
+from uuid import uuid4
+
+from janis_core import Logger
+
+from janis_assistant.__meta__ import __version__ as janis_assistant_version
+
+# Bump this if the layout of a cache entry changes
+TRANSLATION_CACHE_VERSION = 1
+
+
+class UnfingerprintableError(Exception):
+    """
+    A value that can't be fingerprinted from its contents, so rather than risk two
+    different tools sharing a fingerprint, the translation isn't cached.
+    """
+
+    pass
+
+
+class ToolFingerprint:
+    """
+    A stable hash of a tool (or workflow) definition, without translating it.
+
+    We walk the attributes of the tool (steps, connections, inputs, etc), and as
+    a CommandTool is mostly defined by its methods (base_command(), inputs(), ...),
+    we also hash the source of the modules that every class we see is defined in,
+    so editing a tool without bumping its version still changes the fingerprint.
+    Functions are also hashed by their defaults and closures (and partials by
+    their function and arguments). Objects we've already seen (the graph has
+    cycles) are referenced by the order they were first seen in.
+    """
+
+    _memory_address = re.compile(r" at 0x[0-9a-fA-F]+")
+
+    # {module path: (mtime, size, digest)}, shared as these are expensive to compute
+    _source_digests: Dict[str, tuple] = {}
+
+    def __init__(self):
+        self.hasher = hashlib.sha256()
+        self._seen: Dict[int, int] = {}
+        # hold onto what we've seen, so their ids aren't reused while we're hashing
+        self._keepalive = []
+
+    @staticmethod
+    def of(value) -> str:
+        fp = ToolFingerprint()
+        fp.update(value)
+        return fp.hexdigest()
+
+    def hexdigest(self) -> str:
+        return self.hasher.hexdigest()
+
+    def _write(self, *parts):
+        for part in parts:
+            self.hasher.update(str(part).encode())
+            self.hasher.update(b"\x00")
+
+    def update(self, value):
+        # iteratively, as recursing through a large workflow graph can exceed
+        # python's recursion limit
+        stack = [value]
+        while stack:
+            self._visit(stack.pop(), stack)
+
+    def _visit(self, value, stack: list):
+        if value is None or isinstance(value, (bool, int, float, str, bytes)):
+            return self._write(type(value).__name__, repr(value))
+        if isinstance(value, Enum):
+            return self._write("enum", self.qualified_name(type(value)), value.name)
+        if isinstance(value, type):
+            return self._write("class", *self.describe_class(value))
+        if isinstance(value, (FunctionType, MethodType)):
+            func = getattr(value, "__func__", value)
+            self._write(
+                "function",
+                self.qualified_name(func),
+                self.source_digest(inspect.getmodule(func)),
+            )
+            cells = []
+            for cell in func.__closure__ or []:
+                try:
+                    cells.append(cell.cell_contents)
+                except ValueError:
+                    # a closure variable that hasn't been assigned yet
+                    cells.append(("empty cell",))
+            return stack.extend(
+                [
+                    getattr(value, "__self__", None),
+                    func.__defaults__,
+                    func.__kwdefaults__,
+                    cells,
+                ]
+            )
+        if isinstance(value, ModuleType):
+            return self._write("module", value.__name__)
+
+        if id(value) in self._seen:
+            return self._write("seen", self._seen[id(value)])
+        self._seen[id(value)] = len(self._seen)
+        self._keepalive.append(value)
+
+        if isinstance(value, functools.partial):
+            self._write("partial")
+            stack.extend([value.keywords, value.args, value.func])
+        elif isinstance(value, (list, tuple)):
+            self._write(type(value).__name__, len(value))
+            stack.extend(reversed(value))
+        elif isinstance(value, (set, frozenset)):
+            # the order of a set changes between processes (hash randomisation)
+            self._write("set", *sorted(ToolFingerprint.of(v) for v in value))
+        elif isinstance(value, dict):
+            self._write("dict", len(value))
+            for k, v in reversed(list(value.items())):
+                stack.extend((v, k))
+        else:
+            self._write("object", *self.describe_class(type(value)))
+            attributes = getattr(value, "__dict__", None)
+            if attributes is None:
+                # eg: a C extension type, where the repr is all we can go on
+                description = repr(value)
+                if self._memory_address.search(description):
+                    # the default repr, which would be the same for any value
+                    raise UnfingerprintableError(f"Couldn't fingerprint {description}")
+                self._write(description)
+            else:
+                for k in reversed(sorted(attributes)):
+                    stack.extend((attributes[k], k))
+
+    @staticmethod
+    def qualified_name(obj) -> str:
+        return f"{getattr(obj, '__module__', None)}.{getattr(obj, '__qualname__', obj)}"
+
+    @staticmethod
+    def describe_class(cls: type):
+        return [
+            (ToolFingerprint.qualified_name(c), ToolFingerprint.source_digest(c))
+            for c in cls.__mro__
+            if c is not object
+        ]
+
+    @classmethod
+    def source_digest(cls, obj) -> Optional[str]:
+        try:
+            path = inspect.getsourcefile(obj)
+        except TypeError:
+            # builtins
+            return None
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        cached = cls._source_digests.get(path)
+        if cached and cached[:2] == (stat.st_mtime, stat.st_size):
+            return cached[2]
+
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        cls._source_digests[path] = (stat.st_mtime, stat.st_size, digest)
+        return digest
+
+
+class TranslationCache:
+    """
+    An on-disk cache of translated workflows, so submitting the same workflow
+    (eg: for thousands of samples) doesn't translate it again every time.
+
+    Entries are keyed on the tool definition (see ToolFingerprint), the translator,
+    the options that change the translation (hints, resource limits, container
+    overrides, etc) and the janis versions. The inputs file is specific to each
+    submission, so it isn't cached, we just build it again.
+
+        <cache_location>/<key>/
+            <workflow file>, tools/, tools.zip, <resources file>
+    """
+
+    def __init__(self, cache_location: str):
+        self.cache_location = cache_location
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, translator, tool, **translate_kwargs) -> str:
+        try:
+            from janis_core.__meta__ import __version__ as janis_core_version
+        except ImportError:
+            janis_core_version = None
+
+        options = json.dumps(translate_kwargs, sort_keys=True, default=str)
+        return ToolFingerprint.of(
+            [
+                TRANSLATION_CACHE_VERSION,
+                janis_core_version,
+                janis_assistant_version,
+                translator.name,
+                tool.versioned_id(),
+                tool,
+                options,
+            ]
+        )
+
+    @staticmethod
+    def get_cached_filenames(translator, tool):
+        return [
+            translator.workflow_filename(tool),
+            translator.resources_filename(tool),
+            "tools",
+            "tools.zip",
+        ]
+
+    def translate(
+        self,
+        translator,
+        tool,
+        export_path: str,
+        write_inputs_file=True,
+        additional_inputs: dict = None,
+        **translate_kwargs,
+    ):
+        """
+        Export the translation of tool to export_path, like translator.translate(...,
+        to_disk=True), using the cached translation if there is one.
+        """
+        translate = functools.partial(
+            translator.translate,
+            tool,
+            to_console=False,
+            to_disk=True,
+            write_inputs_file=write_inputs_file,
+            export_path=export_path,
+            additional_inputs=additional_inputs,
+            **translate_kwargs,
+        )
+        try:
+            key = self.get_key(translator, tool, **translate_kwargs)
+        except UnfingerprintableError as e:
+            # rather than risk reusing the translation of a different tool
+            Logger.debug(f"Not caching the translation of '{tool.id()}': {e}")
+            return translate()
+        entry = os.path.join(self.cache_location, key)
+
+        if os.path.isdir(entry):
+            self.hits += 1
+            Logger.debug(
+                f"Translation cache hit for '{tool.id()}' ({key[:12]}), "
+                f"{self.hits} hit(s) and {self.misses} miss(es) so far"
+            )
+            self.copy_entry(entry, export_path)
+            if write_inputs_file:
+                self.write_inputs_file(
+                    translator,
+                    tool,
+                    export_path,
+                    additional_inputs=additional_inputs,
+                    **translate_kwargs,
+                )
+            # so old entries can be cleaned up by when they were last used
+            os.utime(entry)
+            return
+
+        self.misses += 1
+        Logger.debug(
+            f"Translation cache miss for '{tool.id()}' ({key[:12]}), "
+            f"{self.hits} hit(s) and {self.misses} miss(es) so far"
+        )
+        translate()
+        try:
+            filenames = self.get_cached_filenames(translator, tool)
+            self.store_entry(entry, export_path, filenames)
+        except Exception as e:
+            Logger.debug(f"Couldn't store translation of '{tool.id()}' in cache: {e}")
+
+    def write_inputs_file(
+        self,
+        translator,
+        tool,
+        export_path: str,
+        additional_inputs: Optional[dict],
+        hints=None,
+        merge_resources=False,
+        max_cores=None,
+        max_mem=None,
+        max_duration=None,
+        **kwargs,
+    ):
+        # the same as translator.translate builds the inputs
+        inputs = translator.build_inputs_file(
+            tool,
+            recursive=False,
+            merge_resources=merge_resources,
+            hints=hints,
+            additional_inputs=additional_inputs,
+            max_cores=max_cores,
+            max_mem=max_mem,
+            max_duration=max_duration,
+        )
+        path = os.path.join(export_path, translator.inputs_filename(tool))
+        with open(path, "w+") as f:
+            f.write(translator.stringify_translated_inputs(inputs))
+
+    @staticmethod
+    def copy_entry(entry: str, export_path: str):
+        os.makedirs(export_path, exist_ok=True)
+        for fn in os.listdir(entry):
+            src, dest = os.path.join(entry, fn), os.path.join(export_path, fn)
+            if os.path.isdir(src):
+                shutil.copytree(src, dest, dirs_exist_ok=True)
+            else:
+                shutil.copy2(src, dest)
+
+    def store_entry(self, entry: str, export_path: str, filenames):
+        # write to a temporary directory then rename it, so other janis processes
+        # never see a partially written entry
+        os.makedirs(self.cache_location, exist_ok=True)
+        tmp = os.path.join(self.cache_location, f".tmp-{uuid4().hex}")
+        os.makedirs(tmp)
+        try:
+            for fn in filenames:
+                src = os.path.join(export_path, fn)
+                if os.path.isdir(src):
+                    shutil.copytree(src, os.path.join(tmp, fn))
+                elif os.path.exists(src):
+                    shutil.copy2(src, os.path.join(tmp, fn))
+            os.rename(tmp, entry)
+        except OSError:
+            # most likely another process stored the same translation first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isdir(entry):
+                raise
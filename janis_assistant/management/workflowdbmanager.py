@@ -2,7 +2,7 @@ import sqlite3
 from contextlib import contextmanager
 from os.path import join as ospathjoin
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from janis_assistant.data.providers.rundbprovider import (
     RunDbProvider,
@@ -13,6 +13,7 @@ from janis_assistant.data.enums import TaskStatus
 from janis_assistant.data.models.run import SubmissionModel, RunModel
 from janis_assistant.data.models.workflowjob import RunJobModel
 from janis_assistant.data.providers.inputsdbprovider import InputDbProvider
+from janis_assistant.data.providers.janisdbprovider import TaskRow
 from janis_assistant.data.providers.jobdbprovider import JobDbProvider, groupby
 from janis_assistant.data.providers.outputdbprovider import OutputDbProvider
 from janis_assistant.data.providers.internalprogressdb import InternalProgressDb
@@ -20,11 +21,39 @@ from janis_assistant.data.providers.joblabeldbprovider import JobLabelDbProvider
 from janis_assistant.data.providers.submissiondbprovider import SubmissionDbProvider
 from janis_assistant.data.providers.workflowmetadataprovider import (
     SubmissionMetadataDbProvider,
+    SubmissionDbMetadata,
 )
 from janis_assistant.utils.dateutils import DateUtil
 from janis_core.utils.logger import Logger
 
 
+class TaskDbConnection(sqlite3.Connection):
+    """
+    A connection to task.db, where commits can be deferred (see
+    WorkflowDbManager.batch_writes) so a batch of updates is one transaction.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_depth = 0
+        self.closed = False
+
+    def commit(self, force=False):
+        """
+        :param force: Commit now, even in a batch (eg: before another process reads it)
+        """
+        if self.batch_depth > 0 and not force:
+            return
+        super().commit()
+
+    def close(self):
+        # eg: suspending from a callback in a batch, don't lose what it's written
+        if self.batch_depth > 0 and self.in_transaction:
+            super().commit()
+        self.closed = True
+        super().close()
+
+
 class WorkflowDbManager:
     """
     v0.6.0 refactor.
@@ -55,8 +84,21 @@ class WorkflowDbManager:
 
 
     Every object here should have a class equivalent that the rest of the program interacts with.
+
+
+    Update 2026-10-18:
+
+        task.db is written by the monitor (only ever from its main thread) while
+        'janis watch' reads it from other processes, so it's in WAL mode: readers
+        see the last committed state without blocking (or being blocked by) the
+        writer. The callbacks the monitor processes together are written in one
+        transaction (batch_writes), and a reader can take a consistent snapshot of
+        several tables (read_snapshot).
     """
 
+    BUSY_TIMEOUT_MS = 10000
+    CACHE_SIZE_KB = 16384
+
     def __init__(self, submission_id: str, path: str, readonly=False):
         self.exec_path = path
         self.readonly = readonly
@@ -90,6 +132,23 @@ class WorkflowDbManager:
     def get_uncached_status(self):
         return self.submission_metadata.get_uncached_status()
 
+    def get_uncached_version(self):
+        version = self.submission_metadata.get_uncached_version()
+        children = self.submission_metadata.get_uncached_batch_children()
+        if not children:
+            return version
+
+        # a split batch run changes whenever one of its child submissions does
+        child_versions = []
+        for sid, path in children.items():
+            try:
+                with WorkflowDbManager.open_submission_metadata(path, sid) as db:
+                    child_versions.append(db.get_uncached_version())
+            except Exception as e:
+                Logger.debug(f"Couldn't get version of batch submission '{sid}': {e}")
+                child_versions.append(None)
+        return (*version, tuple(child_versions))
+
     @contextmanager
     def with_cursor(self):
         cursor = None
@@ -109,7 +168,7 @@ class WorkflowDbManager:
 
         Logger.debug("Opening database connection to get wid from: " + sqlpath)
         try:
-            connection = sqlite3.connect(f"file:{sqlpath}?mode=ro", uri=True)
+            connection = WorkflowDbManager.connect(sqlpath, readonly=True)
         except:
             Logger.critical("Error when opening DB connection to: " + sqlpath)
             raise
@@ -128,11 +187,31 @@ class WorkflowDbManager:
             connection.close()
         return retval
 
+    @staticmethod
+    @contextmanager
+    def open_submission_metadata(execpath, wid):
+        """
+        Open the (readonly) metadata of a submission without decoding it, for the
+        uncached getters, eg: to check on the child submissions of a batch run.
+        """
+        sqlpath = WorkflowDbManager.get_sql_path_base(execpath)
+        connection = WorkflowDbManager.connect(sqlpath, readonly=True)
+        try:
+            yield SubmissionMetadataDbProvider(
+                db=connection,
+                readonly=True,
+                submission_id=wid,
+                run_id=RunModel.DEFAULT_ID,
+                metadata=SubmissionDbMetadata(),
+            )
+        finally:
+            connection.close()
+
     @staticmethod
     def get_latest_submission_id(path) -> str:
         try:
-            connection = sqlite3.connect(
-                f"file:{WorkflowDbManager.get_sql_path_base(path)}?mode=ro", uri=True
+            connection = WorkflowDbManager.connect(
+                WorkflowDbManager.get_sql_path_base(path), readonly=True
             )
             submissiondb = SubmissionDbProvider(db=connection, readonly=True)
             return submissiondb.get_latest()
@@ -148,31 +227,88 @@ class WorkflowDbManager:
     def get_sql_path(self):
         return self.get_sql_path_base(self.exec_path)
 
+    @staticmethod
+    def connect(path: str, readonly=False) -> TaskDbConnection:
+        timeout = WorkflowDbManager.BUSY_TIMEOUT_MS / 1000
+        if readonly:
+            connection = sqlite3.connect(
+                f"file:{path}?mode=ro",
+                uri=True,
+                timeout=timeout,
+                factory=TaskDbConnection,
+            )
+        else:
+            connection = sqlite3.connect(
+                path, timeout=timeout, factory=TaskDbConnection
+            )
+            # WAL is persistent, so this also applies to the readers
+            connection.execute("PRAGMA journal_mode=WAL")
+            # in WAL mode, NORMAL is still safe from corruption (a power loss may
+            # only lose the last transactions)
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+        connection.execute(f"PRAGMA busy_timeout={WorkflowDbManager.BUSY_TIMEOUT_MS}")
+        connection.execute(f"PRAGMA cache_size=-{WorkflowDbManager.CACHE_SIZE_KB}")
+        return connection
+
     def db_connection(self):
         path = self.get_sql_path()
         try:
             if self.readonly:
                 Logger.debug("Opening database connection to in READONLY mode: " + path)
-                return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
-
-            Logger.debug("Opening database connection: " + path)
-            return sqlite3.connect(path)
+            else:
+                Logger.debug("Opening database connection: " + path)
+            return self.connect(path, readonly=self.readonly)
         except:
             Logger.critical("Error when opening DB connection to: " + path)
             raise
 
+    @contextmanager
+    def batch_writes(self):
+        """
+        Defer commits until the end of the block, so everything written in it is
+        one transaction (and readers never see half of it).
+        """
+        # the connection might be closed in the batch (eg: by suspend_workflow)
+        connection = self.connection
+        connection.batch_depth += 1
+        try:
+            yield
+        finally:
+            connection.batch_depth -= 1
+            if connection.batch_depth == 0 and not connection.closed:
+                connection.commit()
+
+    @contextmanager
+    def read_snapshot(self):
+        """
+        Read several tables from the same (committed) state of a readonly database,
+        eg: so the jobs and runs of get_metadata are from the same update.
+        """
+        if not self.readonly or self.connection.in_transaction:
+            yield
+            return
+
+        self.connection.execute("BEGIN")
+        try:
+            yield
+        finally:
+            self.connection.rollback()
+
     def save_metadata(self, metadata: RunModel):
 
         # mfranklin: DO NOT UPDATE THE STATUS HERE!
 
         # Let's just say the actual workflow metadata has to updated separately
-        self.runs.insert_or_update_many([metadata])
+        changed = self.runs.insert_or_update_many([metadata])
         alljobs = self.flatten_jobs(metadata.jobs or [])
         try:
-            self.jobsDB.insert_or_update_many(alljobs)
+            changed = self.jobsDB.insert_or_update_many(alljobs) or changed
 
-            self.submission_metadata.metadata.last_updated = DateUtil.now()
-            self.submission_metadata.save_changes()
+            # 'janis watch' reloads everything when last_updated changes
+            if changed:
+                self.submission_metadata.metadata.last_updated = DateUtil.now()
+                self.submission_metadata.save_changes()
 
         except Exception as e:
             Logger.warn(f"Error persisting metadata: {repr(e)}")
@@ -186,7 +322,39 @@ class WorkflowDbManager:
 
         return self.commit()
 
+    def get_task_summary(self) -> TaskRow:
+        """
+        Summarise this submission for the central janis database (see TaskRow),
+        this is much cheaper than get_metadata as we don't load any jobs.
+        """
+        submission = self.submissions.get_by_id(self.submission_id)
+        meta = self.submission_metadata.metadata
+        events = self.runevents.get() or []
+
+        start = min((e.date for e in events), default=None)
+        finish = None
+        if meta.status and meta.status.is_in_final_state():
+            finish = max(
+                (e.date for e in events if e.status.is_in_final_state()), default=None
+            )
+
+        return TaskRow(
+            submission_id=self.submission_id,
+            output_dir=submission.output_dir if submission else None,
+            execution_dir=self.exec_path,
+            timestamp=submission.timestamp if submission else None,
+            status=meta.status,
+            name=meta.name,
+            start=start,
+            finish=finish,
+            labels=submission.labels if submission else None,
+        )
+
     def get_metadata(self) -> Optional[SubmissionModel]:
+        with self.read_snapshot():
+            return self._get_metadata()
+
+    def _get_metadata(self) -> Optional[SubmissionModel]:
         submission = self.submissions.get_by_id(self.submission_id)
         if submission is None:
             Logger.debug("Something happened when getting 'submission' for metadata")
@@ -204,6 +372,17 @@ class WorkflowDbManager:
         if error:
             submission.error = error
 
+        # children are added while the batch is being submitted, so don't use the
+        # (possibly stale) metadata
+        batch_children = self.submission_metadata.get_uncached_batch_children()
+        if batch_children:
+            # a split batch run, where each run is a child submission, and the status
+            # is updated by the children (from other processes)
+            self.submission_metadata.update()
+            submission.status = self.submission_metadata.metadata.status or status
+            submission.runs = self.get_batch_runs(batch_children)
+            return submission
+
         jobs = self.jobsDB.get_all_mapped()
         if jobs is None:
             Logger.log(
@@ -275,6 +454,40 @@ class WorkflowDbManager:
         #     inputs=inputs,
         # )
 
+    def get_batch_runs(self, batch_children: Dict[str, str]) -> List[RunModel]:
+        runs = []
+        nchildren = len(batch_children)
+        for idx, (sid, path) in enumerate(batch_children.items()):
+            name = f"{sid} (batch {idx + 1} of {nchildren})"
+            model = None
+            try:
+                child = WorkflowDbManager(sid, path, readonly=True)
+                try:
+                    model = child.get_metadata()
+                finally:
+                    child.close()
+            except Exception as e:
+                Logger.debug(f"Couldn't get metadata of batch submission '{sid}': {e}")
+
+            if model is not None and model.runs:
+                run = model.runs[0]
+                run.error = run.error or model.error
+            else:
+                # the child hasn't started yet (or its database isn't there)
+                run = RunModel(
+                    id_=sid,
+                    submission_id=sid,
+                    engine_id=None,
+                    status=None,
+                    execution_dir=path,
+                    name=name,
+                )
+            run.id_ = sid
+            run.name = name
+            run.status = (model and model.status) or run.status or TaskStatus.PROCESSING
+            runs.append(run)
+        return runs
+
     @staticmethod
     def flatten_jobs(jobs: List[RunJobModel]):
         flattened = []
@@ -284,9 +497,9 @@ class WorkflowDbManager:
                 flattened.extend(WorkflowDbManager.flatten_jobs(j.jobs))
         return flattened
 
-    def commit(self):
+    def commit(self, force=False):
         if self.connection:
-            self.connection.commit()
+            self.connection.commit(force=force)
         else:
             Logger.critical("Couldn't commit to DB connection")
 
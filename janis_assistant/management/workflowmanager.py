@@ -13,21 +13,24 @@ Run / monitor separation:
 
 """
 
+import functools
 import os
 import queue
+import sqlite3
 import sys
 import time
 from datetime import datetime
 from io import StringIO
 from shutil import rmtree
 from enum import Enum
-from subprocess import call
 from typing import Optional, List, Dict, Union, Any, Tuple
 
 from janis_assistant.modifiers.cwlinputobjectunwrappermodifier import (
     CwlInputObjectUnwrapperModifier,
 )
 from janis_assistant.utils.callprogram import collect_output_from_command
+from janis_assistant.utils.screen import Screen
+from janis_assistant.utils.semaphorewatcher import SemaphoreWatcher
 from janis_core import (
     Logger,
     File,
@@ -45,9 +48,11 @@ from janis_core.utils.secondary import apply_secondary_file_format_to_filename
 
 from janis_assistant.data.enums import TaskStatus, ProgressKeys
 from janis_assistant.data.models.joblabel import JobLabelModel
+from janis_assistant.data.models.jobrenderer import JobTreeRenderer
 from janis_assistant.data.models.outputs import WorkflowOutputModel
 from janis_assistant.data.models.preparedjob import PreparedJob
 from janis_assistant.data.models.run import SubmissionModel, RunModel
+from janis_assistant.data.providers.janisdbprovider import TasksDbProvider
 from janis_assistant.data.providers.workflowmetadataprovider import SubmissionDbMetadata
 from janis_assistant.engines import (
     get_ideal_specification_for_engine,
@@ -63,9 +68,11 @@ from janis_assistant.management.configuration import (
     JanisDatabaseConfigurationHelper,
     DatabaseTypeToUse,
 )
+from janis_assistant.management.copyplanner import CopyPlan
 from janis_assistant.management.filescheme import FileScheme, LocalFileScheme
-from janis_assistant.management.mysql import MySql
+from janis_assistant.management.mysql import MySql, SharedMySql
 from janis_assistant.management.notificationmanager import NotificationManager
+from janis_assistant.management.translationcache import TranslationCache
 from janis_assistant.management.workflowdbmanager import WorkflowDbManager
 from janis_assistant.modifiers.base import PipelineModifierBase
 from janis_assistant.modifiers.batchmodifier import BatchPipelineModifier
@@ -122,7 +129,7 @@ class WorkflowManager:
         self.database = WorkflowDbManager(
             submission_id, self.get_task_path_safe(), readonly=readonly
         )
-        self.dbcontainer: MySql = None
+        self.dbcontainer: Optional[Union[MySql, SharedMySql]] = None
         self.main_queue = queue.Queue()
 
         self._prev_status = None
@@ -236,6 +243,12 @@ class WorkflowManager:
             skip_digest_lookup=prepared_submission.skip_digest_lookup,
             skip_digest_cache=prepared_submission.skip_digest_cache,
             cache_location=prepared_submission.digest_cache_location,
+            cache_ttls=prepared_submission.digest_cache_ttls,
+            translation_cache_location=(
+                None
+                if prepared_submission.skip_translation_cache
+                else prepared_submission.translation_cache_location
+            ),
         )
 
         outdir_workflow = tm.get_path_for_component(
@@ -283,6 +296,67 @@ class WorkflowManager:
 
         return tm
 
+    @staticmethod
+    def create_batch_parent(
+        submission_id: str, tool: Tool, prepared_submission: PreparedJob
+    ):
+        """
+        Create the parent of a split batch run. The parent doesn't run anything,
+        each child submission (see add_batch_child) is a regular submission with its
+        own task.db and engine, that pushes its status up to the parent.
+        """
+        tm = WorkflowManager(
+            submission_id=submission_id,
+            execution_dir=prepared_submission.execution_dir,
+        )
+
+        tm.write_prepared_submission_file(
+            prepared_job=prepared_submission, output_dir=tm.execution_dir,
+        )
+
+        tm.database.submissions.insert_or_update_many(
+            [
+                SubmissionModel(
+                    id_=submission_id,
+                    output_dir=prepared_submission.output_dir,
+                    execution_dir=prepared_submission.execution_dir,
+                    author=lookup_username(),
+                    labels=[],
+                    tags=[],
+                    timestamp=DateUtil.now(),
+                    engine_type="batch",
+                    engine_url=None,
+                )
+            ]
+        )
+
+        tm.database.submission_metadata.set_metadata(
+            SubmissionDbMetadata(
+                submission_id=submission_id,
+                run_id=RunModel.DEFAULT_ID,
+                name=tool.id(),
+                start=DateUtil.now(),
+                keep_execution_dir=prepared_submission.keep_intermediate_files,
+                prepared_job=prepared_submission,
+                status=TaskStatus.PROCESSING,
+                batch_children={},
+            )
+        )
+        tm.database.submission_metadata.save_changes()
+        tm.database.commit()
+
+        return tm
+
+    def add_batch_child(self, submission_id: str, execution_dir: str):
+        meta = self.database.submission_metadata.metadata
+        # reassign (rather than mutate) so the change is saved
+        meta.batch_children = {
+            **(meta.batch_children or {}),
+            submission_id: execution_dir,
+        }
+        self.database.submission_metadata.save_changes()
+        self.database.commit()
+
     def start_or_submit(self, run_in_background, watch=False):
         # check container environment is loaded
         metadb = self.database.submission_metadata.metadata
@@ -482,49 +556,45 @@ class WorkflowManager:
     def poll_stored_metadata_with_clear(self, seconds=3, **kwargs):
         try:
             is_finished = False
+            screen = Screen(
+                full_output_hint=f"janis watch {self.submission_id} --once"
+            )
+            # reused between refreshes, so only the jobs that changed are formatted
+            renderer = JobTreeRenderer(**kwargs)
 
             # We won't clear the screen if we haven't printed (first loop) and it's finished
             has_printed = False
-            last_updated = None
+            last_version = None
             metadata_skips = 0
             while not is_finished:
-                meta, is_finished = self.get_meta_call()
-                if meta:
-
-                    has_updated = (
-                        last_updated is not None
-                        and bool(meta.runs)
-                        and meta.runs[0].last_updated is not None
-                        and meta.runs[0].last_updated > last_updated
-                    )
-                    ignore_has_updated = metadata_skips > 20
-                    is_running = not is_finished
-                    if (
-                        not has_printed
-                        or has_updated
-                        or ignore_has_updated
-                        or is_finished
-                    ):
+                # Loading the metadata reads every job, so we first check the status
+                # and last_updated (a single small query) to see if anything has changed.
+                # We still redraw every so often so the durations keep ticking.
+                version = self.database.get_uncached_version()
+                has_updated = version != last_version
+                ignore_has_updated = metadata_skips > 20
+
+                if not has_printed or has_updated or ignore_has_updated:
+                    meta, is_finished = self.get_meta_call()
+                    if meta:
                         metadata_skips = 0
-                        if meta.runs:
-                            last_updated = meta.runs[0].last_updated
+                        last_version = version
 
                         # only clear the screen if we haven't updated
-                        if has_printed or is_running:
-
-                            try:
-                                call("clear")
-                            except Exception as e:
-                                Logger.log(
-                                    f"We got a subprocess error when clearing the screen: {repr(e)}"
-                                )
-                        print(meta.format(**kwargs))
+                        if has_printed or not is_finished:
+                            # the last frame isn't redrawn, so show all of it
+                            screen.draw(
+                                meta.format(renderer=renderer),
+                                final=is_finished or seconds < 0,
+                            )
+                        else:
+                            print(meta.format(renderer=renderer))
                         has_printed = True
-                    else:
-                        Logger.log(
-                            f"No job status updates were find, we'll wait another {seconds} seconds"
-                        )
-                        metadata_skips += 1
+                else:
+                    Logger.log(
+                        f"No job status updates were find, we'll wait another {seconds} seconds"
+                    )
+                    metadata_skips += 1
 
                 if seconds < 0:
                     is_finished = True
@@ -646,6 +716,14 @@ class WorkflowManager:
                 f"This task has already finished and cannot be resumed, view the task outputs at file://{meta.output_dir}"
             )
 
+        batch_children = self.database.submission_metadata.metadata.batch_children
+        if batch_children:
+            self.refresh_batch_status()
+            return Logger.info(
+                f"'{self.submission_id}' is a split batch run, resume each of its "
+                f"submissions instead: {', '.join(batch_children.values())}"
+            )
+
         try:
             # remove semaphores
             self.remove_semaphores()
@@ -711,44 +789,39 @@ class WorkflowManager:
                 self.save_metadata(meta)
                 return self.process_completed_task()
 
-            last_semaphore_check = None
-            last_health_check = DateUtil.now()
+            # Rather than polling, we'll block until the engine or the semaphore
+            # watcher puts something on the queue (callbacks return True to finish)
+            semaphore_watcher = SemaphoreWatcher(
+                self.get_path_for_component(self.WorkflowManagerPath.semaphore),
+                semaphores=["abort", "pause"],
+                on_semaphore=lambda s: self.main_queue.put(
+                    lambda: self.handle_semaphore(s)
+                ),
+            )
+            semaphore_watcher.start()
 
-            while True:
-                try:
-                    cb = self.main_queue.get(False)
-                    # callback from add_callback() returns True if in TaskStatus.final_states()
-                    res = cb()
-                    if res is True:
-                        break
-                except queue.Empty:
-                    if (
-                        last_semaphore_check is None
-                        or (DateUtil.now() - last_semaphore_check).total_seconds() > 2
-                    ):
-                        Logger.log("Checking semaphores")
-                        last_semaphore_check = DateUtil.now()
-                        if os.path.exists(self.get_abort_semaphore_path()):
-                            self.abort()
-                            break
-                        if os.path.exists(self.get_pause_semaphore_path()):
-                            self.suspend_workflow()
+            try:
+                finished = False
+                while not finished:
+                    callbacks = [self.main_queue.get()]
+                    # everything that's queued up is written in one transaction
+                    while True:
+                        try:
+                            callbacks.append(self.main_queue.get_nowait())
+                        except queue.Empty:
                             break
 
-
-                    # # TODO: make this interval be a config option
-                    # if (
-                    #     DateUtil.now() - last_health_check
-                    # ).total_seconds() > self.HEALTH_CHECK_INTERVAL_SECONDS:
-                    #     self.do_health_check()
-                    #     last_health_check = DateUtil.now()
-
-                    time.sleep(0.5)
-
-                    continue
-                except Exception as e:
-                    Logger.warn(f"Something has gone TERRIBLY wrong: {repr(e)}")
-                    raise e
+                    with self.database.batch_writes():
+                        for cb in callbacks:
+                            # callback from add_callback() returns True if in TaskStatus.final_states()
+                            if cb() is True:
+                                finished = True
+                                break
+            except Exception as e:
+                Logger.warn(f"Something has gone TERRIBLY wrong: {repr(e)}")
+                raise e
+            finally:
+                semaphore_watcher.terminate()
 
             self.process_completed_task()
             return self
@@ -786,10 +859,13 @@ class WorkflowManager:
             )
             sys.exit(rc)
 
-    def stop_engine_and_db(self):
+    def stop_engine_and_db(self, finished=True):
         self.engine.stop_engine()
 
-        if self.dbcontainer:
+        if isinstance(self.dbcontainer, SharedMySql):
+            # the shared instance outlives us, so remove our database once we're done
+            self.dbcontainer.stop(drop_database=finished)
+        elif self.dbcontainer:
             self.dbcontainer.stop()
 
     def do_health_check(self):
@@ -991,8 +1067,10 @@ Kind regards,
                     path=self.get_path_for_component(self.WorkflowManagerPath.database)
                     + "/cromwelldb"
                 )
-            elif dbtype == DatabaseTypeToUse.managed:
-                cromwelldb_config = self.start_mysql_and_prepare_cromwell_config()
+            elif dbtype in (DatabaseTypeToUse.managed, DatabaseTypeToUse.shared):
+                cromwelldb_config = self.start_mysql_and_prepare_cromwell_config(
+                    shared=dbtype == DatabaseTypeToUse.shared
+                )
                 additional_cromwell_params.append(
                     "-Ddatabase.db.url=" + cromwelldb_config.db.url
                 )
@@ -1014,7 +1092,7 @@ Kind regards,
         # Write the new engine details back into the database (for like PID, host and is_started)
         self.database.submission_metadata.metadata.engine = engine
 
-    def start_mysql_and_prepare_cromwell_config(self):
+    def start_mysql_and_prepare_cromwell_config(self, shared=False):
         scriptsdir = self.get_path_for_component(self.WorkflowManagerPath.mysql)
 
         containerdir = self.get_path_for_component(self.WorkflowManagerPath.database)
@@ -1026,21 +1104,31 @@ Kind regards,
         ):
             containerdir = conf.template.template.singularity_container_dir
 
-        self.dbcontainer = MySql(
-            wid=self.submission_id,
-            container=conf._container,
-            datadirectory=self.get_path_for_component(
-                self.WorkflowManagerPath.database
-            ),
-            confdir=scriptsdir,
-            forwardedport=find_free_port(),
-            containerdir=containerdir,
-        )
+        if shared:
+            self.dbcontainer = SharedMySql(
+                wid=self.submission_id,
+                container=conf._container,
+                basedirectory=os.path.join(conf.config_dir, "mysql"),
+                containerdir=containerdir,
+            )
+        else:
+            self.dbcontainer = MySql(
+                wid=self.submission_id,
+                container=conf._container,
+                datadirectory=self.get_path_for_component(
+                    self.WorkflowManagerPath.database
+                ),
+                confdir=scriptsdir,
+                forwardedport=find_free_port(),
+                containerdir=containerdir,
+            )
         self.dbcontainer.start()
 
         port = self.dbcontainer.forwardedport
         return CromwellConfiguration.Database.mysql(
-            username="root", url=f"127.0.0.1:{port}"
+            username="root",
+            url=f"127.0.0.1:{port}",
+            database=self.dbcontainer.database,
         )
 
     @staticmethod
@@ -1049,6 +1137,7 @@ Kind regards,
         container_override: Optional[dict],
         cache_location: str,
         skip_digest_cache=False,
+        cache_ttls: Optional[Dict[str, Optional[int]]] = None,
     ):
         from janis_assistant.data.container import get_digests_from_containers
 
@@ -1068,6 +1157,7 @@ Kind regards,
             containers_to_lookup,
             cache_location=cache_location,
             skip_cache=skip_digest_cache,
+            cache_ttls=cache_ttls,
         )
         Logger.debug(f"Found {len(digest_map)} docker digests.")
         Logger.log("Found the following container-to-tool lookup table:")
@@ -1149,6 +1239,8 @@ janis run \\
         check_files=True,
         skip_digest_lookup=False,
         skip_digest_cache=False,
+        cache_ttls: Optional[Dict[str, Optional[int]]] = None,
+        translation_cache_location: Optional[str] = None,
     ) -> Tool:
         if self.database.progressDB.has(ProgressKeys.saveWorkflow):
             return Logger.info(
@@ -1159,10 +1251,16 @@ janis run \\
 
         outdir_workflow = self.get_path_for_component(self.WorkflowManagerPath.workflow)
 
-        translator.translate(
+        translation_cache = None
+        translate = functools.partial(
+            translator.translate, to_console=False, to_disk=True
+        )
+        if translation_cache_location:
+            translation_cache = TranslationCache(translation_cache_location)
+            translate = functools.partial(translation_cache.translate, translator)
+
+        translate(
             tool,
-            to_console=False,
-            to_disk=True,
             hints=hints,
             # This is just the base tool, we're going to potentially transform the inputs
             # and we only really care about the inputs for the workflow we're going to run.
@@ -1196,12 +1294,11 @@ janis run \\
                 container_override,
                 cache_location=cache_location,
                 skip_digest_cache=skip_digest_cache,
+                cache_ttls=cache_ttls,
             )
 
-        translator.translate(
+        translate(
             tool_to_evaluate,
-            to_console=False,
-            to_disk=True,
             with_resource_overrides=True,
             merge_resources=True,
             hints=hints,
@@ -1214,6 +1311,11 @@ janis run \\
             allow_empty_container=allow_empty_container,
             container_override=container_overrides,
         )
+        if translation_cache:
+            Logger.debug(
+                f"Translation cache ({translation_cache_location}): "
+                f"{translation_cache.hits} hit(s), {translation_cache.misses} miss(es)"
+            )
 
         mapped_inps = TranslatorBase.build_inputs_file(
             tool_to_evaluate, recursive=False, additional_inputs=additional_inputs
@@ -1431,6 +1533,10 @@ janis run \\
 
         eoutkeys = engine_outputs.keys()
 
+        # work out everything we need to copy first, so we can copy them concurrently
+        copy_plan = CopyPlan()
+        updated_paths = []
+
         for out in wf_outputs:
             eout = engine_outputs.get(out.id_)
 
@@ -1446,6 +1552,8 @@ janis run \\
                     f"Engine '{self.engine.id()}' didn't return {out.id_} outputs for Janis to copy, skipping"
                 )
 
+            # the copies planned for this output
+            first_copy = len(copy_plan)
             originalfile, newfilepath = self.copy_output(
                 fs=self.filescheme,
                 output_dir=submission.output_dir,
@@ -1456,6 +1564,7 @@ janis run \\
                 extension=out.extension,
                 engine_output=eout,
                 iscopyable=out.is_copyable,
+                copy_plan=copy_plan,
             )
 
             if isinstance(originalfile, list):
@@ -1464,12 +1573,33 @@ janis run \\
             if isinstance(newfilepath, list):
                 newfilepath = recursively_join(newfilepath, "|")
 
-            self.database.outputsDB.update_paths(
-                run_id=RunModel.DEFAULT_ID,
-                tag=out.id_,
-                original_path=originalfile,
-                new_path=newfilepath,
-                value=None if out.is_copyable else eout.value,
+            updated_paths.append(
+                (
+                    copy_plan.copies[first_copy:],
+                    (
+                        out.id_,
+                        originalfile,
+                        newfilepath,
+                        None if out.is_copyable else eout.value,
+                    ),
+                )
+            )
+
+        failed = copy_plan.execute()
+
+        # only record the new paths of outputs where every copy succeeded
+        self.database.outputsDB.update_many_paths(
+            run_id=RunModel.DEFAULT_ID,
+            paths=[
+                path
+                for copies, path in updated_paths
+                if all(c.error is None for c in copies)
+            ],
+        )
+
+        if failed:
+            return Logger.critical(
+                f"Couldn't copy {len(failed)} of {len(copy_plan)} outputs, see the logs above for more information"
             )
 
         self.database.progressDB.set(ProgressKeys.copiedOutputs)
@@ -1486,6 +1616,7 @@ janis run \\
         extension,
         iscopyable,
         engine_output: Union[WorkflowOutputModel, Any, List[Any]],
+        copy_plan: CopyPlan,
         shard=None,
     ):
 
@@ -1550,6 +1681,7 @@ janis run \\
                         secondaries=secondaries,
                         extension=extension,
                         iscopyable=iscopyable,
+                        copy_plan=copy_plan,
                     )
                 )
 
@@ -1637,7 +1769,7 @@ janis run \\
                         f"Couldn't copy the output for '{outputid}', as the engine returned no path"
                     )
                 else:
-                    fs.cp_from(value, newoutputfilepath, force=True)
+                    copy_plan.add(fs, value, newoutputfilepath)
                     original_filepath = value
             else:
                 if value is None:
@@ -1672,7 +1804,7 @@ janis run \\
 
                     frompath = apply_secondary_file_format_to_filename(original_filepath, sec)
 
-            fs.cp_from(frompath, topath, force=True)
+            copy_plan.add(fs, frompath, topath)
 
         return [original_filepath, newoutputfilepath]
 
@@ -1805,7 +1937,12 @@ janis run \\
         if error:
             self.database.submission_metadata.metadata.error = error
         self.database.submission_metadata.save_changes()
-        self.database.commit()
+        # the central db and the batch parent are updated from other connections,
+        # so this can't wait for the end of the monitor's batch
+        self.database.commit(force=True)
+
+        self.update_central_db_summary()
+        self.update_batch_parent()
 
         # send an email here
         meta = self.database.get_metadata()
@@ -1836,6 +1973,107 @@ Log path: {logpath}
                 status, meta, additional_information=additional_information
             )
 
+    def update_central_db_summary(self):
+        """
+        Keep the summary of this task in the central janis database up to date,
+        so 'janis query' doesn't have to open every task's database.
+        """
+        pj = self.database.submission_metadata.metadata.prepared_job
+        pj = pj or PreparedJob.instance()
+        if not pj or not pj.db_path or pj.store_in_central_db is False:
+            return
+
+        connection = None
+        try:
+            summary = self.database.get_task_summary()
+            # the timeout is how long we'll wait for other janis processes to finish writing
+            connection = sqlite3.connect(pj.db_path, timeout=10)
+            TasksDbProvider(connection, readonly=False).update_summaries([summary])
+        except Exception as e:
+            Logger.warn(
+                f"Couldn't update the summary of '{self.submission_id}' in the janis database: {repr(e)}"
+            )
+        finally:
+            if connection:
+                connection.close()
+
+    def update_batch_parent(self):
+        """
+        If this submission is part of a split batch run, update the status of the
+        parent submission (see create_batch_parent) from all of its children.
+        """
+        pj = self.database.submission_metadata.metadata.prepared_job
+        parent = getattr(pj, "batch_parent", None) if pj else None
+        if not parent:
+            return
+
+        wm = None
+        try:
+            wm = WorkflowManager(
+                execution_dir=parent["execution_dir"],
+                submission_id=parent["submission_id"],
+            )
+            wm.refresh_batch_status()
+        except Exception as e:
+            Logger.warn(
+                f"Couldn't update the status of batch '{parent.get('submission_id')}': {repr(e)}"
+            )
+        finally:
+            if wm:
+                wm.database.close()
+
+    def refresh_batch_status(self):
+        """
+        Collapse the statuses of the child submissions of a split batch run into
+        the status of this (parent) submission, and once every child has finished,
+        collect their outputs (the run_id of each output is the child's ID).
+        """
+        children = self.database.submission_metadata.get_uncached_batch_children()
+        if not children:
+            return
+
+        statuses = []
+        for sid, path in children.items():
+            try:
+                with WorkflowDbManager.open_submission_metadata(path, sid) as db:
+                    statuses.append(db.get_uncached_status() or TaskStatus.PROCESSING)
+            except Exception as e:
+                # most likely it hasn't been submitted yet
+                Logger.debug(f"Couldn't get status of batch submission '{sid}': {e}")
+                statuses.append(TaskStatus.PROCESSING)
+
+        status = TaskStatus.collapse_states(statuses)
+        is_finished = all(s.is_in_final_state() for s in statuses)
+        if status.is_in_final_state() and not is_finished:
+            status = TaskStatus.RUNNING
+
+        if is_finished:
+            self.collect_batch_outputs(children)
+
+        self.database.submission_metadata.update()
+        self.set_status(status)
+
+    def collect_batch_outputs(self, children: Dict[str, str]):
+        outputs = []
+        for sid, path in children.items():
+            try:
+                child = WorkflowDbManager(sid, path, readonly=True)
+                try:
+                    child_outputs = child.outputsDB.get() or []
+                finally:
+                    child.close()
+            except Exception as e:
+                Logger.warn(f"Couldn't get outputs of batch submission '{sid}': {e}")
+                continue
+            for o in child_outputs:
+                o.submission_id = self.submission_id
+                o.run_id = sid
+            outputs.extend(child_outputs)
+
+        if outputs:
+            self.database.outputsDB.insert_or_update_many(outputs)
+            self.database.commit()
+
     def save_metadata(self, meta: RunModel) -> Optional[bool]:
         if not meta:
             return None
@@ -1861,11 +2099,33 @@ Log path: {logpath}
             Logger.info(f"Aborting task '{wid}' by writing to '{path}'")
             with open(path, "w+") as f:
                 f.write(f"Requesting abort {DateUtil.now()}")
-            return True
         except Exception as e:
             Logger.critical("Couldn't mark aborted: " + str(e))
             return False
 
+        # a split batch run is aborted through each of its child submissions
+        try:
+            metadb = WorkflowDbManager.get_workflow_metadatadb(
+                execution_dir, wid, readonly=True
+            ).metadata
+            batch_children = metadb.batch_children or {}
+        except Exception as e:
+            Logger.debug(f"Couldn't check whether '{wid}' is a split batch run: {e}")
+            batch_children = {}
+
+        return all(
+            [WorkflowManager.mark_aborted(d, sid) for sid, d in batch_children.items()]
+        )
+
+    def handle_semaphore(self, semaphore: str) -> bool:
+        if semaphore == "abort":
+            Logger.info("Detected please_abort request, aborting")
+            self.abort()
+        elif semaphore == "pause":
+            Logger.info("Detected please_pause request, exiting")
+            self.suspend_workflow()
+        return True
+
     def remove_semaphores(self):
         path = self.get_path_for_component(self.WorkflowManagerPath.semaphore)
         if os.path.exists(path):
@@ -1896,7 +2156,7 @@ Log path: {logpath}
             self.database.commit()
             self.database.submission_metadata.save_changes()
 
-            self.stop_engine_and_db()
+            self.stop_engine_and_db(finished=False)
             self.set_status(TaskStatus.SUSPENDED)
 
             self.database.close()
@@ -7,13 +7,15 @@ from janis_core import (
     Array,
     InputSelector,
     WorkflowBase,
+    ScatterDescription,
+    ScatterMethod,
 )
 from janis_core.operators.operator import Operator, Selector
 from janis_core.utils import find_duplicates, validators
 from janis_core.utils.validators import Validators
 
 from janis_assistant.modifiers.base import PipelineModifierBase
-from janis_assistant.utils.batchrun import BatchRunRequirements
+from janis_assistant.utils.batchrun import BatchRunRequirements, BatchRunMode
 
 
 class BatchPipelineModifier(PipelineModifierBase):
@@ -83,6 +85,34 @@ class BatchPipelineModifier(PipelineModifierBase):
 
         w.input(self.GROUPBY_FIELDNAME, Array(str), value=groupby_values)
 
+        if self.batch.mode == BatchRunMode.scatter:
+            self.add_scattered_step(
+                w, tool, inputs, innode_base, insdict, raw_groupby_values
+            )
+        else:
+            self.add_unrolled_steps(
+                w,
+                tool,
+                inputs,
+                innode_base,
+                insdict,
+                groupby_values,
+                raw_groupby_values,
+            )
+
+        return w
+
+    def add_unrolled_steps(
+        self,
+        w: WorkflowBuilder,
+        tool: Tool,
+        inputs: Dict,
+        innode_base: Dict,
+        insdict: Dict,
+        groupby_values: List[str],
+        raw_groupby_values: List[str],
+    ):
+        fields = set(self.batch.fields)
         steps_created = []
 
         stepid_from_gb = lambda gb: f"{gb}_{tool.id()}"
@@ -99,14 +129,7 @@ class BatchPipelineModifier(PipelineModifierBase):
             )
 
         for out in tool.tool_outputs():
-            output_folders = []
-            output_name = out.id()
-            if isinstance(tool, WorkflowBase):
-                outnode = tool.output_nodes[out.id()]
-                output_folders = outnode.output_folder or []
-
-                if outnode.output_name is not None:
-                    output_name = outnode.output_name
+            output_name, output_folders = self.get_output_name_and_folders(tool, out)
 
             for idx, gbvalue, raw_gbvalue in zip(
                 range(len(groupby_values)), groupby_values, raw_groupby_values
@@ -127,7 +150,81 @@ class BatchPipelineModifier(PipelineModifierBase):
                     output_folder=[raw_gbvalue, *(output_folders_transformed or [])],
                 )
 
-        return w
+    def add_scattered_step(
+        self,
+        w: WorkflowBuilder,
+        tool: Tool,
+        inputs: Dict,
+        innode_base: Dict,
+        insdict: Dict,
+        raw_groupby_values: List[str],
+    ):
+        """
+        A single step scattered over the batch fields, rather than a step per group,
+        so the size of the workflow (and its metadata) doesn't grow with the batch.
+
+        Each output is an array with a value per group, so the output name and
+        folders are evaluated for each group (shard), the copy step picks the
+        folder (joined into one path) for each shard.
+        """
+        if not raw_groupby_values:
+            raise Exception(
+                f"There were no values in the group_by field ({self.batch.groupby}) to scatter over"
+            )
+
+        # keep the order they were given in, so the translation is stable
+        fields = list(dict.fromkeys(self.batch.fields))
+
+        batch_ins = {f: w.input(f, Array(insdict[f].intype)) for f in fields}
+        scatter = (
+            fields[0]
+            if len(fields) == 1
+            else ScatterDescription(fields, method=ScatterMethod.dot)
+        )
+
+        stepid = f"batch_{tool.id()}"
+        w.step(stepid, tool(**innode_base, **batch_ins), scatter=scatter)
+
+        for out in tool.tool_outputs():
+            output_name, output_folders = self.get_output_name_and_folders(tool, out)
+
+            output_names, shard_output_folders = [], []
+            for idx, raw_gbvalue in enumerate(raw_groupby_values):
+                transformed_inputs = {**inputs, **{f: inputs[f][idx] for f in fields}}
+                output_names.append(
+                    Operator.evaluate_arg(output_name, transformed_inputs)
+                )
+                output_folders_transformed = Operator.evaluate_arg(
+                    output_folders, transformed_inputs
+                )
+                folders = [raw_gbvalue, *(output_folders_transformed or [])]
+                # one path per shard, as a list would look like a nested scatter
+                shard_output_folders.append("/".join(str(f) for f in folders))
+
+            is_same_name = all(n == output_names[0] for n in output_names)
+            outnode = w.output(
+                out.id(),
+                source=w[stepid][out.id()],
+                output_name=output_names[0] if is_same_name else None,
+                output_folder=[shard_output_folders],
+            )
+            if not is_same_name:
+                # janis won't let us pass a list of names to w.output, but the copy
+                # step will pick the name for each shard from one
+                outnode.output_name = output_names
+
+    @staticmethod
+    def get_output_name_and_folders(tool: Tool, out):
+        output_folders = []
+        output_name = out.id()
+        if isinstance(tool, WorkflowBase):
+            outnode = tool.output_nodes[out.id()]
+            output_folders = outnode.output_folder or []
+
+            if outnode.output_name is not None:
+                output_name = outnode.output_name
+
+        return output_name, output_folders
 
     def inputs_modifier(self, wf: Tool, inputs: Dict, hints: Dict[str, str]) -> Dict:
 
@@ -150,6 +247,11 @@ class BatchPipelineModifier(PipelineModifierBase):
         # Split up the inputs dict to be keyed by the groupBy field
 
         self.validate_inputs(inputs, groupby_values)
+
+        if self.batch.mode == BatchRunMode.scatter:
+            # the batch fields are scattered over, so their arrays are passed through
+            return {**inputs, "groupby_field": groupby_values}
+
         fields = set(self.batch.fields)
 
         retval = {k: v for k, v in inputs.items() if k not in fields}
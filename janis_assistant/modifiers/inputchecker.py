@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List, Tuple, Type
 
 from janis_core import (
     Tool,
@@ -37,7 +37,8 @@ class InputChecker(PipelineModifierBase):
     @staticmethod
     def check_existence_of_files(wf: Tool, inputs: Dict):
 
-        doesnt_exist = {}
+        # {key: path}, where key is how we describe the input if it doesn't exist
+        to_check = {}
 
         for inp in wf.tool_inputs():
             intype = inp.intype
@@ -55,7 +56,14 @@ class InputChecker(PipelineModifierBase):
                     continue
                 raise Exception(f"Expected input '{inp.id()}' was not found or is null")
 
-            doesnt_exist.update(InputChecker.check_base_with_type(inp, intype, val))
+            to_check.update(InputChecker.collect_paths_with_type(inp, intype, val))
+
+        exists = InputChecker.check_if_inputs_exist(list(to_check.values()))
+        doesnt_exist = {
+            key: path if is_primary else "(SECONDARY) " + path
+            for key, (path, is_primary) in to_check.items()
+            if not exists[path]
+        }
 
         if len(doesnt_exist) > 0:
             import ruamel.yaml
@@ -64,8 +72,13 @@ class InputChecker(PipelineModifierBase):
             raise Exception("The following inputs were not found:\n" + stringified)
 
     @staticmethod
-    def check_base_with_type(inp: TInput, intype: DataType, val, suffix=""):
-        doesnt_exist = {}
+    def collect_paths_with_type(
+        inp: TInput, intype: DataType, val, suffix=""
+    ) -> Dict[str, Tuple[str, bool]]:
+        """
+        :return: {key: (path, is_primary)} of every path (including secondaries) in val
+        """
+        paths = {}
         if isinstance(intype, Array):
             subtype = intype.subtype()
             if not isinstance(val, list):
@@ -74,42 +87,50 @@ class InputChecker(PipelineModifierBase):
                 )
             for innerval, idx in zip(val, range(len(val))):
                 nsuffix = f"{suffix}[{idx}]"
-                doesnt_exist.update(
-                    InputChecker.check_base_with_type(
+                paths.update(
+                    InputChecker.collect_paths_with_type(
                         inp, subtype, innerval, suffix=nsuffix
                     )
                 )
-            return doesnt_exist
+            return paths
 
         inpid = inp.id() + suffix
 
         if isinstance(val, list):
             raise Exception(f"Expected singular item for {inp.id()}, received list.")
 
-        fs = FileScheme.get_filescheme_for_url(val)
-
-        if not fs.exists(val):
-            doesnt_exist[inpid] = val
+        paths[inpid] = (val, True)
 
         if not isinstance(intype, File):
-            return doesnt_exist
+            return paths
 
         InputChecker.check_extensions(inpid, intype, val)
 
         secs = intype.secondary_files() or []
         for sec in secs:
             sec_filename = apply_secondary_file_format_to_filename(val, sec)
-            if not InputChecker.check_if_input_exists(fs, sec_filename):
-                secsuffix = sec.replace("^", "").replace(".", "")
-                doesnt_exist[inp.id() + "_" + secsuffix + suffix] = (
-                    "(SECONDARY) " + sec_filename
-                )
+            secsuffix = sec.replace("^", "").replace(".", "")
+            paths[inp.id() + "_" + secsuffix + suffix] = (sec_filename, False)
 
-        return doesnt_exist
+        return paths
 
     @staticmethod
-    def check_if_input_exists(fs: FileScheme, path: str):
-        return fs.exists(path)
+    def check_if_inputs_exist(paths: List[str]) -> Dict[str, bool]:
+        """
+        Check all the paths at once, grouped by FileScheme (one instance per scheme),
+        so each FileScheme can check them concurrently / by listing directories.
+        """
+        by_scheme: Dict[Type[FileScheme], List[str]] = {}
+        for path in dict.fromkeys(paths):
+            by_scheme.setdefault(FileScheme.get_type_by_prefix(path), []).append(path)
+
+        exists = {}
+        for fstype, scheme_paths in by_scheme.items():
+            Logger.debug(
+                f"Checking existence of {len(scheme_paths)} paths with {fstype.__name__}"
+            )
+            exists.update(fstype().exists_many(scheme_paths))
+        return exists
 
     @staticmethod
     def check_extensions(inpid: str, datatype: DataType, path: str):
@@ -24,6 +24,7 @@ class SlurmSingularityTemplate(SingularityEnvironmentTemplate):
         "max_workflow_time",
         "sbatch",
         "catch_slurm_errors",
+        "check_alive_interval",
     ]
 
     def __init__(
@@ -36,6 +37,7 @@ class SlurmSingularityTemplate(SingularityEnvironmentTemplate):
         max_duration=None,
         send_job_emails=False,
         catch_slurm_errors=True,
+        check_alive_interval: Optional[int] = 30,
         # for submission
         submission_queue: Union[str, List[str]] = None,
         submission_cpus=None,
@@ -65,6 +67,7 @@ class SlurmSingularityTemplate(SingularityEnvironmentTemplate):
         :param max_ram: Maximum amount of ram (GB) that a task can request
         :param max_duration: Maximum amount of time in seconds (s) that a task can request
         :param sbatch: Override the sbatch command
+        :param check_alive_interval: Cromwell checks whether jobs are alive from one squeue every this many seconds, set to 0 to use an scontrol per job
         :param submission_queue: Partition to submit Janis to, defaults to 'queues' argument
         """
 
@@ -83,6 +86,7 @@ class SlurmSingularityTemplate(SingularityEnvironmentTemplate):
         self.send_job_emails = send_job_emails
         self.catch_slurm_errors = catch_slurm_errors
         self.sbatch = sbatch or "sbatch"
+        self.check_alive_interval = check_alive_interval
 
         self.queues = queues or []
 
@@ -114,6 +118,7 @@ class SlurmSingularityTemplate(SingularityEnvironmentTemplate):
                         afternotokaycatch=self.catch_slurm_errors,
                         call_caching_method=job.cromwell.call_caching_method,
                         sbatch=self.sbatch,
+                        check_alive_interval=self.check_alive_interval,
                     )
                 },
             ),
@@ -2,7 +2,7 @@ import unittest
 
 from janis_core import WorkflowBuilder
 
-from janis_assistant.utils.batchrun import BatchRunRequirements
+from janis_assistant.utils.batchrun import BatchRunRequirements, BatchRunMode
 
 from janis_assistant.modifiers.batchmodifier import BatchPipelineModifier
 
@@ -34,3 +34,54 @@ class TestBatchModifier(unittest.TestCase):
         modifier = BatchPipelineModifier(BatchRunRequirements(["inp"], "inp"))
         new_workflow = modifier.tool_modifier(w, inputs, {})
         print(new_workflow)
+
+    def test_scatter_mode(self):
+        inputs = {"inp": ["test1", "test2", "test3"]}
+        modifier = BatchPipelineModifier(
+            BatchRunRequirements(["inp"], "inp", mode=BatchRunMode.scatter)
+        )
+        new_workflow = modifier.tool_modifier(Echo(), inputs, {})
+
+        self.assertEqual(1, len(new_workflow.step_nodes))
+        step = list(new_workflow.step_nodes.values())[0]
+        self.assertIsNotNone(step.scatter)
+        self.assertListEqual(["out"], list(new_workflow.output_nodes.keys()))
+
+        out = new_workflow.output_nodes["out"]
+        self.assertListEqual([["test1", "test2", "test3"]], out.output_folder)
+
+    def test_scatter_mode_output_name_per_shard(self):
+        w = WorkflowBuilder("wf")
+        w.input("inp", str)
+        w.step("print", Echo(inp=w.inp))
+        w.output("out", source=w.print, output_name=w.inp, output_folder=["text"])
+
+        inputs = {"inp": ["test1", "test2"]}
+        modifier = BatchPipelineModifier(
+            BatchRunRequirements(["inp"], "inp", mode="scatter")
+        )
+        new_workflow = modifier.tool_modifier(w, inputs, {})
+        out = new_workflow.output_nodes["out"]
+        self.assertListEqual(["test1", "test2"], out.output_name)
+        self.assertListEqual([["test1/text", "test2/text"]], out.output_folder)
+
+    def test_scatter_mode_inputs(self):
+        inputs = {"inp": ["test1", "test2"]}
+        modifier = BatchPipelineModifier(
+            BatchRunRequirements(["inp"], "inp", mode=BatchRunMode.scatter)
+        )
+        new_inputs = modifier.inputs_modifier(Echo(), inputs, {})
+        self.assertListEqual(["test1", "test2"], new_inputs["inp"])
+
+
+class TestBatchRunRequirements(unittest.TestCase):
+    def test_default_mode(self):
+        reqs = BatchRunRequirements(["inp"], "inp")
+        self.assertEqual(BatchRunMode.unrolled, reqs.mode)
+
+    def test_mode_from_dict(self):
+        reqs = BatchRunRequirements(
+            **{"fields": ["inp"], "groupby": "inp", "mode": "scatter"}
+        )
+        self.assertEqual(BatchRunMode.scatter, reqs.mode)
+        self.assertEqual("scatter", reqs.to_dict()["mode"])
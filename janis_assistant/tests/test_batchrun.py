@@ -0,0 +1,134 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from janis_assistant.data.enums import TaskStatus
+from janis_assistant.data.models.run import SubmissionModel
+from janis_assistant.management.configuration import parse_if_dict
+from janis_assistant.management.workflowdbmanager import WorkflowDbManager
+from janis_assistant.utils.batchrun import BatchRunRequirements, split_batch_inputs
+from janis_assistant.utils.dateutils import DateUtil
+
+
+class TestSplitBatchInputs(unittest.TestCase):
+    def setUp(self):
+        self.requirements = BatchRunRequirements(fields=["bam"], groupby="sample")
+        self.inputs = {
+            "sample": ["s1", "s2", "s3", "s4", "s5"],
+            "bam": ["1.bam", "2.bam", "3.bam", "4.bam", "5.bam"],
+            "reference": "ref.fasta",
+        }
+
+    def test_split_into_contiguous_chunks(self):
+        splits = split_batch_inputs(self.inputs, self.requirements, 2)
+        self.assertListEqual(
+            [["s1", "s2", "s3"], ["s4", "s5"]], [s["sample"] for s in splits]
+        )
+        self.assertListEqual(
+            [["1.bam", "2.bam", "3.bam"], ["4.bam", "5.bam"]],
+            [s["bam"] for s in splits],
+        )
+
+    def test_other_inputs_are_shared(self):
+        splits = split_batch_inputs(self.inputs, self.requirements, 3)
+        self.assertListEqual(["ref.fasta"] * 3, [s["reference"] for s in splits])
+
+    def test_more_splits_than_groups(self):
+        splits = split_batch_inputs(self.inputs, self.requirements, 10)
+        self.assertEqual(5, len(splits))
+        self.assertListEqual(
+            [["s1"], ["s2"], ["s3"], ["s4"], ["s5"]], [s["sample"] for s in splits]
+        )
+
+    def test_field_without_value_for_each_group(self):
+        inputs = {**self.inputs, "bam": ["1.bam"]}
+        self.assertRaises(ValueError, split_batch_inputs, inputs, self.requirements, 2)
+
+    def test_missing_groupby(self):
+        inputs = {"bam": self.inputs["bam"]}
+        self.assertRaises(Exception, split_batch_inputs, inputs, self.requirements, 2)
+
+    def test_requirements_split_serialises(self):
+        requirements = BatchRunRequirements(fields=["bam"], groupby="sample", split=4)
+        # how the batchrun of a job.yaml is parsed
+        parsed = parse_if_dict(BatchRunRequirements, requirements.to_dict(), "batchrun")
+        self.assertEqual(4, parsed.split)
+
+
+class TestSplitBatchMetadata(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.parent = self.create_db("parent", batch_children={})
+
+    def tearDown(self):
+        self.parent.close()
+        self.directory.cleanup()
+
+    def create_db(self, sid, status=TaskStatus.PROCESSING, **metadata):
+        path = os.path.join(self.directory.name, sid)
+        os.makedirs(path)
+        db = WorkflowDbManager(sid, path)
+        db.submissions.insert_or_update_many(
+            [
+                SubmissionModel(
+                    id_=sid,
+                    output_dir=self.directory.name,
+                    execution_dir=path,
+                    author="janis",
+                    labels=[],
+                    tags=[],
+                    timestamp=DateUtil.now(),
+                    engine_type="cwltool",
+                )
+            ]
+        )
+        db.submission_metadata.metadata.name = sid
+        db.submission_metadata.metadata.status = status
+        for k, v in metadata.items():
+            setattr(db.submission_metadata.metadata, k, v)
+        db.submission_metadata.save_changes()
+        db.commit()
+        return db
+
+    def add_child(self, sid, status):
+        child = self.create_db(sid, status=status)
+        child.runevents.update(run_id="<default>", status=status)
+        child.commit()
+        meta = self.parent.submission_metadata.metadata
+        meta.batch_children = {**meta.batch_children, sid: child.exec_path}
+        self.parent.submission_metadata.save_changes()
+        self.parent.commit()
+        return child
+
+    def test_children_are_runs(self):
+        child1 = self.add_child("child1", TaskStatus.RUNNING)
+        child2 = self.add_child("child2", TaskStatus.COMPLETED)
+
+        runs = self.parent.get_metadata().runs
+        self.assertListEqual(["child1", "child2"], [r.id_ for r in runs])
+        self.assertListEqual(
+            [TaskStatus.RUNNING, TaskStatus.COMPLETED], [r.status for r in runs]
+        )
+        child1.close()
+        child2.close()
+
+    def test_child_that_isnt_submitted(self):
+        meta = self.parent.submission_metadata.metadata
+        meta.batch_children = {"child": os.path.join(self.directory.name, "missing")}
+        self.parent.submission_metadata.save_changes()
+        self.parent.commit()
+
+        (run,) = self.parent.get_metadata().runs
+        self.assertEqual("child", run.id_)
+        self.assertEqual(TaskStatus.PROCESSING, run.status)
+
+    def test_version_changes_with_child(self):
+        child = self.add_child("child", TaskStatus.QUEUED)
+        version = self.parent.get_uncached_version()
+        self.assertEqual(version, self.parent.get_uncached_version())
+
+        child.submission_metadata.metadata.status = TaskStatus.RUNNING
+        child.submission_metadata.save_changes()
+        child.commit()
+        self.assertNotEqual(version, self.parent.get_uncached_version())
+        child.close()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from janis_assistant.management.copyplanner import CopyPlan
+from janis_assistant.management.filescheme import LocalFileScheme
+
+
+class FlakyFileScheme(LocalFileScheme):
+    """
+    The source is only created after nfailures attempts to copy it
+    """
+
+    MAX_CONCURRENT_COPIES = 2
+
+    def __init__(self, nfailures):
+        super().__init__()
+        self.nfailures = nfailures
+        self.attempts = []
+
+    def cp_from(self, source, dest, force=False, report_progress=None):
+        self.attempts.append(source)
+        if self.attempts.count(source) > self.nfailures:
+            with open(source, "w+") as f:
+                f.write(source)
+        super().cp_from(source, dest, force=force)
+
+
+class TestCopyPlan(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.sources = []
+        for i in range(10):
+            path = os.path.join(self.tmpdir.name, f"file{i}.txt")
+            with open(path, "w+") as f:
+                f.write(str(i))
+            self.sources.append(path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def get_plan(self, fs):
+        plan = CopyPlan(retry_delay_seconds=0)
+        for source in self.sources:
+            plan.add(fs, source, source + ".copied")
+        return plan
+
+    def test_copies_everything(self):
+        failed = self.get_plan(LocalFileScheme()).execute()
+        self.assertEqual([], failed)
+        for source in self.sources:
+            with open(source + ".copied") as f, open(source) as g:
+                self.assertEqual(g.read(), f.read())
+
+    def test_retries_failed_copy(self):
+        for source in self.sources:
+            os.remove(source)
+        fs = FlakyFileScheme(nfailures=2)
+        failed = self.get_plan(fs).execute()
+        self.assertEqual([], failed)
+        self.assertEqual(30, len(fs.attempts))
+        self.assertTrue(all(os.path.exists(s + ".copied") for s in self.sources))
+
+    def test_missing_source_fails(self):
+        missing = os.path.join(self.tmpdir.name, "missing.txt")
+        self.sources.append(missing)
+        failed = self.get_plan(LocalFileScheme()).execute()
+        self.assertEqual([missing], [c.source for c in failed])
+        self.assertIsInstance(failed[0].error, FileNotFoundError)
+        self.assertEqual(3, failed[0].attempts)
+
+    def test_empty_plan(self):
+        self.assertEqual([], CopyPlan().execute())
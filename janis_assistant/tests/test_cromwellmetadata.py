@@ -0,0 +1,83 @@
+import unittest
+
+from janis_assistant.data.enums.taskstatus import TaskStatus
+from janis_assistant.engines.cromwell.cromwellmetadata import (
+    CromwellIncrementalMetadata,
+)
+
+
+def call(status, start="2020-01-01T00:00:00", **kwargs):
+    return {"executionStatus": status, "start": start, "shardIndex": -1, **kwargs}
+
+
+class FakeCromwell:
+    def __init__(self, workflows: dict):
+        self.workflows = workflows
+        self.requested = []
+
+    def fetch(self, identifier):
+        self.requested.append(identifier)
+        return self.workflows.get(identifier)
+
+
+class TestCromwellIncrementalMetadata(unittest.TestCase):
+    def setUp(self):
+        self.cromwell = FakeCromwell(
+            {
+                "root": {
+                    "id": "root",
+                    "status": "Running",
+                    "calls": {
+                        "wf.stp1": [call("Running")],
+                        "wf.sub": [call("Running", subWorkflowId="sub1")],
+                    },
+                },
+                "sub1": {
+                    "id": "sub1",
+                    "status": "Running",
+                    "calls": {"subwf.inner": [call("Running")]},
+                },
+            }
+        )
+        self.poller = CromwellIncrementalMetadata(self.cromwell.fetch)
+
+    def test_subworkflow_is_fetched(self):
+        model = self.poller.poll("root")
+        self.assertEqual(["root", "sub1"], self.cromwell.requested)
+        self.assertSetEqual({"stp1", "sub", "sub_inner"}, {j.id_ for j in model.jobs})
+
+    def test_unchanged_jobs_are_not_returned(self):
+        self.poller.poll("root")
+        model = self.poller.poll("root")
+        self.assertEqual([], model.jobs)
+
+    def test_changed_job_is_returned(self):
+        self.poller.poll("root")
+        self.cromwell.workflows["root"]["calls"]["wf.stp1"] = [call("Done")]
+        model = self.poller.poll("root")
+        self.assertEqual(["stp1"], [j.id_ for j in model.jobs])
+        self.assertEqual(TaskStatus.COMPLETED, model.jobs[0].status)
+
+    def test_unstarted_job_is_not_returned_again(self):
+        self.cromwell.workflows["root"]["calls"]["wf.stp2"] = [
+            call("QueuedInCromwell", start=None)
+        ]
+        model = self.poller.poll("root")
+        (stp2,) = [j for j in model.jobs if j.id_ == "stp2"]
+        self.assertEqual([], self.poller.poll("root").jobs)
+
+        self.cromwell.workflows["root"]["calls"]["wf.stp2"] = [call("Running")]
+        model = self.poller.poll("root")
+        self.assertEqual(["stp2"], [j.id_ for j in model.jobs])
+        self.assertLess(model.jobs[0].start, stp2.start)
+
+    def test_finished_subworkflow_is_not_refetched(self):
+        self.cromwell.workflows["sub1"]["status"] = "Succeeded"
+        self.poller.poll("root")
+        self.cromwell.requested.clear()
+        self.poller.poll("root")
+        self.assertEqual(["root"], self.cromwell.requested)
+
+    def test_failed_subworkflow_fetch_skips_poll(self):
+        del self.cromwell.workflows["sub1"]
+        self.assertIsNone(self.poller.poll("root"))
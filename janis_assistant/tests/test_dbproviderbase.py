@@ -0,0 +1,174 @@
+import sqlite3
+import unittest
+from typing import List
+
+from janis_assistant.data.dbproviderbase import DbProviderBase
+from janis_assistant.data.models.base import DatabaseObject, DatabaseObjectField
+
+
+class MockModel(DatabaseObject):
+    @classmethod
+    def keymap(cls) -> List[DatabaseObjectField]:
+        return [
+            DatabaseObjectField("id_", "id", is_id_key=True),
+            DatabaseObjectField("submission_id", is_id_key=True),
+            DatabaseObjectField("status"),
+            DatabaseObjectField("stderr"),
+            DatabaseObjectField("lastupdated", track_changes=False),
+        ]
+
+    @classmethod
+    def table_schema(cls):
+        return """
+        id              STRING NOT NULL,
+        submission_id   STRING NOT NULL,
+        status          STRING,
+        stderr          STRING,
+        lastupdated     STRING,
+        """
+
+    def __init__(self, id_, submission_id, status, stderr=None, lastupdated=None):
+        self.id_ = id_
+        self.submission_id = submission_id
+        self.status = status
+        self.stderr = stderr
+        self.lastupdated = lastupdated
+
+
+class MockDbProvider(DbProviderBase[MockModel]):
+    def __init__(self, db):
+        super().__init__(
+            base_type=MockModel,
+            db=db,
+            tablename="mock",
+            readonly=False,
+            scopes={"submission_id": "sid"},
+        )
+
+
+class TestDirtyFieldPersistence(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.provider = MockDbProvider(self.connection)
+        self.statements = []
+        self.connection.set_trace_callback(self.statements.append)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def updates(self):
+        return [s for s in self.statements if "UPDATE" in s]
+
+    def test_insert(self):
+        self.provider.insert_or_update_many([MockModel("a", "sid", "running")])
+        rows = self.provider.get()
+        self.assertEqual(1, len(rows))
+        self.assertEqual("running", rows[0].status)
+
+    def test_unchanged_rows_are_skipped(self):
+        self.provider.insert_or_update_many([MockModel("a", "sid", "running")])
+        self.statements.clear()
+        written = self.provider.insert_or_update_many(
+            [MockModel("a", "sid", "running")]
+        )
+        self.assertEqual([], self.updates())
+        self.assertFalse(written)
+        self.assertTrue(
+            self.provider.insert_or_update_many([MockModel("a", "sid", "failed")])
+        )
+
+    def test_untracked_field_is_skipped(self):
+        self.provider.insert_or_update_many(
+            [MockModel("a", "sid", "running", lastupdated="1")]
+        )
+        self.statements.clear()
+        self.provider.insert_or_update_many(
+            [MockModel("a", "sid", "running", lastupdated="2")]
+        )
+        self.assertEqual([], self.updates())
+
+    def test_only_changed_columns_are_written(self):
+        self.provider.insert_or_update_many(
+            [
+                MockModel("a", "sid", "running", "/stderr"),
+                MockModel("b", "sid", "running"),
+            ]
+        )
+        self.statements.clear()
+        self.provider.insert_or_update_many(
+            [
+                MockModel("a", "sid", "completed", "/stderr", "2"),
+                MockModel("b", "sid", "running"),
+            ]
+        )
+        updates = self.updates()
+        self.assertEqual(1, len(updates))
+        self.assertIn("status", updates[0])
+        self.assertIn("lastupdated", updates[0])
+        self.assertNotIn("stderr", updates[0])
+
+        rows = {r.id_: r for r in self.provider.get()}
+        self.assertEqual("completed", rows["a"].status)
+        self.assertEqual("/stderr", rows["a"].stderr)
+        self.assertEqual("running", rows["b"].status)
+
+    def test_snapshots_loaded_from_existing_rows(self):
+        self.provider.insert_or_update_many([MockModel("a", "sid", "running")])
+        self.provider.commit()
+
+        provider = MockDbProvider(self.connection)
+        self.statements.clear()
+        provider.insert_or_update_many([MockModel("a", "sid", "running")])
+        self.assertEqual([], self.updates())
+        self.assertEqual(1, len(provider.get()))
+
+
+class TestSchemaVersioning(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+
+    def tearDown(self):
+        self.connection.close()
+
+    def get_indexes(self):
+        rows = self.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'mock'"
+        ).fetchall()
+        return {r[0] for r in rows}
+
+    def test_id_key_index_is_created(self):
+        MockDbProvider(self.connection)
+        self.assertIn("mock_submission_id_id_idx", self.get_indexes())
+
+    def test_new_table_is_current_version(self):
+        provider = MockDbProvider(self.connection)
+        with provider.with_cursor() as cursor:
+            self.assertEqual(
+                MockDbProvider.CURRENT_SCHEMA_VERSION,
+                provider.get_schema_version(cursor),
+            )
+
+    def test_version_is_committed(self):
+        MockDbProvider(self.connection)
+        self.assertFalse(self.connection.in_transaction)
+
+    def test_unversioned_table_is_migrated(self):
+        migrated_from = []
+
+        class MockDbProviderV2(MockDbProvider):
+            CURRENT_SCHEMA_VERSION = 2
+
+            def get_migrations(self):
+                return {2: lambda cursor: migrated_from.append(1)}
+
+        # a table from before versions were recorded
+        self.connection.execute("CREATE TABLE mock (id STRING, submission_id STRING)")
+        provider = MockDbProviderV2(self.connection)
+
+        self.assertEqual([1], migrated_from)
+        with provider.with_cursor() as cursor:
+            self.assertEqual(2, provider.get_schema_version(cursor))
+
+        # and we don't migrate again next time
+        MockDbProviderV2(self.connection)
+        self.assertEqual([1], migrated_from)
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from janis_assistant.data import container
+from janis_assistant.data.container.digestcache import (
+    DigestCache,
+    DIGEST_CACHE_FILENAME,
+)
+from janis_assistant.data.container.info import ContainerInfo
+from janis_assistant.utils.dateutils import DateUtil
+
+UBUNTU = "ubuntu:18.04"
+UBUNTU_DIGEST = "ubuntu@sha256:" + "a" * 64
+LATEST = "ubuntu:latest"
+LATEST_DIGEST = "ubuntu@sha256:" + "b" * 64
+
+
+class TestDigestCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.location = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def get_cache(self, **kwargs):
+        cache = DigestCache(self.location, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_doesnt_hold_write_lock(self):
+        cache = self.get_cache()
+        self.assertFalse(cache._connection.in_transaction)
+        # so another process can write to it
+        self.get_cache().write_many({UBUNTU: UBUNTU_DIGEST})
+
+    def test_write_and_lookup_many(self):
+        self.get_cache().write_many({UBUNTU: UBUNTU_DIGEST, LATEST: LATEST_DIGEST})
+
+        # another process opening the same cache
+        found = self.get_cache().lookup_many([UBUNTU, LATEST, "python:3.8"])
+        self.assertDictEqual({UBUNTU: UBUNTU_DIGEST, LATEST: LATEST_DIGEST}, found)
+
+    def test_overwrite(self):
+        cache = self.get_cache()
+        cache.write_many({LATEST: UBUNTU_DIGEST})
+        cache.write_many({LATEST: LATEST_DIGEST})
+        self.assertEqual(LATEST_DIGEST, cache.lookup_many([LATEST])[LATEST])
+
+    def test_ttl_by_tag_pattern(self):
+        cache = self.get_cache(ttls={"latest": 0, "*": None})
+        cache.write_many({UBUNTU: UBUNTU_DIGEST, LATEST: LATEST_DIGEST})
+        time.sleep(0.01)
+        found = cache.lookup_many([UBUNTU, LATEST])
+        self.assertDictEqual({UBUNTU: UBUNTU_DIGEST}, found)
+
+    def test_default_ttls(self):
+        cache = self.get_cache()
+        self.assertIsNotNone(cache.get_ttl(LATEST))
+        self.assertIsNotNone(cache.get_ttl("ubuntu"))
+        self.assertIsNone(cache.get_ttl(UBUNTU))
+
+    def test_migrate_from_files(self):
+        filename = ContainerInfo.convert_to_filename(UBUNTU)
+        old_path = os.path.join(self.location, filename)
+        with open(old_path, "w+") as f:
+            f.write(UBUNTU_DIGEST)
+        yesterday = (DateUtil.now() - timedelta(days=2)).timestamp()
+        os.utime(old_path, (yesterday, yesterday))
+
+        cache = self.get_cache(ttls={"*": 24 * 60 * 60})
+        self.assertFalse(os.path.exists(old_path))
+        new_path = os.path.join(self.location, DIGEST_CACHE_FILENAME)
+        self.assertTrue(os.path.exists(new_path))
+
+        # the migrated digest keeps its original timestamp, so it has expired
+        self.assertDictEqual({}, cache.lookup_many([UBUNTU]))
+        self.assertDictEqual(
+            {UBUNTU: UBUNTU_DIGEST}, self.get_cache().lookup_many([UBUNTU])
+        )
+
+
+class TestGetDigests(unittest.TestCase):
+    @mock.patch.dict(os.environ, {"JANIS_DIGESTLOOKUPCONCURRENCY": "0"})
+    def test_zero_concurrency(self):
+        with mock.patch.object(
+            container, "get_digest_from_registry", return_value=UBUNTU_DIGEST
+        ):
+            digests = container.get_digests_from_containers(
+                [UBUNTU], cache_location=None, skip_cache=True
+            )
+        self.assertDictEqual({UBUNTU: UBUNTU_DIGEST}, digests)
@@ -0,0 +1,114 @@
+import errno
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from janis_assistant.management.filescheme import LocalFileScheme
+from janis_assistant.utils import filecopy
+from janis_assistant.utils.filecopy import (
+    CopyStrategy,
+    copy_file,
+    clear_copy_strategy_cache,
+)
+
+
+class TestCopyFile(unittest.TestCase):
+    def setUp(self):
+        clear_copy_strategy_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmpdir.name, "source.txt")
+        self.contents = "janis" * 100_000
+        with open(self.source, "w+") as f:
+            f.write(self.contents)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_copy_strategy_cache()
+
+    def dest(self, name="dest.txt"):
+        return os.path.join(self.tmpdir.name, name)
+
+    def assertCopied(self, dest):
+        with open(dest) as f:
+            self.assertEqual(self.contents, f.read())
+
+    def test_hardlink(self):
+        self.assertEqual(CopyStrategy.hardlink, copy_file(self.source, self.dest()))
+        self.assertTrue(os.path.samefile(self.source, self.dest()))
+
+    def test_each_copy_strategy(self):
+        for strategy in filecopy.DEFAULT_COPY_STRATEGIES[1:]:
+            dest = self.dest(f"{strategy}.txt")
+            # reflink isn't supported by every filesystem, so allow buffered as a fallback
+            used = copy_file(self.source, dest, [strategy, CopyStrategy.buffered])
+            self.assertIn(used, (strategy, CopyStrategy.buffered))
+            self.assertCopied(dest)
+            self.assertFalse(os.path.samefile(self.source, dest))
+
+    def test_unsupported_strategy_is_cached(self):
+        reflink = mock.Mock(side_effect=OSError(errno.EOPNOTSUPP, "not supported"))
+        with mock.patch.dict(filecopy._COPY_FUNCTIONS, {CopyStrategy.reflink: reflink}):
+            strategies = [CopyStrategy.reflink, CopyStrategy.buffered]
+            copy_file(self.source, self.dest("1.txt"), strategies)
+            copy_file(self.source, self.dest("2.txt"), strategies)
+
+        self.assertEqual(1, reflink.call_count)
+        self.assertCopied(self.dest("2.txt"))
+
+    def test_file_specific_errors_arent_cached(self):
+        for error in [errno.EPERM, errno.EINVAL]:
+            clear_copy_strategy_cache()
+            hardlink = mock.Mock(side_effect=OSError(error, os.strerror(error)))
+            reflink = mock.Mock(side_effect=OSError(error, os.strerror(error)))
+            functions = {CopyStrategy.hardlink: hardlink, CopyStrategy.reflink: reflink}
+            strategies = [CopyStrategy.hardlink, CopyStrategy.reflink]
+            with mock.patch.dict(filecopy._COPY_FUNCTIONS, functions):
+                for fn in ["1.txt", "2.txt"]:
+                    used = copy_file(
+                        self.source,
+                        self.dest(f"{error}-{fn}"),
+                        strategies + [CopyStrategy.buffered],
+                    )
+                    self.assertEqual(CopyStrategy.buffered, used)
+
+            self.assertEqual(2, hardlink.call_count)
+            self.assertEqual(2, reflink.call_count)
+
+    def test_doesnt_overwrite(self):
+        for strategies in [None, filecopy.DEFAULT_COPY_STRATEGIES[1:]]:
+            with open(self.dest(), "w+") as f:
+                f.write("existing")
+            # eg: hardlinking is unsupported between these devices
+            with self.assertRaises(FileExistsError):
+                copy_file(self.source, self.dest(), strategies)
+            with open(self.dest()) as f:
+                self.assertEqual("existing", f.read())
+
+    def test_other_errors_are_raised(self):
+        with self.assertRaises(FileNotFoundError):
+            copy_file(self.dest("missing.txt"), self.dest())
+
+
+class TestLinkCopyOrFail(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_copy_directory(self):
+        source = os.path.join(self.tmpdir.name, "source")
+        files = ["a.txt", "nested/b.txt", "nested/deeper/c.txt"]
+        for fn in files:
+            path = os.path.join(source, fn)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w+") as f:
+                f.write(fn)
+
+        dest = os.path.join(self.tmpdir.name, "dest")
+        LocalFileScheme.link_copy_or_fail(source, dest)
+
+        for fn in files:
+            with open(os.path.join(dest, fn)) as f:
+                self.assertEqual(fn, f.read())
@@ -3,7 +3,11 @@ import tempfile
 from shutil import rmtree
 import unittest
 
-from janis_assistant.management.filescheme import SSHFileScheme, GCSFileScheme
+from janis_assistant.management.filescheme import (
+    SSHFileScheme,
+    GCSFileScheme,
+    LocalFileScheme,
+)
 
 
 @unittest.skipUnless(
@@ -55,3 +59,62 @@ class TestGCSFileScheme(unittest.TestCase):
         self.assertEqual(
             "references/hg38/v0/1000G_phase1.snps.high_confidence.hg38.vcf.gz.tbi", blob
         )
+
+
+class TestLocalFileSchemeExistsMany(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.fs = LocalFileScheme()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def create_files(self, n):
+        paths = []
+        for i in range(n):
+            path = os.path.join(self.tmpdir.name, f"file{i}.txt")
+            open(path, "w+").close()
+            paths.append(path)
+        return paths
+
+    def test_few_paths(self):
+        paths = self.create_files(2)
+        missing = os.path.join(self.tmpdir.name, "missing.txt")
+        self.assertDictEqual(
+            {paths[0]: True, paths[1]: True, missing: False},
+            self.fs.exists_many([*paths, missing]),
+        )
+
+    def test_many_paths_in_directory(self):
+        paths = self.create_files(LocalFileScheme.LIST_DIRECTORY_THRESHOLD + 5)
+        broken_link = os.path.join(self.tmpdir.name, "broken.txt")
+        os.symlink(os.path.join(self.tmpdir.name, "nothing.txt"), broken_link)
+        missing = os.path.join(self.tmpdir.name, "missing.txt")
+
+        result = self.fs.exists_many(
+            ["file://" + paths[0], *paths, broken_link, missing]
+        )
+        self.assertTrue(result["file://" + paths[0]])
+        self.assertTrue(all(result[p] for p in paths))
+        self.assertFalse(result[broken_link])
+        self.assertFalse(result[missing])
+
+    def test_directory_with_trailing_slash(self):
+        paths = self.create_files(LocalFileScheme.LIST_DIRECTORY_THRESHOLD + 5)
+        # listed with the files inside it, not with its siblings
+        directory = self.tmpdir.name + "/"
+        missing = os.path.join(self.tmpdir.name, "missing") + "/"
+
+        result = self.fs.exists_many([*paths, directory, missing, paths[0] + "/"])
+        self.assertTrue(result[directory])
+        self.assertFalse(result[missing])
+        # a file isn't a directory
+        self.assertFalse(result[paths[0] + "/"])
+
+    def test_group_by_directory(self):
+        self.assertDictEqual(
+            {"s3://bucket/dir": ["s3://bucket/dir/a", "s3://bucket/dir/sub/"]},
+            LocalFileScheme.group_by_directory(
+                ["s3://bucket/dir/a", "s3://bucket/dir/sub/"]
+            ),
+        )
@@ -0,0 +1,245 @@
+import base64
+import hashlib
+import os
+import re
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from janis_assistant.management.filescheme import HTTPFileScheme
+from janis_assistant.utils import httpdownload
+from janis_assistant.utils.httpdownload import (
+    DownloadValidationError,
+    clear_head_cache,
+    download,
+)
+
+
+class MockFileHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # set by the test
+    content = b""
+    etag = '"v1"'
+    accept_ranges = True
+    content_md5 = None
+    extra_headers = {}
+    # drop the connection after this many bytes of the next GET
+    fail_after = None
+    requests = []
+
+    def send_headers(self, status, length, content_range=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("ETag", self.etag)
+        self.send_header("Last-Modified", "Wed, 21 Oct 2015 07:28:00 GMT")
+        if self.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if self.content_md5:
+            self.send_header("Content-MD5", self.content_md5)
+        if content_range:
+            self.send_header("Content-Range", content_range)
+        for name, value in self.extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self.requests.append(("HEAD", None))
+        if self.path != "/file":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            return self.end_headers()
+        self.send_headers(200, len(self.content))
+
+    def do_GET(self):
+        requested = self.headers.get("Range")
+        self.requests.append(("GET", requested))
+        content = self.content
+        match = re.match(r"bytes=(\d+)-(\d+)", requested or "")
+        if_range = self.headers.get("If-Range")
+        if match and self.accept_ranges and if_range in (None, self.etag):
+            start, end = int(match.group(1)), int(match.group(2))
+            content = content[start : end + 1]
+            self.send_headers(
+                206,
+                len(content),
+                f"bytes {start}-{end}/{len(self.content)}",
+            )
+        else:
+            self.send_headers(200, len(content))
+
+        fail_after = MockFileHandler.fail_after
+        if fail_after is not None:
+            MockFileHandler.fail_after = None
+            self.wfile.write(content[:fail_after])
+            self.close_connection = True
+            return
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockFileServerTestCase(unittest.TestCase):
+    def setUp(self):
+        MockFileHandler.content = os.urandom(100 * 1024)
+        MockFileHandler.etag = '"v1"'
+        MockFileHandler.accept_ranges = True
+        MockFileHandler.content_md5 = None
+        MockFileHandler.extra_headers = {}
+        MockFileHandler.fail_after = None
+        MockFileHandler.requests = []
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), MockFileHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/file"
+
+        self.directory = TemporaryDirectory()
+        self.dest = os.path.join(self.directory.name, "file")
+        clear_head_cache()
+
+        # so the tests can exercise parallel ranges with small files
+        self.patches = [
+            mock.patch.object(httpdownload, "PARALLEL_DOWNLOAD_THRESHOLD", 64 * 1024),
+            mock.patch.object(httpdownload, "MIN_RANGE_SIZE", 16 * 1024),
+            mock.patch.object(httpdownload, "READ_SIZE", 4 * 1024),
+            mock.patch.object(httpdownload, "SAVE_PROGRESS_BYTES", 4 * 1024),
+            mock.patch.object(httpdownload, "RETRY_DELAY_SECONDS", 0),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+        clear_head_cache()
+
+    def read_dest(self):
+        with open(self.dest, "rb") as f:
+            return f.read()
+
+    def get_requests(self, method):
+        return [r for m, r in MockFileHandler.requests if m == method]
+
+    def assert_no_partial_files(self):
+        self.assertListEqual(["file"], os.listdir(self.directory.name))
+
+
+class TestHttpDownload(MockFileServerTestCase):
+    def test_parallel_ranges(self):
+        download(self.url, self.dest, connections=4)
+        self.assertEqual(MockFileHandler.content, self.read_dest())
+        self.assertEqual(4, len(self.get_requests("GET")))
+        self.assert_no_partial_files()
+
+    def test_small_file_is_one_range(self):
+        MockFileHandler.content = os.urandom(1000)
+        download(self.url, self.dest, connections=4)
+        self.assertEqual(MockFileHandler.content, self.read_dest())
+        self.assertListEqual(["bytes=0-999"], self.get_requests("GET"))
+
+    def test_resumes_after_dropped_connection(self):
+        MockFileHandler.fail_after = 10 * 1024
+        progress = []
+        download(self.url, self.dest, connections=1, report_progress=progress.append)
+        self.assertEqual(MockFileHandler.content, self.read_dest())
+        first, second = self.get_requests("GET")
+        self.assertEqual("bytes=0-102399", first)
+        self.assertEqual("bytes=10240-102399", second)
+        self.assertEqual(1.0, progress[-1])
+
+    def test_resumes_interrupted_download(self):
+        MockFileHandler.fail_after = 10 * 1024
+        with self.assertRaises(Exception):
+            download(self.url, self.dest, connections=1, retries=0)
+        self.assertFalse(os.path.exists(self.dest))
+        self.assertTrue(os.path.exists(self.dest + ".partial.json"))
+
+        download(self.url, self.dest, connections=1)
+        self.assertEqual(MockFileHandler.content, self.read_dest())
+        self.assertEqual("bytes=10240-102399", self.get_requests("GET")[-1])
+        self.assert_no_partial_files()
+
+    def test_restarts_if_file_changed(self):
+        MockFileHandler.fail_after = 10 * 1024
+        with self.assertRaises(Exception):
+            download(self.url, self.dest, connections=1, retries=0)
+
+        MockFileHandler.content = os.urandom(100 * 1024)
+        MockFileHandler.etag = '"v2"'
+        clear_head_cache()
+        download(self.url, self.dest, connections=1)
+        self.assertEqual(MockFileHandler.content, self.read_dest())
+        self.assertEqual("bytes=0-102399", self.get_requests("GET")[-1])
+
+    def test_changed_during_download(self):
+        download(self.url, self.dest + "2", connections=4)
+        # the HEAD is cached, but the file has changed since
+        MockFileHandler.etag = '"v2"'
+        with self.assertRaises(DownloadValidationError):
+            download(self.url, self.dest, connections=4)
+        self.assertFalse(os.path.exists(self.dest))
+        self.assertFalse(os.path.exists(self.dest + ".partial"))
+
+    def test_without_ranges(self):
+        MockFileHandler.accept_ranges = False
+        download(self.url, self.dest, connections=4)
+        self.assertEqual(MockFileHandler.content, self.read_dest())
+        self.assertListEqual([None], self.get_requests("GET"))
+
+    def test_md5(self):
+        md5 = hashlib.md5(MockFileHandler.content).digest()
+        MockFileHandler.content_md5 = base64.b64encode(md5).decode()
+        download(self.url, self.dest)
+        self.assertEqual(MockFileHandler.content, self.read_dest())
+
+    def test_md5_mismatch(self):
+        md5 = hashlib.md5(b"something else").digest()
+        MockFileHandler.content_md5 = base64.b64encode(md5).decode()
+        with self.assertRaises(DownloadValidationError):
+            download(self.url, self.dest)
+        self.assertListEqual([], os.listdir(self.directory.name))
+
+    def test_s3_etag(self):
+        MockFileHandler.etag = f'"{hashlib.md5(b"something else").hexdigest()}"'
+        MockFileHandler.extra_headers = {"x-amz-request-id": "id"}
+        with self.assertRaises(DownloadValidationError):
+            download(self.url, self.dest)
+
+    def test_encrypted_s3_etag(self):
+        # the ETag of an SSE-KMS or SSE-C object isn't the MD5 of its contents
+        MockFileHandler.etag = f'"{hashlib.md5(b"something else").hexdigest()}"'
+        encryption_headers = [
+            {"x-amz-server-side-encryption": "aws:kms"},
+            {"x-amz-server-side-encryption-customer-algorithm": "AES256"},
+        ]
+        for headers in encryption_headers:
+            MockFileHandler.extra_headers = {"x-amz-request-id": "id", **headers}
+            clear_head_cache()
+            download(self.url, self.dest)
+            self.assertEqual(MockFileHandler.content, self.read_dest())
+
+
+class TestHTTPFileScheme(MockFileServerTestCase):
+    def test_head_is_shared(self):
+        fs = HTTPFileScheme()
+        self.assertTrue(fs.exists(self.url))
+        self.assertEqual(len(MockFileHandler.content), fs.get_file_size(self.url))
+        self.assertEqual(
+            "Wed, 21 Oct 2015 07:28:00 GMT", HTTPFileScheme.last_modified(self.url)
+        )
+        fs.cp_from(self.url, self.dest)
+        self.assertEqual(1, len(self.get_requests("HEAD")))
+        self.assertEqual(MockFileHandler.content, self.read_dest())
+
+    def test_missing(self):
+        fs = HTTPFileScheme()
+        missing = self.url + "-missing"
+        self.assertFalse(fs.exists(missing))
+        self.assertIsNone(fs.get_file_size(missing))
+        self.assertIsNone(fs.last_modified(missing))
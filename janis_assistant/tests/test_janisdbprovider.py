@@ -0,0 +1,108 @@
+import sqlite3
+import unittest
+
+from janis_assistant.data.enums import TaskStatus
+from janis_assistant.data.providers.janisdbprovider import TasksDbProvider, TaskRow
+
+
+class TestTasksDbProvider(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+
+    def tearDown(self):
+        self.connection.close()
+
+    def get_provider(self, tasks=None) -> TasksDbProvider:
+        provider = TasksDbProvider(self.connection, readonly=False)
+        for t in tasks or []:
+            provider.insert_task(TaskRow(t, f"/out/{t}", f"/out/{t}/janis"))
+        return provider
+
+    def test_query_by_status_and_name(self):
+        provider = self.get_provider(["abc", "def", "ghi"])
+        provider.update_summaries(
+            [
+                TaskRow("abc", None, None, status=TaskStatus.RUNNING, name="Align"),
+                TaskRow("def", None, None, status=TaskStatus.FAILED, name="align_2"),
+                TaskRow("ghi", None, None, status=TaskStatus.RUNNING, name="Call"),
+            ]
+        )
+
+        running = provider.query(status=TaskStatus.RUNNING)
+        self.assertSetEqual({"abc", "ghi"}, {r.submission_id for r in running})
+
+        aligned = provider.query(name="align")
+        self.assertSetEqual({"abc", "def"}, {r.submission_id for r in aligned})
+
+        both = provider.query(status=TaskStatus.RUNNING, name="al")
+        self.assertListEqual(["abc"], [r.submission_id for r in both])
+
+    def test_name_is_matched_literally(self):
+        provider = self.get_provider(["abc", "def"])
+        provider.update_summaries(
+            [
+                TaskRow("abc", None, None, name="my_workflow"),
+                TaskRow("def", None, None, name="myXworkflow"),
+            ]
+        )
+        rows = provider.query(name="my_")
+        self.assertListEqual(["abc"], [r.submission_id for r in rows])
+
+    def test_update_summaries_keeps_directories(self):
+        provider = self.get_provider(["abc"])
+        provider.update_summaries(
+            [TaskRow("abc", None, None, status=TaskStatus.COMPLETED, labels=["a"])]
+        )
+        row = provider.query()[0]
+        self.assertEqual("/out/abc", row.output_dir)
+        self.assertEqual(TaskStatus.COMPLETED, row.status)
+        self.assertListEqual(["a"], row.labels)
+        self.assertTrue(row.has_summary())
+
+    def test_migrate_from_version_1(self):
+        self.connection.execute("""\
+            CREATE TABLE tasks (
+                id varchar(6), output_dir text, execution_dir text, timestamp text,
+                PRIMARY KEY(id)
+            )""")
+        self.connection.execute(
+            "INSERT INTO tasks VALUES ('abc', '/out', '/out/janis', NULL)"
+        )
+
+        provider = self.get_provider()
+        rows = provider.query()
+        self.assertEqual(1, len(rows))
+        self.assertFalse(rows[0].has_summary())
+
+        provider.update_summaries([TaskRow("abc", None, None, name="wf")])
+        self.assertEqual("wf", provider.get(where=("id = ?", ["abc"]))[0].name)
+
+    def test_readonly_get_by_id_on_old_database(self):
+        self.connection.execute(
+            "CREATE TABLE tasks (id varchar(6), output_dir text, execution_dir text, timestamp text)"
+        )
+        self.connection.execute(
+            "INSERT INTO tasks VALUES ('abc', '/out', '/out/janis', NULL)"
+        )
+        provider = TasksDbProvider(self.connection, readonly=True)
+        self.assertEqual("/out/janis", provider.get_by_id("abc").execution_dir)
+
+    def test_readonly_query_on_old_database(self):
+        self.connection.execute(
+            "CREATE TABLE tasks (id varchar(6), output_dir text, execution_dir text, timestamp text)"
+        )
+        self.connection.execute(
+            "INSERT INTO tasks VALUES ('abc', '/out', '/out/janis', NULL)"
+        )
+        provider = TasksDbProvider(self.connection, readonly=True)
+        rows = provider.query()
+        self.assertListEqual(["abc"], [r.submission_id for r in rows])
+        self.assertFalse(rows[0].has_summary())
+        # without a summary, nothing matches a filter
+        self.assertListEqual([], provider.query(status=TaskStatus.RUNNING))
+
+    def test_matches_like_query(self):
+        row = TaskRow("abc", None, None, status=TaskStatus.RUNNING, name="Align")
+        self.assertTrue(row.matches(status=TaskStatus.RUNNING, name="al"))
+        self.assertFalse(row.matches(status=TaskStatus.FAILED))
+        self.assertFalse(row.matches(name="call"))
@@ -0,0 +1,94 @@
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from janis_assistant.data.enums import TaskStatus
+from janis_assistant.data.models.jobrenderer import JobTreeRenderer
+from janis_assistant.data.models.run import RunModel
+from janis_assistant.data.models.workflowjob import RunJobModel
+from janis_assistant.utils.dateutils import DateUtil
+
+
+def get_scatter(nshards, nfailed=0, start=None):
+    start = start or DateUtil.now() - timedelta(hours=1)
+    shards = []
+    for i in range(nshards):
+        status = TaskStatus.FAILED if i < nfailed else TaskStatus.COMPLETED
+        shards.append(
+            RunJobModel(
+                id_=f"step-{i}",
+                submission_id="sid",
+                run_id="rid",
+                parent="step",
+                name="step",
+                shard=i,
+                status=status,
+                start=start,
+                finish=start + timedelta(seconds=60 * (i + 1)),
+                returncode="1" if status == TaskStatus.FAILED else "0",
+            )
+        )
+    return RunJobModel(
+        id_="step",
+        submission_id="sid",
+        run_id="rid",
+        parent=None,
+        name="step",
+        status=TaskStatus.FAILED if nfailed else TaskStatus.COMPLETED,
+        start=start,
+        finish=start + timedelta(seconds=60 * nshards),
+        jobs=shards,
+    )
+
+
+class TestJobTreeRenderer(unittest.TestCase):
+    def test_collapse_large_scatter(self):
+        job = get_scatter(100, nfailed=3)
+        lines = JobTreeRenderer(monochrome=True).render_jobs([job], "")
+        self.assertEqual(2, len(lines))
+        self.assertIn("[100 shards] 97 completed, 3 failed", lines[1])
+        self.assertIn("min 1m:00s, median 50m:30s, max 1h:40m:00s", lines[1])
+
+    def test_expand_scatters(self):
+        job = get_scatter(100)
+        renderer = JobTreeRenderer(monochrome=True, expand_scatters=True)
+        lines = renderer.render_jobs([job], "")
+        self.assertEqual(101, len(lines))
+        self.assertIn("shard-0", lines[1])
+        self.assertIn("shard-99", lines[-1])
+
+    def test_small_scatter_is_expanded(self):
+        job = get_scatter(5)
+        lines = JobTreeRenderer(monochrome=True).render_jobs([job], "")
+        self.assertEqual(6, len(lines))
+
+    def test_only_changed_jobs_are_formatted(self):
+        start = DateUtil.now() - timedelta(hours=1)
+        renderer = JobTreeRenderer(monochrome=True, expand_scatters=True)
+        first = renderer.render_jobs([get_scatter(50, start=start)], "")
+
+        job = get_scatter(50, start=start)
+        job.jobs[10].status = TaskStatus.FAILED
+        with mock.patch.object(
+            RunJobModel, "format_header", autospec=True, return_value="header"
+        ) as format_header:
+            second = renderer.render_jobs([job], "")
+
+        # the failed shard and its parent
+        self.assertEqual(2, format_header.call_count)
+        self.assertEqual(first[2:11], second[2:11])
+        self.assertEqual("header", second[11])
+
+    def test_run_header(self):
+        run = RunModel(
+            id_="child",
+            submission_id="child",
+            engine_id=None,
+            status=TaskStatus.RUNNING,
+            execution_dir="/",
+            name="child (batch 1 of 2)",
+            jobs=[get_scatter(2)],
+        )
+        lines = run.format("", monochrome=True, show_header=True).split("\n")
+        self.assertEqual("[~] child (batch 1 of 2)", lines[0])
+        self.assertTrue(lines[1].startswith(JobTreeRenderer.tb))
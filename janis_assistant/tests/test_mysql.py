@@ -0,0 +1,173 @@
+import json
+import os
+import tempfile
+import unittest
+from typing import Optional
+from unittest import mock
+
+from janis_assistant.containers.base import Container
+from janis_assistant.management.mysql import MySql, SharedMySql
+
+
+class MockContainer(Container):
+    # shared between instances, as SharedMySql reattaches to the running instance
+    running = set()
+    starts = []
+    sql = []
+    not_ready_pings = 0
+
+    def __init__(self, container, instancename=None, **kwargs):
+        super().__init__(container, instancename=instancename)
+
+    @staticmethod
+    def get_container_type():
+        return None
+
+    @staticmethod
+    def test_available_by_getting_version(command: Optional[str] = None) -> str:
+        return "mock"
+
+    def start_container(self):
+        if self.instancename in MockContainer.running:
+            raise Exception(f"The container name '{self.instancename}' is in use")
+        MockContainer.starts.append(self.instancename)
+        MockContainer.running.add(self.instancename)
+
+    def remove_instance_if_exists(self):
+        MockContainer.running.discard(self.instancename)
+
+    def stop_container(self):
+        MockContainer.running.discard(self.instancename)
+
+    def exec_command(self, command):
+        if command[0] == "mysqladmin":
+            if MockContainer.not_ready_pings > 0:
+                MockContainer.not_ready_pings -= 1
+                return "Can't connect", 1
+            if self.instancename in MockContainer.running:
+                return "mysqld is alive", 0
+            return "Can't connect", 1
+        MockContainer.sql.append(command[-1])
+        return "", 0
+
+    def ensure_downloaded(self):
+        pass
+
+
+class MySqlTestBase(unittest.TestCase):
+    def setUp(self):
+        MockContainer.running = set()
+        MockContainer.starts = []
+        MockContainer.sql = []
+        MockContainer.not_ready_pings = 0
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+        patcher = mock.patch.object(MySql, "is_port_open", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.sleeps = []
+        patcher = mock.patch(
+            "janis_assistant.management.mysql.sleep", side_effect=self.sleeps.append
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestMySqlReadiness(MySqlTestBase):
+    def get_mysql(self):
+        return MySql(
+            wid="abc",
+            container=MockContainer,
+            datadirectory=os.path.join(self.tmpdir.name, "data"),
+            forwardedport=3306,
+            confdir=os.path.join(self.tmpdir.name, "conf"),
+            containerdir=None,
+        )
+
+    def test_backs_off_until_ready(self):
+        MockContainer.not_ready_pings = 4
+        self.get_mysql().start()
+        self.assertListEqual([0.25, 0.5, 1, 2], self.sleeps)
+
+    def test_backoff_is_capped(self):
+        MockContainer.not_ready_pings = 8
+        self.get_mysql().start()
+        self.assertEqual(MySql.READINESS_MAX_INTERVAL, max(self.sleeps))
+
+    def test_timeout(self):
+        mysql = self.get_mysql()
+        with mock.patch(
+            "janis_assistant.management.mysql.time", side_effect=[0, 1, 2, 10]
+        ):
+            self.assertRaises(Exception, mysql.wait_until_ready, timeout=5)
+
+
+class TestSharedMySql(MySqlTestBase):
+    def get_shared(self, wid):
+        return SharedMySql(
+            wid=wid,
+            container=MockContainer,
+            basedirectory=self.tmpdir.name,
+            containerdir=None,
+            username="user",
+        )
+
+    def test_shared_between_submissions(self):
+        first, second = self.get_shared("abc"), self.get_shared("def")
+        first.start()
+        second.start()
+
+        self.assertEqual(1, len(MockContainer.starts))
+        self.assertEqual(first.forwardedport, second.forwardedport)
+        self.assertNotEqual(first.database, second.database)
+        self.assertListEqual(
+            [
+                "CREATE DATABASE IF NOT EXISTS cromwell_abc;",
+                "CREATE DATABASE IF NOT EXISTS cromwell_def;",
+            ],
+            MockContainer.sql,
+        )
+
+        first.stop()
+        self.assertEqual(1, len(MockContainer.running))
+        second.stop()
+        self.assertEqual(0, len(MockContainer.running))
+
+    def test_restarts_unresponsive_instance(self):
+        self.get_shared("abc").start()
+        MockContainer.running.clear()
+
+        self.get_shared("def").start()
+        self.assertEqual(2, len(MockContainer.starts))
+
+    def test_stale_leases_are_removed(self):
+        shared = self.get_shared("abc")
+        shared.start()
+
+        with open(os.path.join(shared.get_leases_dir(), "dead"), "w+") as f:
+            # pid's are (almost certainly) never this large
+            json.dump({"pid": 2**22 + 1}, f)
+
+        shared.stop()
+        self.assertEqual(0, len(MockContainer.running))
+        self.assertListEqual([], os.listdir(shared.get_leases_dir()))
+
+    def test_removes_container_without_instance(self):
+        # eg: janis was killed, and the instance file was removed
+        MockContainer.running.add("mariadb-janis-user")
+        shared = self.get_shared("abc")
+        shared.start()
+        self.assertListEqual(["mariadb-janis-user"], MockContainer.starts)
+
+    def test_database_dropped_when_finished(self):
+        first, second = self.get_shared("abc"), self.get_shared("def")
+        first.start()
+        second.start()
+
+        first.stop(drop_database=True)
+        second.stop()
+        self.assertIn("DROP DATABASE IF EXISTS cromwell_abc;", MockContainer.sql)
+        self.assertNotIn("DROP DATABASE IF EXISTS cromwell_def;", MockContainer.sql)
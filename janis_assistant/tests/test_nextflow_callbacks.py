@@ -0,0 +1,160 @@
+import json
+import os
+import socketserver
+import threading
+import unittest
+from http.client import HTTPConnection
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from janis_core.translations import NextflowTranslator
+
+from janis_assistant.data.enums import TaskStatus
+from janis_assistant.data.models.workflowjob import RunJobModel
+from janis_assistant.engines.nextflow.main import Nextflow, make_request_handler
+
+
+class FakeNextflowLogger:
+    sid = "sid"
+
+    def __init__(self):
+        self.jobs = []
+
+    def metadata_callback(self, logger, job):
+        self.jobs.append(job)
+
+
+class TestNextflowCallbacks(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        with mock.patch("janis_assistant.engines.nextflow.main.PreparedJob"):
+            self.engine = Nextflow(
+                self.directory.name, self.directory.name, config=mock.Mock()
+            )
+        self.engine.taskmeta = {"status": TaskStatus.RUNNING, "jobs": {}}
+        self.logger = FakeNextflowLogger()
+
+        self.received = []
+        self.engine.add_callback("sid", self.received.append)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_job(self, name, status, **kwargs):
+        return RunJobModel(
+            submission_id=None,
+            run_id="sid",
+            id_=name,
+            parent=None,
+            name=name,
+            status=status,
+            **kwargs,
+        )
+
+    def test_update_is_coalesced(self):
+        self.engine.CALLBACK_INTERVAL_MS = 60 * 1000
+        for i in range(100):
+            self.engine.task_did_update(
+                self.logger, self.get_job(f"task{i}", TaskStatus.QUEUED)
+            )
+        self.engine.task_did_update(
+            self.logger, self.get_job("task0", TaskStatus.RUNNING)
+        )
+        self.assertListEqual([], self.received)
+
+        self.engine.flush_job_updates("sid")
+        self.assertEqual(1, len(self.received))
+        jobs = {j.id_: j for j in self.received[0].jobs}
+        self.assertEqual(100, len(jobs))
+        self.assertEqual(TaskStatus.RUNNING, jobs["task0"].status)
+
+    def test_flush_only_has_changed_jobs(self):
+        self.engine.task_did_update(self.logger, self.get_job("a", TaskStatus.QUEUED))
+        self.engine.task_did_update(self.logger, self.get_job("b", TaskStatus.QUEUED))
+        self.engine.flush_job_updates("sid")
+
+        self.engine.task_did_update(self.logger, self.get_job("a", TaskStatus.RUNNING))
+        self.engine.flush_job_updates("sid")
+
+        self.assertEqual(2, len(self.received))
+        self.assertListEqual(["a"], [j.id_ for j in self.received[1].jobs])
+        # but the engine still knows about every job
+        self.assertEqual(2, len(self.engine.metadata("sid").jobs))
+
+    def test_flushed_by_timer(self):
+        self.engine.CALLBACK_INTERVAL_MS = 10
+        flushed = threading.Event()
+        self.engine.add_callback("sid", lambda meta: flushed.set())
+        self.engine.task_did_update(self.logger, self.get_job("a", TaskStatus.QUEUED))
+        self.assertTrue(flushed.wait(5))
+
+    def test_keeps_start_from_earlier_event(self):
+        self.engine.CALLBACK_INTERVAL_MS = 60 * 1000
+        job = self.get_job("a", TaskStatus.RUNNING, start="2020-01-01T00:00:00")
+        self.engine.task_did_update(self.logger, job)
+        self.engine.task_did_update(
+            self.logger,
+            self.get_job("a", TaskStatus.COMPLETED, finish="2020-01-01T00:01:00"),
+        )
+        self.engine.flush_job_updates("sid")
+
+        (job,) = self.received[0].jobs
+        self.assertEqual(TaskStatus.COMPLETED, job.status)
+        self.assertEqual(60, job.get_runtime())
+
+    def test_error_is_read_when_flushed(self):
+        self.engine.CALLBACK_INTERVAL_MS = 60 * 1000
+        with open(os.path.join(self.directory.name, ".err"), "w+") as f:
+            f.write("bad input")
+
+        self.engine.task_did_update(
+            self.logger,
+            self.get_job("a", TaskStatus.FAILED, workdir=self.directory.name),
+        )
+        self.assertIsNone(self.engine.taskmeta["jobs"]["a"].error)
+
+        self.engine.flush_job_updates("sid")
+        self.assertEqual("bad input", self.received[0].jobs[0].error)
+
+
+@unittest.skipUnless(
+    hasattr(NextflowTranslator, "FINAL_STEP_NAME"),
+    "requires a janis-core with the nextflow translation",
+)
+class TestNextflowRequestHandler(unittest.TestCase):
+    def setUp(self):
+        self.logger = FakeNextflowLogger()
+        self.server = socketserver.ThreadingTCPServer(
+            ("localhost", 0), make_request_handler(self.logger)
+        )
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def post(self, body: dict):
+        connection = HTTPConnection(*self.server.server_address, timeout=5)
+        connection.request("POST", "/", body=json.dumps(body))
+        response = connection.getresponse()
+        connection.close()
+        return response
+
+    def test_process_event_is_acknowledged(self):
+        response = self.post(
+            {
+                "event": "process_submitted",
+                "trace": {
+                    "name": "task",
+                    "process": "task",
+                    "task_id": 1,
+                    "workdir": "/path/to/work",
+                    "status": "SUBMITTED",
+                },
+            }
+        )
+        self.assertEqual(200, response.status)
+
+        (job,) = self.logger.jobs
+        self.assertEqual(TaskStatus.QUEUED, job.status)
+        self.assertIsNone(job.error)
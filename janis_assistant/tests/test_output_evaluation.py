@@ -1,7 +1,12 @@
+import os
+import tempfile
+
 import janis_core as j
 
 from unittest import TestCase
 
+from janis_assistant.management.copyplanner import CopyPlan
+from janis_assistant.management.filescheme import LocalFileScheme
 from janis_assistant.management.workflowmanager import WorkflowManager
 
 ct = j.CommandToolBuilder(
@@ -36,3 +41,41 @@ class TestOutputEvaluation(TestCase):
         )
 
         self.assertEqual("_fastqc.txt", outputs[0].extension)
+
+
+class TestCopyOutput(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # copy_output doesn't need any of the WorkflowManager's state
+        self.manager = WorkflowManager.__new__(WorkflowManager)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def copy_output(self, engine_output, output_folders):
+        self.manager.copy_output(
+            fs=LocalFileScheme(),
+            output_dir=self.tmpdir.name,
+            outputid="out",
+            output_name_prefix=None,
+            output_folders=output_folders,
+            secondaries=None,
+            extension=None,
+            iscopyable=False,
+            engine_output=engine_output,
+            copy_plan=CopyPlan(),
+        )
+
+    def test_nested_scatter_folders(self):
+        self.copy_output([["1", "2"], ["3", "4"]], [[["a", "b"], ["c", "d"]]])
+        self.assertListEqual(["a", "b", "c", "d"], sorted(os.listdir(self.tmpdir.name)))
+        for folder, value in zip("abcd", "1234"):
+            (fn,) = os.listdir(os.path.join(self.tmpdir.name, folder))
+            with open(os.path.join(self.tmpdir.name, folder, fn)) as f:
+                self.assertEqual(value, f.read())
+
+    def test_scattered_batch_folders(self):
+        self.copy_output(["1", "2"], [["sample1/text", "sample2/text"]])
+        for sample in ["sample1", "sample2"]:
+            path = os.path.join(self.tmpdir.name, sample, "text")
+            self.assertEqual(1, len(os.listdir(path)))
@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+from tempfile import TemporaryDirectory
+
+from janis_assistant.utils.pathhelper import (
+    get_workflow_from_file,
+    load_module_from_file,
+)
+
+WORKFLOWS = """\
+from janis_core import Workflow, String
+
+instantiated = []
+
+
+class BaseWorkflow(Workflow):
+    def __init__(self):
+        instantiated.append(self.__class__.__name__)
+        super().__init__()
+
+    def friendly_name(self):
+        return self.id()
+
+    def constructor(self):
+        self.input("inp", String)
+        self.output("out", source=self.inp)
+
+
+class FirstWorkflow(BaseWorkflow):
+    def id(self):
+        return "first"
+
+
+class SecondWorkflow(BaseWorkflow):
+    def id(self):
+        return "second"
+"""
+
+
+class TestGetWorkflowFromFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "workflows.py")
+        with open(self.path, "w+") as f:
+            f.write(WORKFLOWS)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_only_instantiates_selected(self):
+        wf = get_workflow_from_file(self.path, None)
+        self.assertEqual("second", wf.id())
+        # the module is cached, so this is the one the workflow came from
+        module = load_module_from_file(self.path)
+        self.assertListEqual(["SecondWorkflow"], module.instantiated)
+
+    def test_by_name(self):
+        wf = get_workflow_from_file(self.path, "FirstWorkflow")
+        self.assertEqual("first", wf.id())
+
+    def test_reuses_module(self):
+        first = get_workflow_from_file(self.path, None)
+        second = get_workflow_from_file(self.path, None)
+        self.assertIsNot(first, second)
+        self.assertIs(first.__class__, second.__class__)
+
+    def test_reloads_changed_file(self):
+        first = get_workflow_from_file(self.path, None)
+        with open(self.path, "a") as f:
+            f.write("\n\nclass ThirdWorkflow(FirstWorkflow):\n    pass\n")
+        second = get_workflow_from_file(self.path, None)
+        self.assertEqual("ThirdWorkflow", second.__class__.__name__)
+        self.assertIsNot(first.__class__, second.__class__)
+
+    def test_path_added_once(self):
+        get_workflow_from_file(self.path, None)
+        get_workflow_from_file(self.path, "FirstWorkflow")
+        self.assertEqual(1, sys.path.count(self.directory.name))
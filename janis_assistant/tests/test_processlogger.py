@@ -0,0 +1,88 @@
+import os
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from janis_assistant.utils.processlogger import BufferedLogSink, LogSinkFlusher
+
+
+class TestBufferedLogSink(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "engine.log")
+        self.logfp = open(self.path, "a+")
+        self.sinks = []
+
+    def tearDown(self):
+        for sink in self.sinks:
+            LogSinkFlusher.unregister(sink)
+        self.logfp.close()
+        self.directory.cleanup()
+
+    def get_sink(self, **kwargs):
+        sink = BufferedLogSink(self.logfp, **kwargs)
+        self.sinks.append(sink)
+        return sink
+
+    def read(self):
+        with open(self.path) as f:
+            return f.read().splitlines()
+
+    def wait_for_lines(self, n, timeout=5):
+        start = time.time()
+        while len(self.read()) < n and time.time() - start < timeout:
+            time.sleep(0.05)
+        return self.read()
+
+    def test_buffers_until_due(self):
+        sink = self.get_sink(flush_interval=60)
+        sink.write("first")
+        self.assertFalse(sink.is_due())
+        self.assertListEqual([], self.read())
+
+        sink.flush()
+        self.assertListEqual(["first"], self.read())
+
+    def test_flushes_when_full(self):
+        sink = self.get_sink(flush_interval=60, flush_lines=10)
+        for i in range(10):
+            sink.write(str(i))
+        self.assertListEqual([str(i) for i in range(10)], self.wait_for_lines(10))
+
+    def test_flushes_after_interval(self):
+        sink = self.get_sink(flush_interval=0.1)
+        sink.write("line")
+        self.assertListEqual(["line"], self.wait_for_lines(1))
+
+    def test_close_syncs(self):
+        sink = self.get_sink(flush_interval=60)
+        sink.write("line")
+        with mock.patch("os.fsync") as fsync:
+            sink.close()
+        fsync.assert_called_once_with(self.logfp.fileno())
+        self.assertListEqual(["line"], self.read())
+
+    def test_flushing_doesnt_sync(self):
+        sink = self.get_sink(flush_interval=60)
+        sink.write("line")
+        with mock.patch("os.fsync") as fsync:
+            sink.flush()
+        fsync.assert_not_called()
+
+    def test_drops_oldest_lines_when_full(self):
+        sink = self.get_sink(flush_interval=60, flush_lines=100, max_buffered_lines=3)
+        with mock.patch.object(LogSinkFlusher, "wake"):
+            for i in range(5):
+                sink.write(str(i))
+        sink.flush()
+        lines = self.read()
+        self.assertIn("2 lines were dropped", lines[0])
+        self.assertListEqual(["2", "3", "4"], lines[1:])
+
+    def test_recent_lines(self):
+        sink = self.get_sink(flush_interval=60, recent_lines=3)
+        for i in range(5):
+            sink.write(str(i))
+        self.assertListEqual(["2", "3", "4"], sink.get_recent_lines())
+        self.assertListEqual(["3", "4"], sink.get_recent_lines(2))
@@ -0,0 +1,192 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from janis_assistant.management.filescheme import S3FileScheme, has_boto3
+
+try:
+    from moto.server import ThreadedMotoServer
+
+    has_moto = True
+except ImportError:
+    has_moto = False
+
+# the tests can also be run against another S3 compatible server (eg: MinIO)
+TEST_ENDPOINT = os.getenv("JANIS_TEST_S3ENDPOINTURL")
+
+
+class TestS3Links(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(
+            ("bucket", "path/to/file.txt"),
+            S3FileScheme.parse_s3_link("s3://bucket/path/to/file.txt"),
+        )
+        self.assertEqual(("bucket", ""), S3FileScheme.parse_s3_link("s3://bucket"))
+
+    def test_invalid(self):
+        with self.assertRaises(Exception):
+            S3FileScheme.parse_s3_link("s3:///file.txt")
+
+    @unittest.skipUnless(has_boto3, "requires boto3")
+    def test_part_size(self):
+        fs = S3FileScheme()
+        self.assertEqual(
+            fs.MIN_PART_SIZE, fs.get_transfer_config(1024).multipart_chunksize
+        )
+        # 1 TB needs parts of 105 MB to fit in 10,000 parts
+        part_size = fs.get_transfer_config(1024**4).multipart_chunksize
+        self.assertEqual(105 * 1024 * 1024, part_size)
+
+
+@unittest.skipUnless(
+    has_boto3 and (has_moto or TEST_ENDPOINT),
+    "requires boto3, and moto or $JANIS_TEST_S3ENDPOINTURL",
+)
+class TestS3FileScheme(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = None
+        cls.endpoint = TEST_ENDPOINT
+        cls.env = mock.patch.dict(
+            os.environ,
+            {
+                "AWS_ACCESS_KEY_ID": os.getenv("AWS_ACCESS_KEY_ID", "testing"),
+                "AWS_SECRET_ACCESS_KEY": os.getenv("AWS_SECRET_ACCESS_KEY", "testing"),
+                "AWS_DEFAULT_REGION": "us-east-1",
+            },
+        )
+        cls.env.start()
+        if not cls.endpoint:
+            cls.server = ThreadedMotoServer(
+                ip_address="127.0.0.1", port=0, verbose=False
+            )
+            cls.server.start()
+            host, port = cls.server.get_host_and_port()
+            cls.endpoint = f"http://{host}:{port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.server:
+            cls.server.stop()
+        cls.env.stop()
+
+    def setUp(self):
+        self.fs = S3FileScheme(endpoint_url=self.endpoint)
+        self.bucket = f"janis-test-{self.id().rsplit('.', 1)[-1].replace('_', '-')}"
+        self.client = self.fs.get_client()
+        self.client.create_bucket(Bucket=self.bucket)
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.fs.rm_dir(f"s3://{self.bucket}")
+        self.client.delete_bucket(Bucket=self.bucket)
+        self.directory.cleanup()
+
+    def url(self, key):
+        return f"s3://{self.bucket}/{key}"
+
+    def put(self, key, body=b"contents"):
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=body)
+
+    def local(self, *path):
+        return os.path.join(self.directory.name, *path)
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_exists(self):
+        self.put("dir/file.txt")
+        self.assertTrue(self.fs.exists(self.url("dir/file.txt")))
+        self.assertTrue(self.fs.exists(self.url("dir")))
+        self.assertFalse(self.fs.exists(self.url("dir/missing.txt")))
+        self.assertFalse(self.fs.exists(self.url("di")))
+
+    def test_exists_many(self):
+        n = S3FileScheme.LIST_DIRECTORY_THRESHOLD + 2
+        paths = [self.url(f"dir/file{i}.txt") for i in range(n)]
+        for i in range(n):
+            self.put(f"dir/file{i}.txt")
+        self.put("dir/nested/file.txt")
+        self.put("other/file.txt")
+
+        missing = [self.url("dir/missing.txt"), self.url("other/missing.txt")]
+        directories = [self.url("dir/nested"), self.url("dir/")]
+        result = self.fs.exists_many(
+            [*paths, *directories, self.url("other/file.txt"), *missing]
+        )
+        self.assertTrue(all(result[p] for p in paths))
+        self.assertTrue(all(result[d] for d in directories))
+        self.assertTrue(result[self.url("other/file.txt")])
+        self.assertFalse(any(result[p] for p in missing))
+
+    def test_size_and_last_modified(self):
+        self.put("file.txt", b"12345")
+        self.assertEqual(5, self.fs.get_file_size(self.url("file.txt")))
+        self.assertIsNotNone(self.fs.last_modified(self.url("file.txt")))
+        self.assertIsNone(self.fs.get_file_size(self.url("missing.txt")))
+
+    def test_multipart_roundtrip(self):
+        self.fs.MULTIPART_THRESHOLD = 5 * 1024 * 1024
+        self.fs.MIN_PART_SIZE = 5 * 1024 * 1024
+        contents = os.urandom(12 * 1024 * 1024)
+        with open(self.local("upload.bin"), "wb") as f:
+            f.write(contents)
+
+        progress = []
+        self.fs.cp_to(
+            self.local("upload.bin"),
+            self.url("big.bin"),
+            report_progress=progress.append,
+        )
+        # the ETag of a multipart upload ends with the number of parts
+        etag = self.fs.head(self.url("big.bin"))["ETag"]
+        self.assertTrue(etag.strip('"').endswith("-3"))
+        self.assertEqual(1.0, progress[-1])
+
+        self.fs.cp_from(self.url("big.bin"), self.local("download.bin"))
+        self.assertEqual(contents, self.read(self.local("download.bin")))
+
+    def test_directory_roundtrip(self):
+        os.makedirs(self.local("out", "nested"))
+        for path in [("out", "a.txt"), ("out", "nested", "b.txt")]:
+            with open(self.local(*path), "w+") as f:
+                f.write(path[-1])
+
+        self.fs.cp_to(self.local("out"), self.url("outputs"))
+        self.assertTrue(self.fs.exists(self.url("outputs/nested/b.txt")))
+
+        self.fs.cp_from(self.url("outputs"), self.local("copied"))
+        self.assertEqual(b"a.txt", self.read(self.local("copied", "a.txt")))
+        self.assertEqual(b"b.txt", self.read(self.local("copied", "nested", "b.txt")))
+
+    def test_force(self):
+        self.put("file.txt", b"new")
+        with open(self.local("file.txt"), "w+") as f:
+            f.write("old")
+
+        self.fs.cp_from(self.url("file.txt"), self.local("file.txt"))
+        self.assertEqual(b"old", self.read(self.local("file.txt")))
+        self.fs.cp_from(self.url("file.txt"), self.local("file.txt"), force=True)
+        self.assertEqual(b"new", self.read(self.local("file.txt")))
+
+        self.fs.cp_to(self.local("file.txt"), self.url("file2.txt"))
+        with open(self.local("file.txt"), "w+") as f:
+            f.write("newer")
+        self.fs.cp_to(self.local("file.txt"), self.url("file2.txt"))
+        self.fs.cp_from(self.url("file2.txt"), self.local("file2.txt"))
+        self.assertEqual(b"new", self.read(self.local("file2.txt")))
+
+    def test_rm_dir(self):
+        for i in range(5):
+            self.put(f"dir/file{i}.txt")
+        self.put("keep.txt")
+        self.fs.DELETE_BATCH_SIZE = 2
+        self.fs.rm_dir(self.url("dir"))
+        self.assertFalse(self.fs.exists(self.url("dir")))
+        self.assertTrue(self.fs.exists(self.url("keep.txt")))
+
+    def test_missing(self):
+        with self.assertRaises(Exception):
+            self.fs.cp_from(self.url("missing.txt"), self.local("missing.txt"))
@@ -0,0 +1,66 @@
+import unittest
+from io import StringIO
+
+from janis_assistant.utils.screen import (
+    Screen,
+    CURSOR_HOME,
+    CLEAR_SCREEN,
+    CLEAR_TO_END_OF_LINE,
+)
+
+
+class MockTerminal(StringIO):
+    def isatty(self):
+        return True
+
+
+class TestScreen(unittest.TestCase):
+    def test_not_a_terminal(self):
+        stream = StringIO()
+        screen = Screen(stream)
+        screen.draw("first")
+        screen.draw("second")
+        self.assertEqual("first\nsecond\n", stream.getvalue())
+
+    def test_redraws_in_place(self):
+        stream = MockTerminal()
+        screen = Screen(stream)
+
+        screen.draw("first\nlines")
+        self.assertTrue(stream.getvalue().startswith(CLEAR_SCREEN + CURSOR_HOME))
+
+        stream.seek(0)
+        stream.truncate()
+        screen.draw("second")
+        value = stream.getvalue()
+        self.assertTrue(value.startswith(CURSOR_HOME + "second" + CLEAR_TO_END_OF_LINE))
+        self.assertNotIn(CLEAR_SCREEN, value)
+
+    def test_limited_to_terminal_height(self):
+        stream = MockTerminal()
+        screen = Screen(stream)
+        screen.get_height = lambda: 10
+
+        screen.draw("\n".join(f"line {i}" for i in range(100)))
+        lines = stream.getvalue().split("\n")
+        self.assertIn("line 7", lines[7])
+        self.assertIn("92 more lines", lines[8])
+        self.assertNotIn("line 8", stream.getvalue())
+
+    def test_hint(self):
+        stream = MockTerminal()
+        screen = Screen(stream, full_output_hint="janis watch wid --once")
+        screen.get_height = lambda: 10
+        screen.get_width = lambda: 80
+
+        screen.draw("\n".join(f"line {i}" for i in range(100)))
+        self.assertIn("janis watch wid --once", stream.getvalue().split("\n")[8])
+
+    def test_final_draw_isnt_limited(self):
+        stream = MockTerminal()
+        screen = Screen(stream)
+        screen.get_height = lambda: 10
+
+        screen.draw("\n".join(f"line {i}" for i in range(100)), final=True)
+        self.assertIn("line 99", stream.getvalue())
+        self.assertNotIn("more lines", stream.getvalue())
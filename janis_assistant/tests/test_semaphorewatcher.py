@@ -0,0 +1,56 @@
+import os
+import queue
+import tempfile
+import unittest
+
+from janis_assistant.utils.semaphorewatcher import SemaphoreWatcher
+
+
+class TestSemaphoreWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = self.tmpdir.name
+        self.found = queue.Queue()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def get_watcher(self, **kwargs):
+        watcher = SemaphoreWatcher(
+            self.directory, ["abort", "pause"], self.found.put, **kwargs
+        )
+        self.addCleanup(watcher.terminate)
+        return watcher
+
+    def write_semaphore(self, name):
+        with open(os.path.join(self.directory, name), "w+") as f:
+            f.write("requested")
+
+    def test_existing_semaphore(self):
+        self.write_semaphore("pause")
+        self.get_watcher().start()
+        self.assertEqual("pause", self.found.get(timeout=5))
+
+    def test_new_semaphore(self):
+        # a large fallback interval, so we're relying on inotify where it's available
+        watcher = self.get_watcher(poll_interval=0.1, fallback_interval=60)
+        watcher.start()
+        self.write_semaphore("abort")
+        self.assertEqual("abort", self.found.get(timeout=5))
+
+    def test_new_semaphore_without_inotify(self):
+        watcher = self.get_watcher(poll_interval=0.1)
+        if watcher._inotify_fd is not None:
+            os.close(watcher._inotify_fd)
+            watcher._inotify_fd = None
+        watcher.start()
+        self.write_semaphore("abort")
+        self.assertEqual("abort", self.found.get(timeout=5))
+
+    def test_terminate(self):
+        watcher = self.get_watcher(poll_interval=60, fallback_interval=60)
+        watcher.start()
+        watcher.terminate()
+        watcher.join(timeout=5)
+        self.assertFalse(watcher.is_alive())
+        self.assertTrue(self.found.empty())
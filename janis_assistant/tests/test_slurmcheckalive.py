@@ -0,0 +1,125 @@
+import os
+import shutil
+import subprocess
+import unittest
+from tempfile import TemporaryDirectory
+
+from janis_assistant.engines.cromwell.cromwellconfiguration import (
+    CromwellConfiguration,
+)
+
+# records each call, and prints the jobs in $FAKE_SQUEUE_JOBS
+FAKE_SQUEUE = """\
+#!/bin/sh
+echo "$@" >> "$FAKE_CALLS/squeue"
+[ -n "$FAKE_SQUEUE_FAIL" ] && exit 1
+[ -f "$FAKE_SQUEUE_JOBS" ] && cat "$FAKE_SQUEUE_JOBS"
+exit 0
+"""
+
+FAKE_SCONTROL = """\
+#!/bin/sh
+echo "$@" >> "$FAKE_CALLS/scontrol"
+exit 1
+"""
+
+
+@unittest.skipUnless(shutil.which("sh"), "requires a POSIX shell")
+class TestSlurmCheckAlive(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.bin = os.path.join(self.directory.name, "bin")
+        self.calls = os.path.join(self.directory.name, "calls")
+        os.makedirs(self.bin)
+        os.makedirs(self.calls)
+        for name, script in [("squeue", FAKE_SQUEUE), ("scontrol", FAKE_SCONTROL)]:
+            path = os.path.join(self.bin, name)
+            with open(path, "w+") as f:
+                f.write(script)
+            os.chmod(path, 0o755)
+
+        self.jobs = os.path.join(self.directory.name, "jobs")
+        self.cache = os.path.join(self.directory.name, "cache")
+        self.set_jobs({"100": "RUNNING", "101": "PENDING"})
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def set_jobs(self, jobs):
+        with open(self.jobs, "w+") as f:
+            f.writelines(f"{jid} {state}\n" for jid, state in jobs.items())
+
+    def check_alive(self, job_id, interval=60, **env):
+        script = CromwellConfiguration.slurm_check_alive(
+            interval=interval, cache=self.cache
+        ).replace("${job_id}", job_id)
+        return subprocess.run(
+            ["sh", "-c", script],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env={
+                **os.environ,
+                "PATH": self.bin + os.pathsep + os.environ.get("PATH", ""),
+                "FAKE_CALLS": self.calls,
+                "FAKE_SQUEUE_JOBS": self.jobs,
+                **env,
+            },
+        )
+
+    def ncalls(self, program):
+        path = os.path.join(self.calls, program)
+        if not os.path.exists(path):
+            return 0
+        with open(path) as f:
+            return len(f.readlines())
+
+    def test_alive_from_cache(self):
+        result = self.check_alive("100")
+        self.assertEqual(0, result.returncode)
+        self.assertEqual("RUNNING", result.stdout.decode().strip())
+
+    def test_one_squeue_per_interval(self):
+        for jid in ["100", "101", "100", "101"]:
+            self.assertEqual(0, self.check_alive(jid).returncode)
+        self.assertEqual(1, self.ncalls("squeue"))
+        self.assertEqual(0, self.ncalls("scontrol"))
+
+    def test_refreshes_old_cache(self):
+        self.check_alive("100")
+        self.set_jobs({"101": "RUNNING"})
+        self.assertEqual(0, self.check_alive("100").returncode)
+
+        # the job finished, but it's not checked again until the interval has passed
+        result = self.check_alive("100", interval=0)
+        self.assertEqual(2, self.ncalls("squeue"))
+        self.assertNotEqual(0, result.returncode)
+
+    def test_unknown_job_falls_back_to_scontrol(self):
+        result = self.check_alive("200")
+        self.assertNotEqual(0, result.returncode)
+        self.assertEqual(1, self.ncalls("scontrol"))
+
+    def test_failed_squeue_doesnt_replace_cache(self):
+        self.check_alive("100")
+        result = self.check_alive("100", interval=0, FAKE_SQUEUE_FAIL="1")
+        self.assertEqual(0, result.returncode)
+        self.assertEqual(2, self.ncalls("squeue"))
+        self.assertFalse(os.path.exists(self.cache + ".lock"))
+
+    def test_only_one_refresh_at_a_time(self):
+        self.check_alive("100")
+        os.makedirs(self.cache + ".lock")
+        # another check is refreshing the cache, so use the current one
+        self.assertEqual(0, self.check_alive("100", interval=0).returncode)
+        self.assertEqual(1, self.ncalls("squeue"))
+
+    def test_provider_uses_check_alive(self):
+        provider = CromwellConfiguration.Backend.Provider.slurm(
+            jobqueues=None, jobemail=None
+        )
+        self.assertIn("squeue", provider.config.check_alive)
+
+        provider = CromwellConfiguration.Backend.Provider.slurm(
+            jobqueues=None, jobemail=None, check_alive_interval=None
+        )
+        self.assertEqual("scontrol show job ${job_id}", provider.config.check_alive)
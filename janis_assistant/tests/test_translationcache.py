@@ -0,0 +1,208 @@
+import os
+import unittest
+from functools import partial
+from tempfile import TemporaryDirectory
+
+from janis_assistant.management.translationcache import (
+    TranslationCache,
+    ToolFingerprint,
+    UnfingerprintableError,
+)
+
+
+class MockNode:
+    def __init__(self, identifier, tool=None):
+        self.identifier = identifier
+        self.tool = tool
+        self.connections = []
+
+
+class MockTool:
+    def __init__(self, identifier, steps=None):
+        self.identifier = identifier
+        self.nodes = {s.identifier: s for s in steps or []}
+
+    def id(self):
+        return self.identifier
+
+    def versioned_id(self):
+        return self.identifier + "/v1"
+
+
+class MockTranslator:
+    name = "mock"
+
+    def __init__(self):
+        self.translated = 0
+
+    @staticmethod
+    def workflow_filename(tool):
+        return tool.id() + ".mock"
+
+    @staticmethod
+    def inputs_filename(tool):
+        return tool.id() + "-inp.json"
+
+    @staticmethod
+    def resources_filename(tool):
+        return tool.id() + "-resources.json"
+
+    @staticmethod
+    def build_inputs_file(tool, additional_inputs=None, **kwargs):
+        return additional_inputs or {}
+
+    @staticmethod
+    def stringify_translated_inputs(inputs):
+        return str(sorted(inputs.items()))
+
+    def translate(
+        self,
+        tool,
+        export_path,
+        write_inputs_file=True,
+        additional_inputs=None,
+        **kwargs,
+    ):
+        self.translated += 1
+        os.makedirs(os.path.join(export_path, "tools"), exist_ok=True)
+        with open(os.path.join(export_path, self.workflow_filename(tool)), "w+") as f:
+            f.write(f"workflow {tool.id()} {kwargs.get('hints')}")
+        with open(os.path.join(export_path, "tools", "tool.mock"), "w+") as f:
+            f.write("tool")
+        if write_inputs_file:
+            inputs = self.build_inputs_file(tool, additional_inputs)
+            path = os.path.join(export_path, self.inputs_filename(tool))
+            with open(path, "w+") as f:
+                f.write(self.stringify_translated_inputs(inputs))
+
+
+def scale(value, factor=1):
+    return value * factor
+
+
+def get_scaler(factor):
+    return lambda value: value * factor
+
+
+def get_workflow(tool_id="tool"):
+    first, second = MockNode("first", MockTool(tool_id)), MockNode("second")
+    # the graph of a workflow has cycles
+    first.connections.append(second)
+    second.connections.append(first)
+    return MockTool("wf", [first, second])
+
+
+class TestToolFingerprint(unittest.TestCase):
+    def test_same_definition(self):
+        self.assertEqual(
+            ToolFingerprint.of(get_workflow()), ToolFingerprint.of(get_workflow())
+        )
+
+    def test_different_definition(self):
+        self.assertNotEqual(
+            ToolFingerprint.of(get_workflow()), ToolFingerprint.of(get_workflow("t2"))
+        )
+
+    def test_sets_are_ordered(self):
+        self.assertEqual(
+            ToolFingerprint.of({"a", "b", "c", "d"}),
+            ToolFingerprint.of({"d", "c", "b", "a"}),
+        )
+
+    def test_deep_graph(self):
+        nodes = [MockNode(str(i)) for i in range(5000)]
+        for a, b in zip(nodes, nodes[1:]):
+            a.connections.append(b)
+        ToolFingerprint.of(MockTool("wf", nodes[:1]))
+
+    def test_partial_arguments(self):
+        self.assertNotEqual(
+            ToolFingerprint.of(partial(scale, factor=2)),
+            ToolFingerprint.of(partial(scale, factor=3)),
+        )
+        self.assertNotEqual(
+            ToolFingerprint.of(partial(scale, 2)), ToolFingerprint.of(partial(scale, 3))
+        )
+
+    def test_closures(self):
+        self.assertNotEqual(
+            ToolFingerprint.of(get_scaler(2)), ToolFingerprint.of(get_scaler(3))
+        )
+        self.assertEqual(
+            ToolFingerprint.of(get_scaler(2)), ToolFingerprint.of(get_scaler(2))
+        )
+
+    def test_defaults(self):
+        def scale2(value, factor=2):
+            return value * factor
+
+        scale3 = lambda value, factor=3: value * factor
+        scale3.__qualname__ = scale2.__qualname__
+        self.assertNotEqual(ToolFingerprint.of(scale2), ToolFingerprint.of(scale3))
+
+    def test_unfingerprintable(self):
+        with self.assertRaises(UnfingerprintableError):
+            ToolFingerprint.of({"lock": object()})
+
+
+class TestTranslationCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.cache = TranslationCache(os.path.join(self.directory.name, "cache"))
+        self.translator = MockTranslator()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def translate(self, export_dir, tool=None, inputs=None, hints=None):
+        path = os.path.join(self.directory.name, export_dir)
+        self.cache.translate(
+            self.translator,
+            tool or get_workflow(),
+            export_path=path,
+            additional_inputs=inputs,
+            hints=hints,
+        )
+        return path
+
+    def test_reuses_translation(self):
+        first = self.translate("first", inputs={"sample": "a"})
+        second = self.translate("second", inputs={"sample": "b"})
+
+        self.assertEqual(1, self.translator.translated)
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+        with open(os.path.join(first, "wf.mock")) as f1:
+            with open(os.path.join(second, "wf.mock")) as f2:
+                self.assertEqual(f1.read(), f2.read())
+        self.assertTrue(os.path.exists(os.path.join(second, "tools", "tool.mock")))
+
+        # the inputs are specific to each submission
+        with open(os.path.join(second, "wf-inp.json")) as f:
+            self.assertEqual("[('sample', 'b')]", f.read())
+
+    def test_options_change_key(self):
+        self.translate("first", hints={"captureType": "exome"})
+        self.translate("second", hints={"captureType": "targeted"})
+        self.assertEqual(2, self.translator.translated)
+        self.assertEqual(0, self.cache.hits)
+
+    def test_definition_changes_key(self):
+        self.translate("first")
+        self.translate("second", tool=get_workflow("another_tool"))
+        self.assertEqual(2, self.translator.translated)
+
+    def test_doesnt_cache_inputs(self):
+        self.translate("first", inputs={"sample": "a"})
+        (entry,) = os.listdir(self.cache.cache_location)
+        files = os.listdir(os.path.join(self.cache.cache_location, entry))
+        self.assertSetEqual({"wf.mock", "tools"}, set(files))
+
+    def test_unfingerprintable_isnt_cached(self):
+        tool = get_workflow()
+        tool.nodes["first"].lock = object()
+        self.translate("first", tool=tool)
+        second = self.translate("second", tool=tool)
+        self.assertEqual(2, self.translator.translated)
+        self.assertEqual(0, self.cache.hits)
+        self.assertTrue(os.path.exists(os.path.join(second, "wf.mock")))
+        self.assertFalse(os.path.exists(self.cache.cache_location))
@@ -1,6 +1,9 @@
+from datetime import datetime, timedelta, timezone
 from unittest import TestCase
 from os.path import join as ospathjoin
 
+from dateutil import parser, tz
+
 from janis_assistant.data.models.base import (
     _prepare_for_serialization,
     prep_object_for_db,
@@ -14,6 +17,7 @@ from janis_assistant.utils import (
     recursively_join,
     fully_qualify_filename,
 )
+from janis_assistant.utils.dateutils import DateUtil
 
 
 class TestGetExtension(TestCase):
@@ -327,3 +331,55 @@ class TestPrepareForSerialization(TestCase):
             {"string": "hi", "int": 1, "float": 1.0, "bool": True}, encode=True
         )
         self.assertEqual('{"string": "hi", "int": 1, "float": 1.0, "bool": true}', val)
+
+
+class TestDateUtil(TestCase):
+    def test_matches_dateutil(self):
+        for d in [
+            "2020-10-01T02:03:04.567Z",
+            "2020-10-01T02:03:04Z",
+            "2020-10-01T02:03:04.567+10:00",
+            "2020-10-01 02:03:04.567891+00:00",
+            str(DateUtil.now()),
+            "2020-10-01",
+            "October 1 2020 2:03am UTC",
+        ]:
+            self.assertEqual(
+                parser.parse(d).astimezone(tz.UTC), DateUtil.parse_iso(d), d
+            )
+
+    def test_is_utc(self):
+        parsed = DateUtil.parse_iso("2020-10-01T12:00:00+10:00")
+        self.assertEqual(timedelta(0), parsed.utcoffset())
+        self.assertEqual(2, parsed.hour)
+
+    def test_invalid(self):
+        self.assertIsNone(DateUtil.parse_iso("not a date"))
+        self.assertIsNone(DateUtil.parse_iso(None))
+        self.assertIsNone(DateUtil.parse_iso(""))
+
+    def test_memoised(self):
+        d = "2020-10-01T02:03:04.567Z"
+        self.assertIs(DateUtil.parse_iso(d), DateUtil.parse_iso(d))
+
+    def test_epoch_micros_roundtrip(self):
+        now = DateUtil.now()
+        micros = DateUtil.to_epoch_micros(now)
+        self.assertIsInstance(micros, int)
+        self.assertEqual(now, DateUtil.from_epoch_micros(micros))
+        self.assertEqual(now, DateUtil.parse_iso(micros))
+        # a column with TEXT affinity returns the digits as a string
+        self.assertEqual(now, DateUtil.parse_iso(str(micros)))
+
+    def test_epoch_micros_of_other_timezone(self):
+        d = datetime(2020, 10, 1, 12, tzinfo=timezone(timedelta(hours=10)))
+        self.assertEqual(
+            DateUtil.to_epoch_micros(datetime(2020, 10, 1, 2, tzinfo=timezone.utc)),
+            DateUtil.to_epoch_micros(d),
+        )
+
+    def test_datetime_is_stored_as_epoch_micros(self):
+        now = DateUtil.now()
+        self.assertEqual(
+            DateUtil.to_epoch_micros(now), prep_object_for_db(now, encode=False)
+        )
@@ -0,0 +1,224 @@
+import os
+import unittest
+from sys import getsizeof
+from tempfile import TemporaryDirectory
+
+from janis_assistant.data.enums import TaskStatus
+from janis_assistant.data.models.run import RunModel
+from janis_assistant.data.models.workflowjob import RunJobModel
+from janis_assistant.management.workflowdbmanager import WorkflowDbManager
+from janis_assistant.utils.dateutils import DateUtil
+
+
+class TestWorkflowDbManagerConnections(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.db = WorkflowDbManager("sid", self.directory.name)
+        self.db.commit()
+        self.readers = []
+
+    def tearDown(self):
+        for reader in self.readers:
+            reader.close()
+        self.db.close()
+        self.directory.cleanup()
+
+    def get_reader(self):
+        reader = WorkflowDbManager("sid", self.directory.name, readonly=True)
+        self.readers.append(reader)
+        return reader
+
+    def get_statuses(self, db: WorkflowDbManager):
+        return [e.status for e in db.runevents.get(allow_operational_errors=False)]
+
+    def test_wal_mode(self):
+        (mode,) = self.db.connection.execute("PRAGMA journal_mode").fetchone()
+        self.assertEqual("wal", mode)
+        self.assertTrue(os.path.exists(self.db.get_sql_path() + "-wal"))
+
+    def test_batch_is_one_transaction(self):
+        reader = self.get_reader()
+        with self.db.batch_writes():
+            self.db.runevents.update("run", TaskStatus.QUEUED)
+            self.db.commit()
+            self.db.runevents.update("run", TaskStatus.RUNNING)
+            self.db.commit()
+            self.assertListEqual([], self.get_statuses(reader))
+
+        self.assertListEqual(
+            [TaskStatus.QUEUED, TaskStatus.RUNNING], self.get_statuses(reader)
+        )
+
+    def test_nested_batches(self):
+        reader = self.get_reader()
+        with self.db.batch_writes():
+            with self.db.batch_writes():
+                self.db.runevents.update("run", TaskStatus.QUEUED)
+            self.assertListEqual([], self.get_statuses(reader))
+        self.assertListEqual([TaskStatus.QUEUED], self.get_statuses(reader))
+
+    def test_reader_isnt_blocked_by_writer(self):
+        self.db.runevents.update("run", TaskStatus.QUEUED)
+        self.db.commit()
+
+        reader = self.get_reader()
+        # an uncommitted write holds the write lock
+        self.db.runevents.update("run", TaskStatus.RUNNING)
+        self.assertListEqual([TaskStatus.QUEUED], self.get_statuses(reader))
+        self.db.commit()
+        self.assertListEqual(
+            [TaskStatus.QUEUED, TaskStatus.RUNNING], self.get_statuses(reader)
+        )
+
+    def test_forced_commit_inside_batch(self):
+        reader = self.get_reader()
+        with self.db.batch_writes():
+            self.db.runevents.update("run", TaskStatus.FAILED)
+            self.db.commit(force=True)
+            self.assertListEqual([TaskStatus.FAILED], self.get_statuses(reader))
+
+    def test_close_inside_batch(self):
+        # like suspend_workflow, from a callback of the monitor
+        with self.db.batch_writes():
+            self.db.runevents.update("run", TaskStatus.SUSPENDED)
+            self.db.commit()
+            self.db.close()
+
+        self.db = WorkflowDbManager("sid", self.directory.name)
+        statuses = self.get_statuses(self.get_reader())
+        self.assertListEqual([TaskStatus.SUSPENDED], statuses)
+
+    def test_unchanged_metadata_keeps_version(self):
+        def get_metadata(status):
+            job = RunJobModel(
+                id_="job",
+                submission_id="sid",
+                run_id="run",
+                parent=None,
+                name="job",
+                status=status,
+            )
+            return RunModel(
+                id_="run",
+                submission_id="sid",
+                engine_id="eid",
+                status=TaskStatus.RUNNING,
+                execution_dir=None,
+                name="wf",
+                jobs=[job],
+            )
+
+        self.db.save_metadata(get_metadata(TaskStatus.RUNNING))
+        version = self.get_reader().submission_metadata.get_uncached_version()
+        self.db.save_metadata(get_metadata(TaskStatus.RUNNING))
+        reader = self.get_reader()
+        self.assertEqual(version, reader.submission_metadata.get_uncached_version())
+
+        self.db.save_metadata(get_metadata(TaskStatus.COMPLETED))
+        self.assertNotEqual(version, reader.submission_metadata.get_uncached_version())
+
+    def test_read_snapshot(self):
+        self.db.runevents.update("run", TaskStatus.QUEUED)
+        self.db.commit()
+
+        reader = self.get_reader()
+        with reader.read_snapshot():
+            self.assertListEqual([TaskStatus.QUEUED], self.get_statuses(reader))
+            self.db.runevents.update("run", TaskStatus.RUNNING)
+            self.db.commit()
+            self.assertListEqual([TaskStatus.QUEUED], self.get_statuses(reader))
+
+        self.assertEqual(2, len(self.get_statuses(reader)))
+
+
+class TestDatetimeMigration(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_text_datetimes_are_converted(self):
+        db = WorkflowDbManager("sid", self.directory.name)
+        start = DateUtil.parse_iso("2020-10-01T02:03:04.567Z")
+        job = RunJobModel(
+            id_="job",
+            submission_id="sid",
+            run_id="run",
+            parent=None,
+            name="job",
+            status=TaskStatus.RUNNING,
+        )
+        db.jobsDB.insert_or_update_many([job])
+        # how an older version of janis stored it
+        db.connection.execute("UPDATE jobs SET start = ?", (str(start),))
+        db.connection.execute(
+            "UPDATE schema_versions SET version = 2 WHERE tablename = 'jobs'"
+        )
+        db.commit()
+        db.close()
+
+        db = WorkflowDbManager("sid", self.directory.name)
+        (value,) = db.connection.execute("SELECT start FROM jobs").fetchone()
+        self.assertEqual(DateUtil.to_epoch_micros(start), value)
+        (job,) = db.jobsDB.get()
+        self.assertEqual(start, job.start)
+        db.close()
+
+    def test_duplicate_jobs_are_kept(self):
+        db = WorkflowDbManager("sid", self.directory.name)
+        job = RunJobModel(
+            id_="job",
+            submission_id="sid",
+            run_id="run",
+            parent=None,
+            name="job",
+            status=TaskStatus.RUNNING,
+        )
+        db.jobsDB.insert_or_update_many([job])
+        # older versions of janis could insert the same job twice
+        db.connection.execute("DROP INDEX jobs_submission_id_id_run_id_idx")
+        db.connection.execute("INSERT INTO jobs SELECT * FROM jobs")
+        db.connection.execute(
+            "UPDATE schema_versions SET version = 1 WHERE tablename = 'jobs'"
+        )
+        db.commit()
+        db.close()
+
+        db = WorkflowDbManager("sid", self.directory.name)
+        (count,) = db.connection.execute("SELECT COUNT(*) FROM jobs").fetchone()
+        self.assertEqual(2, count)
+        indexes = [
+            r[1] for r in db.connection.execute("PRAGMA index_list(jobs)").fetchall()
+        ]
+        self.assertIn("jobs_submission_id_id_run_id_idx", indexes)
+        db.close()
+
+
+class TestJobSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_snapshots_size_includes_rows(self):
+        db = WorkflowDbManager("sid", self.directory.name)
+        jobs = [
+            RunJobModel(
+                id_=f"job{i}",
+                submission_id="sid",
+                run_id="run",
+                parent=None,
+                name=f"job{i}",
+                status=TaskStatus.RUNNING,
+            )
+            for i in range(100)
+        ]
+        db.jobsDB.insert_or_update_many(jobs)
+        snapshots = db.jobsDB._snapshots
+        row = getsizeof(next(iter(snapshots.values())))
+        self.assertGreater(
+            db.jobsDB.estimate_snapshots_size(), getsizeof(snapshots) + 100 * row
+        )
+        db.close()
@@ -0,0 +1,169 @@
+import pickle
+import sqlite3
+import unittest
+
+from janis_assistant.data.enums import TaskStatus
+from janis_assistant.data.models.base import decode_value, encode_value
+from janis_assistant.data.models.run import RunModel
+from janis_assistant.data.providers.workflowmetadataprovider import (
+    SubmissionMetadataDbProvider,
+)
+from janis_assistant.utils.dateutils import DateUtil
+
+
+class TestSubmissionMetadataVersion(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.provider = SubmissionMetadataDbProvider(
+            self.connection,
+            readonly=False,
+            submission_id="abc",
+            run_id=RunModel.DEFAULT_ID,
+        )
+
+    def tearDown(self):
+        self.connection.close()
+
+    def save(self, **kwargs):
+        for k, v in kwargs.items():
+            setattr(self.provider.metadata, k, v)
+        self.provider.save_changes()
+
+    def test_version_changes_with_status(self):
+        self.save(status=TaskStatus.QUEUED)
+        version = self.provider.get_uncached_version()
+        self.assertEqual(version, self.provider.get_uncached_version())
+
+        self.save(status=TaskStatus.RUNNING)
+        self.assertNotEqual(version, self.provider.get_uncached_version())
+
+    def test_version_changes_with_last_updated(self):
+        self.save(status=TaskStatus.RUNNING, last_updated=DateUtil.now())
+        version = self.provider.get_uncached_version()
+
+        self.save(name="unrelated")
+        self.assertEqual(version, self.provider.get_uncached_version())
+
+        self.save(last_updated=DateUtil.now())
+        self.assertNotEqual(version, self.provider.get_uncached_version())
+
+
+class TestSubmissionMetadataStorage(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.provider = self.get_provider()
+
+    def tearDown(self):
+        self.connection.close()
+
+    def save(self, **kwargs):
+        for k, v in kwargs.items():
+            setattr(self.provider.metadata, k, v)
+        self.provider.save_changes()
+
+    def get_provider(self, readonly=False):
+        return SubmissionMetadataDbProvider(
+            self.connection,
+            readonly=readonly,
+            submission_id="abc",
+            run_id=RunModel.DEFAULT_ID,
+        )
+
+    def test_typed_fields_are_columns(self):
+        self.save(status=TaskStatus.RUNNING, name="workflow", error="failed")
+        row = self.connection.execute(
+            "SELECT name, status, error FROM submission_state WHERE submission_id = ?",
+            ("abc",),
+        ).fetchone()
+        self.assertTupleEqual(("workflow", "running", "failed"), row)
+
+        rows = self.connection.execute("SELECT id FROM submission_metadata")
+        keys = [r[0] for r in rows]
+        self.assertNotIn("status", keys)
+
+    def test_roundtrip(self):
+        now = DateUtil.now()
+        self.save(
+            status=TaskStatus.RUNNING,
+            last_updated=now,
+            batch_children={"child": "/path"},
+            engine=("not", "plain"),
+        )
+        metadata = self.get_provider().metadata
+        self.assertEqual(TaskStatus.RUNNING, metadata.status)
+        self.assertEqual(now, metadata.last_updated)
+        self.assertDictEqual({"child": "/path"}, metadata.batch_children)
+        self.assertTupleEqual(("not", "plain"), metadata.engine)
+        self.assertEqual(TaskStatus.RUNNING, self.provider.get_uncached_status())
+
+    def test_large_fields_are_decoded_lazily(self):
+        self.save(engine={"large": "object"}, status=TaskStatus.QUEUED)
+        metadata = self.get_provider().metadata
+        self.assertNotIn("engine", metadata.__dict__)
+
+        engine = metadata.engine
+        self.assertDictEqual({"large": "object"}, engine)
+        self.assertIs(engine, metadata.engine)
+
+    def test_update_keeps_unchanged_decoded_fields(self):
+        self.save(engine=["engine"])
+        provider = self.get_provider()
+        engine = provider.metadata.engine
+
+        self.save(status=TaskStatus.RUNNING)
+        provider.update()
+        self.assertEqual(TaskStatus.RUNNING, provider.metadata.status)
+        self.assertIs(engine, provider.metadata.engine)
+
+        self.save(engine=["new engine"])
+        provider.update()
+        self.assertListEqual(["new engine"], provider.metadata.engine)
+
+    def test_undecoded_fields_are_saved(self):
+        self.save(engine=["engine"])
+        provider = self.get_provider()
+        provider.save()
+        self.assertListEqual(["engine"], self.get_provider().metadata.engine)
+
+    def test_migrates_pickled_rows(self):
+        self.connection.execute("DROP TABLE submission_state")
+        self.connection.execute("DROP TABLE schema_versions")
+        rows = {"status": TaskStatus.FAILED, "name": "old", "engine_id": "e1"}
+        for k, v in rows.items():
+            self.connection.execute(
+                "REPLACE INTO submission_metadata (id, submission_id, run_id, value) "
+                "VALUES (?, ?, ?, ?)",
+                (k, "abc", RunModel.DEFAULT_ID, pickle.dumps(v, protocol=2)),
+            )
+
+        # a readonly connection can still read the older rows
+        readonly = self.get_provider(readonly=True)
+        self.assertEqual(TaskStatus.FAILED, readonly.metadata.status)
+
+        metadata = self.get_provider().metadata
+        self.assertEqual(TaskStatus.FAILED, metadata.status)
+        self.assertEqual("old", metadata.name)
+        self.assertEqual("e1", metadata.engine_id)
+        (count,) = self.connection.execute(
+            "SELECT COUNT(*) FROM submission_metadata"
+        ).fetchone()
+        self.assertEqual(0, count)
+
+
+class TestValueEncoding(unittest.TestCase):
+    def test_plain_values_are_json(self):
+        value = {"a": [1, 2.5, "three", None, True]}
+        encoded = encode_value(value)
+        self.assertTrue(encoded.startswith(b"json1:"))
+        self.assertDictEqual(value, decode_value(encoded))
+
+    def test_objects_are_pickled(self):
+        value = (TaskStatus.RUNNING, DateUtil.now())
+        encoded = encode_value(value)
+        self.assertTrue(encoded.startswith(b"pickle1:"))
+        self.assertTupleEqual(value, decode_value(encoded))
+
+    def test_decodes_legacy_pickle(self):
+        self.assertEqual(
+            TaskStatus.RUNNING, decode_value(pickle.dumps(TaskStatus.RUNNING, 2))
+        )
@@ -12,7 +12,7 @@ from .pathhelper import (
     parse_dict,
     write_files_into_buffered_zip,
 )
-from .processlogger import ProcessLogger
+from .processlogger import ProcessLogger, BufferedLogSink
 
 
 def dict_to_yaml_string(d: dict):
@@ -1,12 +1,84 @@
 """
 This file contains information about Janis' BatchRun functionality
 """
-from typing import List
+from enum import Enum
+from typing import Dict, List, Optional, Union
 
 from janis_assistant.data.models.util import Serializable
 
 
+class BatchRunMode(Enum):
+    # a step (and set of outputs) for each value of the groupby field
+    unrolled = "unrolled"
+    # a single step, scattered over the (dot product of) batch fields
+    scatter = "scatter"
+
+
 class BatchRunRequirements(Serializable):
-    def __init__(self, fields: List[str], groupby: str):
+    def __init__(
+        self,
+        fields: List[str],
+        groupby: str,
+        mode: Union[BatchRunMode, str] = BatchRunMode.unrolled,
+        split: Optional[int] = None,
+    ):
+        """
+        :param fields: The inputs that have a value for each group
+        :param groupby: The (unique) field that names each group
+        :param mode: 'unrolled' for a step per group, or 'scatter' to scatter a single
+                step over the groups, which is much smaller for large batches.
+        :param split: Split the groups into this many submissions, each with their
+                own engine and task database (see split_batch_inputs)
+        """
         self.fields = fields
         self.groupby = groupby
+        self.mode = BatchRunMode(mode) if mode else BatchRunMode.unrolled
+        self.split = split
+
+
+def split_batch_inputs(
+    inputs: Dict, requirements: BatchRunRequirements, nsplits: int
+) -> List[Dict]:
+    """
+    Partition the groups of a batch run into (at most) nsplits contiguous chunks of
+    (nearly) equal size, and return the inputs for each chunk. Inputs that aren't
+    batch fields are the same for every chunk.
+    """
+    if requirements.groupby not in inputs:
+        raise Exception(
+            f"the group_by field '{requirements.groupby}' was not found in the inputs"
+        )
+    if nsplits < 1:
+        raise ValueError(f"Can't split a batch run into {nsplits} submissions")
+
+    fields = set(requirements.fields)
+    # the groupby field has a value for each group, even if it's not a batch field
+    fields.add(requirements.groupby)
+
+    ngroups = len(inputs[requirements.groupby])
+    invalid_fields = sorted(
+        f
+        for f in fields
+        if not isinstance(inputs.get(f), list) or len(inputs[f]) != ngroups
+    )
+    if invalid_fields:
+        raise ValueError(
+            f"Couldn't split the batch run as the fields ({', '.join(invalid_fields)}) "
+            f"don't have a value for each of the {ngroups} groups"
+        )
+
+    nsplits = min(nsplits, ngroups)
+    if nsplits == 0:
+        return []
+
+    size, remainder = divmod(ngroups, nsplits)
+    splits = []
+    start = 0
+    for idx in range(nsplits):
+        end = start + size + (1 if idx < remainder else 0)
+        splits.append(
+            {k: (v[start:end] if k in fields else v) for k, v in inputs.items()}
+        )
+        start = end
+
+    return splits
@@ -1,19 +1,63 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 
 from dateutil import parser, tz
 
+EPOCH = datetime(1970, 1, 1, tzinfo=tz.UTC)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+@lru_cache(maxsize=2**16)
+def _parse_iso_str(d: str):
+    """
+    The same (eg: Cromwell's start and end) timestamps are parsed over and over,
+    so they're memoised (datetimes are immutable, so they can be shared).
+    """
+    if len(d) > 8 and d.isdigit():
+        # epoch microseconds, from a column with TEXT affinity
+        return DateUtil.from_epoch_micros(int(d))
+    try:
+        # fast path, fromisoformat doesn't accept a 'Z' suffix before Python 3.11
+        dd = datetime.fromisoformat(d[:-1] + "+00:00" if d[-1] in "Zz" else d)
+    except ValueError:
+        try:
+            dd = parser.parse(d)
+        except Exception:
+            return None
+    return dd.astimezone(tz.UTC)
+
 
 class DateUtil:
     @staticmethod
     def parse_iso(d):
+        """
+        Parse an ISO 8601 string (or the epoch microseconds of the database) to a
+        datetime in UTC
+        """
         if not d:
             return None
-        try:
-            dd = parser.parse(d)
-            return dd.astimezone(tz.UTC)
+        if isinstance(d, str):
+            return _parse_iso_str(d)
+        if isinstance(d, datetime):
+            return d.astimezone(tz.UTC)
+        if isinstance(d, (int, float)):
+            return DateUtil.from_epoch_micros(d)
+        return None
+
+    @staticmethod
+    def to_epoch_micros(d: datetime):
+        """
+        How datetimes are stored in the database, a naive datetime is local time
+        """
+        if d is None:
+            return None
+        return (d.astimezone(tz.UTC) - EPOCH) // ONE_MICROSECOND
 
-        except Exception as e:
+    @staticmethod
+    def from_epoch_micros(micros):
+        if micros is None:
             return None
+        return EPOCH + timedelta(microseconds=int(micros))
 
     @staticmethod
     def as_utc(d):
@@ -0,0 +1,191 @@
+"""
+Copying files on the local filesystem, using the cheapest method the filesystems support:
+
+    hardlink → reflink (FICLONE) → copy_file_range → sendfile → buffered copy
+
+If a method isn't supported between two devices (eg: hardlinking across
+filesystems, or reflinking on ext4), we remember that for the pair of devices
+so we don't try (and fail) again for every file. Errors that can be specific
+to a file (eg: EPERM) only fall back for that file.
+"""
+
+import errno
+import os
+import shutil
+import threading
+from enum import Enum
+from typing import Dict, Set, Tuple, Optional, List
+
+from janis_core.utils.logger import Logger
+
+
+class CopyStrategy(Enum):
+    hardlink = "hardlink"
+    reflink = "reflink"
+    copy_file_range = "copy_file_range"
+    sendfile = "sendfile"
+    buffered = "buffered"
+
+    def __str__(self):
+        return self.value
+
+
+DEFAULT_COPY_STRATEGIES = [
+    CopyStrategy.hardlink,
+    CopyStrategy.reflink,
+    CopyStrategy.copy_file_range,
+    CopyStrategy.sendfile,
+    CopyStrategy.buffered,
+]
+
+# from <linux/fs.h>: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# errors that mean "this method doesn't work between these filesystems",
+# so we don't try it again for this pair of devices
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.ENOSYS,
+}
+
+# errors where we fall back to the next method, but only for this file
+# (eg: EPERM from hardlinking a file we don't own, EMLINK from too many links)
+_FALLBACK_ERRNOS = {
+    errno.EINVAL,
+    errno.EPERM,
+    errno.ENOTTY,
+    errno.EMLINK,
+    errno.ENOTSOCK,
+}
+
+_unsupported_lock = threading.Lock()
+_unsupported: Dict[Tuple[int, int], Set[CopyStrategy]] = {}
+
+
+class CopyStrategyUnsupported(Exception):
+    pass
+
+
+def _device_pair(source: str, dest: str) -> Tuple[int, int]:
+    return os.stat(source).st_dev, os.stat(os.path.dirname(dest) or ".").st_dev
+
+
+def _is_unsupported(devices, strategy: CopyStrategy) -> bool:
+    with _unsupported_lock:
+        return strategy in _unsupported.get(devices, set())
+
+
+def _mark_unsupported(devices, strategy: CopyStrategy):
+    with _unsupported_lock:
+        _unsupported.setdefault(devices, set()).add(strategy)
+
+
+def clear_copy_strategy_cache():
+    with _unsupported_lock:
+        _unsupported.clear()
+
+
+def _hardlink(source: str, dest: str):
+    os.link(source, dest)
+
+
+def _reflink(source: str, dest: str):
+    import fcntl
+
+    with open(source, "rb") as src, open(dest, "xb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copymode(source, dest)
+
+
+def _copy_file_range(source: str, dest: str):
+    if not hasattr(os, "copy_file_range"):
+        raise CopyStrategyUnsupported()
+    with open(source, "rb") as src, open(dest, "xb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    shutil.copymode(source, dest)
+
+
+def _sendfile(source: str, dest: str):
+    if not hasattr(os, "sendfile"):
+        raise CopyStrategyUnsupported()
+    with open(source, "rb") as src, open(dest, "xb") as dst:
+        size = os.fstat(src.fileno()).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    shutil.copymode(source, dest)
+
+
+def _buffered(source: str, dest: str):
+    # not shutil.copyfile, which would overwrite dest
+    with open(source, "rb") as src, open(dest, "xb") as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    shutil.copymode(source, dest)
+
+
+_COPY_FUNCTIONS = {
+    CopyStrategy.hardlink: _hardlink,
+    CopyStrategy.reflink: _reflink,
+    CopyStrategy.copy_file_range: _copy_file_range,
+    CopyStrategy.sendfile: _sendfile,
+    CopyStrategy.buffered: _buffered,
+}
+
+
+def copy_file(
+    source: str, dest: str, strategies: Optional[List[CopyStrategy]] = None
+) -> CopyStrategy:
+    """
+    Copy a single file (dest must not exist) with the first strategy that works.
+
+    :param strategies: The strategies to try (in order), defaults to DEFAULT_COPY_STRATEGIES
+    :return: The strategy that was used
+    """
+    strategies = strategies or DEFAULT_COPY_STRATEGIES
+    # every strategy creates dest exclusively, but check first so we never try (and
+    # clean up after) a strategy when dest already exists
+    if os.path.lexists(dest):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dest)
+    devices = _device_pair(source, dest)
+
+    for strategy in strategies:
+        if _is_unsupported(devices, strategy):
+            continue
+        try:
+            _COPY_FUNCTIONS[strategy](source, dest)
+            Logger.log(f"Copied ({strategy}) {source} → {dest}")
+            return strategy
+        except CopyStrategyUnsupported:
+            _mark_unsupported(devices, strategy)
+        except FileExistsError:
+            raise
+        except OSError as e:
+            # we've always fallen back to copying if we couldn't link for any reason
+            unsupported = e.errno in _UNSUPPORTED_ERRNOS
+            if (
+                strategy != CopyStrategy.hardlink
+                and not unsupported
+                and e.errno not in _FALLBACK_ERRNOS
+            ):
+                raise
+            Logger.debug(f"Couldn't {strategy} {source} → {dest}: {e}")
+            if unsupported:
+                _mark_unsupported(devices, strategy)
+
+        # clean up a partial copy before trying the next strategy
+        if strategy != CopyStrategy.hardlink and os.path.lexists(dest):
+            os.remove(dest)
+
+    raise Exception(
+        f"Couldn't copy {source} → {dest} with any of: {', '.join(map(str, strategies))}"
+    )
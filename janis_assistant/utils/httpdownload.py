@@ -0,0 +1,413 @@
+"""
+Downloading files over HTTP(S), for the HTTPFileScheme.
+
+- One HEAD request (cached for a short time) answers exists, size and last-modified.
+- Files are downloaded to '<dest>.partial', and only moved to dest once they match
+  the Content-Length (and the MD5, if the server gives us one).
+- If the server accepts ranges, large files are downloaded as parallel ranges, and
+  an interrupted download resumes from where each range got to (kept in
+  '<dest>.partial.json'), as long as the ETag / Last-Modified hasn't changed.
+"""
+
+import base64
+import binascii
+import hashlib
+import http.client
+import json
+import os
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, List, Tuple
+from urllib import request, error
+
+from janis_core.utils.logger import Logger
+
+TIMEOUT_SECONDS = 60
+# how long a HEAD result is reused for (eg: between exists, last_modified and cp_from)
+HEAD_CACHE_SECONDS = 60
+# files smaller than this are downloaded with one connection
+PARALLEL_DOWNLOAD_THRESHOLD = 64 * 1024 * 1024
+MIN_RANGE_SIZE = 16 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+# how often (in bytes per range) the progress of a download is saved
+SAVE_PROGRESS_BYTES = 16 * 1024 * 1024
+MAX_RETRIES = 3
+RETRY_DELAY_SECONDS = 1
+REPORT_PROGRESS_SECONDS = 1
+
+
+class DownloadValidationError(Exception):
+    pass
+
+
+class HeadResult:
+    def __init__(self, url: str, status: Optional[int], headers=None):
+        self.url = url
+        self.status = status
+        self.headers = headers
+
+    def get_header(self, name: str) -> Optional[str]:
+        return self.headers.get(name) if self.headers is not None else None
+
+    @property
+    def exists(self) -> bool:
+        return self.status == 200
+
+    @property
+    def size(self) -> Optional[int]:
+        length = self.get_header("Content-Length")
+        try:
+            return int(length) if length is not None else None
+        except ValueError:
+            return None
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.get_header("Last-Modified")
+
+    @property
+    def etag(self) -> Optional[str]:
+        etag = self.get_header("ETag")
+        # a weak ETag can't be used to resume a range
+        if not etag or etag.startswith("W/"):
+            return None
+        return etag
+
+    @property
+    def validator(self) -> Optional[str]:
+        """
+        Used as the If-Range header, so a range is only returned if the file is the
+        same one we started downloading
+        """
+        return self.etag or self.last_modified
+
+    @property
+    def accepts_ranges(self) -> bool:
+        accept_ranges = self.get_header("Accept-Ranges") or ""
+        return "bytes" in accept_ranges.lower() and bool(self.size)
+
+    @property
+    def md5(self) -> Optional[str]:
+        """
+        The (hex) MD5 from a Content-MD5 or x-goog-hash header, or the ETag of a
+        (single part, and not KMS or customer key encrypted) S3 object
+        """
+        hashes = [self.get_header("Content-MD5")]
+        goog_hashes = self.headers.get_all("x-goog-hash") if self.headers else None
+        for goog_hash in goog_hashes or []:
+            hashes.extend(
+                h.strip()[4:]
+                for h in goog_hash.split(",")
+                if h.strip().startswith("md5=")
+            )
+        for h in hashes:
+            if not h:
+                continue
+            try:
+                return base64.b64decode(h).hex()
+            except (binascii.Error, ValueError):
+                continue
+
+        # the ETag of an object encrypted with SSE-KMS or SSE-C isn't its MD5
+        encryption = self.get_header("x-amz-server-side-encryption") or ""
+        encrypted = encryption.lower().startswith("aws:kms") or self.get_header(
+            "x-amz-server-side-encryption-customer-algorithm"
+        )
+        if self.get_header("x-amz-request-id") and self.etag and not encrypted:
+            etag = self.etag.strip('"')
+            if re.fullmatch("[0-9a-f]{32}", etag):
+                return etag
+        return None
+
+
+_head_lock = threading.Lock()
+_head_cache: Dict[str, Tuple[float, HeadResult]] = {}
+
+
+def head(url: str, use_cache=True) -> HeadResult:
+    if use_cache:
+        with _head_lock:
+            cached = _head_cache.get(url)
+        if cached and time.time() - cached[0] < HEAD_CACHE_SECONDS:
+            return cached[1]
+
+    try:
+        req = request.Request(url, method="HEAD")
+        with request.urlopen(req, timeout=TIMEOUT_SECONDS) as response:
+            result = HeadResult(url, response.getcode(), response.headers)
+    except error.HTTPError as e:
+        result = HeadResult(url, e.code, e.headers)
+    except Exception as e:
+        # don't remember connection errors
+        Logger.debug(f"Couldn't HEAD '{url}': {repr(e)}")
+        return HeadResult(url, None)
+
+    with _head_lock:
+        _head_cache[url] = (time.time(), result)
+    return result
+
+
+def clear_head_cache(url: Optional[str] = None):
+    with _head_lock:
+        if url is None:
+            _head_cache.clear()
+        else:
+            _head_cache.pop(url, None)
+
+
+def plan_ranges(size: int, connections: int) -> List[List[int]]:
+    """
+    :return: [[start, end (exclusive), bytes written]]
+    """
+    n = 1
+    if size >= PARALLEL_DOWNLOAD_THRESHOLD:
+        n = max(1, min(connections, size // MIN_RANGE_SIZE))
+    bounds = [size * i // n for i in range(n + 1)]
+    return [[bounds[i], bounds[i + 1], 0] for i in range(n)]
+
+
+class _DownloadProgress:
+    """
+    The progress of each range, shared between the threads. A range's progress is
+    only saved once its bytes have been flushed to the partial file.
+    """
+
+    def __init__(
+        self,
+        state_path: str,
+        state: dict,
+        report_progress: Optional[Callable[[float], None]],
+    ):
+        self.state_path = state_path
+        self.state = state
+        self.report_progress = report_progress
+        self.lock = threading.Lock()
+        self.received = sum(r[2] for r in state["ranges"])
+        self.last_report = 0
+
+    def received_bytes(self, nbytes: int):
+        if not self.report_progress:
+            return
+        with self.lock:
+            self.received += nbytes
+            if time.time() - self.last_report < REPORT_PROGRESS_SECONDS:
+                return
+            self.last_report = time.time()
+            self.report_progress(self.received / self.state["size"])
+
+    def flushed(self, rng: List[int], written: int):
+        with self.lock:
+            rng[2] = written
+            tmp = self.state_path + ".tmp"
+            with open(tmp, "w+") as f:
+                json.dump(self.state, f)
+            os.replace(tmp, self.state_path)
+
+
+def _is_retryable(e: Exception):
+    if isinstance(e, error.HTTPError):
+        return e.code >= 500
+    return isinstance(
+        e, (error.URLError, http.client.HTTPException, socket.timeout, OSError)
+    )
+
+
+def _download_range(
+    url: str,
+    partial: str,
+    rng: List[int],
+    validator: str,
+    progress: _DownloadProgress,
+    retries: int,
+):
+    start, end = rng[0], rng[1]
+    attempt = 0
+    while rng[2] < end - start:
+        written = rng[2]
+        headers = {"Range": f"bytes={start + written}-{end - 1}", "If-Range": validator}
+        req = request.Request(url, headers=headers)
+        try:
+            with request.urlopen(req, timeout=TIMEOUT_SECONDS) as response:
+                content_range = response.headers.get("Content-Range") or ""
+                if response.getcode() != 206 or not content_range.startswith(
+                    f"bytes {start + written}-"
+                ):
+                    raise DownloadValidationError(
+                        f"'{url}' changed while it was being downloaded"
+                    )
+                with open(partial, "r+b") as f:
+                    f.seek(start + written)
+                    unsaved = 0
+                    try:
+                        while written < end - start:
+                            remaining = end - start - written
+                            chunk = response.read(min(READ_SIZE, remaining))
+                            if not chunk:
+                                raise http.client.IncompleteRead(b"", remaining)
+                            f.write(chunk)
+                            written += len(chunk)
+                            unsaved += len(chunk)
+                            progress.received_bytes(len(chunk))
+                            if unsaved >= SAVE_PROGRESS_BYTES:
+                                f.flush()
+                                progress.flushed(rng, written)
+                                unsaved = 0
+                    finally:
+                        f.flush()
+                        progress.flushed(rng, written)
+        except Exception as e:
+            if not _is_retryable(e) or attempt >= retries:
+                raise
+            attempt += 1
+            Logger.warn(
+                f"Error downloading '{url}' (attempt {attempt} / {retries}), "
+                f"resuming from byte {start + rng[2]}: {repr(e)}"
+            )
+            time.sleep(RETRY_DELAY_SECONDS * attempt)
+
+
+def _download_whole(
+    url: str,
+    partial: str,
+    report_progress: Optional[Callable[[float], None]],
+    retries: int,
+):
+    """
+    For servers that don't support ranges (or don't tell us the size)
+    """
+    attempt = 0
+    while True:
+        try:
+            with request.urlopen(url, timeout=TIMEOUT_SECONDS) as response:
+                length = response.headers.get("Content-Length")
+                length = int(length) if length and length.isdigit() else None
+                written, last_report = 0, time.time()
+                with open(partial, "wb") as f:
+                    while True:
+                        chunk = response.read(READ_SIZE)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        written += len(chunk)
+                        if (
+                            report_progress
+                            and length
+                            and (time.time() - last_report >= REPORT_PROGRESS_SECONDS)
+                        ):
+                            last_report = time.time()
+                            report_progress(written / length)
+                if length is not None and written != length:
+                    raise http.client.IncompleteRead(b"", length - written)
+                return
+        except Exception as e:
+            if not _is_retryable(e) or attempt >= retries:
+                raise
+            attempt += 1
+            Logger.warn(
+                f"Error downloading '{url}' (attempt {attempt} / {retries}), "
+                f"restarting: {repr(e)}"
+            )
+            time.sleep(RETRY_DELAY_SECONDS * attempt)
+
+
+def _load_state(state_path: str) -> Optional[dict]:
+    try:
+        with open(state_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove(*paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _md5(path: str) -> str:
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_SIZE), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def download(
+    url: str,
+    dest: str,
+    connections: int = 4,
+    report_progress: Optional[Callable[[float], None]] = None,
+    retries: int = MAX_RETRIES,
+):
+    """
+    Download url to dest (see the module docstring)
+    :param connections: the most ranges of a large file to download at once
+    :param report_progress: called with the fraction (0 - 1) of the file downloaded
+    :param retries: how many times to retry (or resume) after a connection error
+    """
+    partial = dest + ".partial"
+    state_path = partial + ".json"
+
+    # the bytes of each range are checked against its Content-Range, and a whole
+    # download against its Content-Length
+    info = head(url)
+    size, validator = info.size, info.validator
+
+    if info.exists and info.accepts_ranges and validator:
+        state = _load_state(state_path)
+        if (
+            state
+            and os.path.exists(partial)
+            and state.get("url") == url
+            and state.get("size") == size
+            and state.get("validator") == validator
+        ):
+            done = sum(r[2] for r in state["ranges"])
+            Logger.info(f"Resuming download of '{url}' from {done} / {size} bytes")
+        else:
+            _remove(partial, state_path)
+            state = {
+                "url": url,
+                "size": size,
+                "validator": validator,
+                "ranges": plan_ranges(size, connections),
+            }
+
+        with open(partial, "ab"):
+            pass
+        os.truncate(partial, size)
+
+        progress = _DownloadProgress(state_path, state, report_progress)
+        pending = [r for r in state["ranges"] if r[2] < r[1] - r[0]]
+        Logger.debug(f"Downloading '{url}' ({size} bytes) in {len(pending)} ranges")
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(pending))) as executor:
+                futures = [
+                    executor.submit(
+                        _download_range, url, partial, r, validator, progress, retries
+                    )
+                    for r in pending
+                ]
+                for future in futures:
+                    future.result()
+        except DownloadValidationError:
+            _remove(partial, state_path)
+            clear_head_cache(url)
+            raise
+    else:
+        _remove(state_path)
+        _download_whole(url, partial, report_progress, retries)
+
+    md5 = info.md5
+    if md5 and _md5(partial) != md5:
+        _remove(partial, state_path)
+        clear_head_cache(url)
+        raise DownloadValidationError(f"The MD5 of '{url}' didn't match the download")
+
+    os.replace(partial, dest)
+    _remove(state_path)
+    if report_progress:
+        report_progress(1.0)
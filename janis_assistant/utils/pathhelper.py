@@ -1,7 +1,9 @@
 import os
+import sys
 import tempfile
 from inspect import isclass, isabstract
-from typing import List, Tuple, Optional
+from types import ModuleType
+from typing import Any, Dict, List, Tuple, Optional
 
 from janis_core import WorkflowBase, Workflow, CommandTool, Logger, CodeTool, Tool
 from path import Path
@@ -122,29 +124,72 @@ def get_janis_workflow_from_searchname(
     )
 
 
-def get_workflow_from_file(file, name, include_commandtools=False):
+# {path: (mtime, size, module)}, so loading the same file again (eg: translating
+# then running it) doesn't exec it again
+_module_cache: Dict[str, Tuple[int, int, ModuleType]] = {}
+# {(path, mtime, size, name, include_commandtools): token}, the token we selected
+# from a file, so we don't search it again
+_selected_token_cache: Dict[Tuple, str] = {}
+
+
+def load_module_from_file(file) -> ModuleType:
     # How to import a module given the full path
     # https://stackoverflow.com/questions/67631/how-to-import-a-module-given-the-full-path
     import importlib.util
 
-    try:
-        import sys
+    stat = os.stat(file)
+    cached = _module_cache.get(file)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
 
-        basefilename = os.path.basename(file)
+    # so the file can import its neighbours, but only add it once
+    dirname = os.path.dirname(file)
+    if dirname not in sys.path:
+        sys.path.append(dirname)
 
-        sys.path.append(os.path.dirname(file))
-        spec = importlib.util.spec_from_file_location("module.name", file)
-        foo = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(foo)
-        ptypes = get_janis_from_module_spec(
-            foo, include_commandtools=include_commandtools, name=name
-        )
+    spec = importlib.util.spec_from_file_location("module.name", file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    _module_cache[file] = (stat.st_mtime_ns, stat.st_size, module)
+    return module
+
+
+def get_workflow_from_file(file, name, include_commandtools=False):
+    file = os.path.abspath(file)
+
+    try:
+        module = load_module_from_file(file)
+        stat = os.stat(file)
+        key = (file, stat.st_mtime_ns, stat.st_size, name, include_commandtools)
+
+        token = _selected_token_cache.get(key)
+        if token is None or token not in module.__dict__:
+            ptypes = get_janis_from_module_spec(
+                module, include_commandtools=include_commandtools, name=name
+            )
+            token = select_janis_token(file, ptypes, name)
+            _selected_token_cache[key] = token
+
+        # only instantiate the tool we've selected
+        ptype = module.__dict__[token]
+        if isinstance(ptype, Tool) or not callable(ptype):
+            return ptype
+        return ptype()
 
     except Exception as e:
         raise Exception(
             f"Unrecognised python file when getting workflow / command tool: {file} :: {e}"
         )
 
+
+def select_janis_token(file, ptypes: List[Tuple[str, Any]], name: Optional[str]):
+    """
+    :param ptypes: [(token, tool class or instance)], see get_janis_from_module_spec
+    :return: the token of the tool to use from the file
+    """
+    basefilename = os.path.basename(file)
+
     # Per https://github.com/PMCC-BioinformaticsCore/janis-core/issues/31, we'll use the following process:
     # 	1. If a `name` is defined:
     # 	    - Force parse every token with a case-insensitive match
@@ -159,10 +204,10 @@ def get_workflow_from_file(file, name, include_commandtools=False):
     ptypes_casesensitive = [(k, v) for (k, v) in ptypes if k == name]
 
     if len(ptypes_casesensitive) == 1:
-        return ptypes_casesensitive[0][1]
+        return ptypes_casesensitive[0][0]
 
     if name is None:
-        mains = [v for (k, v) in ptypes if k == "__JANIS_ENTRYPOINT"]
+        mains = [k for (k, v) in ptypes if k == "__JANIS_ENTRYPOINT"]
         if len(mains) > 0:
             Logger.debug(
                 "Using workflow defined by '__JANIS_ENTRYPOINT' as no name was used"
@@ -178,7 +223,10 @@ def get_workflow_from_file(file, name, include_commandtools=False):
             else isinstance(t[1], WorkflowBase)
         )
     ]
-    detected_tokens = ", ".join(f"'{x[0]}' ({x[1].__class__.__name__})" for x in ptypes)
+    detected_tokens = ", ".join(
+        f"'{x[0]}' ({x[1].__name__ if isclass(x[1]) else x[1].__class__.__name__})"
+        for x in ptypes
+    )
 
     if len(wftypes) > 0:
         if len(wftypes) > 1:
@@ -193,7 +241,7 @@ def get_workflow_from_file(file, name, include_commandtools=False):
                 Logger.info(
                     f"Multiple workflows were found in '{basefilename}', using '{wftypes[-1][0]}'"
                 )
-        return wftypes[-1][1]
+        return wftypes[-1][0]
 
     if len(ptypes) == 0:
         raise Exception(
@@ -215,13 +263,15 @@ def get_workflow_from_file(file, name, include_commandtools=False):
                 f"Janis will use '{ptypes[-1][0]}' (the last defined)"
             )
 
-    return ptypes[-1][1]
+    return ptypes[-1][0]
 
 
 def get_janis_from_module_spec(spec, include_commandtools=False, name: str = None):
     """
-    Get all the Janis.Workflow's that are defined in the file (__module__ == 'module.name')
-    :return: List of all the subclasses of a workflow
+    Get all the Janis.Workflow's that are defined in the file (__module__ == 'module.name'),
+    these aren't instantiated (that can be slow), so they're classes unless the file
+    defines an instance.
+    :return: List of (token, class or instance)
     """
 
     if include_commandtools:
@@ -232,7 +282,7 @@ def get_janis_from_module_spec(spec, include_commandtools=False, name: str = Non
     for k, ptype in items:
         if name is not None:
             if name.lower() == k.lower():
-                potentials.append((k, ptype()))
+                potentials.append((k, ptype))
             continue
 
         if isinstance(ptype, WorkflowBase) or isinstance(ptype, CommandTool):
@@ -250,8 +300,8 @@ def get_janis_from_module_spec(spec, include_commandtools=False, name: str = Non
         if ptype == WorkflowBase or ptype == Workflow:
             continue
         if issubclass(ptype, WorkflowBase):
-            potentials.append((k, ptype()))
+            potentials.append((k, ptype))
         if include_commandtools and issubclass(ptype, (CommandTool, CodeTool)):
-            potentials.append((k, ptype()))
+            potentials.append((k, ptype))
 
     return potentials
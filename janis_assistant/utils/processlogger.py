@@ -1,13 +1,176 @@
+import atexit
 import threading
 import os
-from datetime import datetime
-from typing import IO
+from collections import deque
+from time import monotonic
+from typing import IO, Deque, List, Optional, Set
 
 from janis_core.utils.logger import Logger
 
 
+class BufferedLogSink:
+    """
+    Buffers the lines of an engine log in memory, and writes them to the log file
+    from a background thread (shared by every sink), so the thread reading the
+    engine's output never waits on the disk.
+
+    Lines are written when they're flush_interval seconds old, or as soon as
+    flush_lines are waiting. The file is only fsync'd by sync() / close(), ie:
+    when the engine reaches a terminal status, as syncing on a shared filesystem
+    is expensive.
+
+    If the disk can't keep up, at most max_buffered_lines are held (the oldest are
+    dropped, and we note how many in the log). The last recent_lines are always
+    kept in memory (see get_recent_lines), eg: to report why an engine failed.
+    """
+
+    FLUSH_INTERVAL_SECONDS = 2
+    FLUSH_LINES = 1000
+    MAX_BUFFERED_LINES = 100000
+    RECENT_LINES = 200
+
+    def __init__(
+        self,
+        logfp: IO,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        flush_lines: int = FLUSH_LINES,
+        max_buffered_lines: int = MAX_BUFFERED_LINES,
+        recent_lines: int = RECENT_LINES,
+    ):
+        self.logfp = logfp
+        self.flush_interval = flush_interval
+        self.flush_lines = flush_lines
+        self.max_buffered_lines = max_buffered_lines
+
+        self.dropped_lines = 0
+        self._pending: Deque[str] = deque()
+        self._recent: Deque[str] = deque(maxlen=recent_lines)
+        self._last_flush = monotonic()
+
+        # _lock guards the buffers (held briefly by the writer), _write_lock
+        # makes sure only one thread writes this sink to the file at a time
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+        LogSinkFlusher.register(self)
+
+    def write(self, line: str):
+        with self._lock:
+            if len(self._pending) >= self.max_buffered_lines:
+                self._pending.popleft()
+                self.dropped_lines += 1
+            self._pending.append(line)
+            self._recent.append(line)
+            is_full = len(self._pending) >= self.flush_lines
+
+        if is_full:
+            LogSinkFlusher.wake()
+
+    def get_recent_lines(self, n: Optional[int] = None) -> List[str]:
+        with self._lock:
+            lines = list(self._recent)
+        return lines[-n:] if n else lines
+
+    def is_due(self) -> bool:
+        return bool(self._pending) and (
+            len(self._pending) >= self.flush_lines
+            or monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush(self, fsync=False):
+        with self._write_lock:
+            with self._lock:
+                lines, self._pending = self._pending, deque()
+                dropped, self.dropped_lines = self.dropped_lines, 0
+            self._last_flush = monotonic()
+
+            if not self.logfp or self.logfp.closed:
+                return
+            if dropped:
+                self.logfp.write(
+                    f"[janis] {dropped} lines were dropped, as they couldn't be "
+                    f"written quickly enough\n"
+                )
+            if lines:
+                self.logfp.write("\n".join(lines) + "\n")
+            self.logfp.flush()
+            if fsync:
+                os.fsync(self.logfp.fileno())
+
+    def sync(self):
+        """
+        Write everything that's buffered, and fsync the file
+        """
+        self.flush(fsync=True)
+
+    def close(self):
+        LogSinkFlusher.unregister(self)
+        self.sync()
+
+
+class LogSinkFlusher(threading.Thread):
+    """
+    The (single, daemon) thread that writes every BufferedLogSink that's due.
+    """
+
+    CHECK_INTERVAL_SECONDS = 0.5
+
+    _lock = threading.Lock()
+    _instance: Optional["LogSinkFlusher"] = None
+    _sinks: Set[BufferedLogSink] = set()
+
+    def __init__(self):
+        threading.Thread.__init__(self, daemon=True, name="janis-log-flusher")
+        self._wake = threading.Event()
+
+    @classmethod
+    def register(cls, sink: BufferedLogSink):
+        with cls._lock:
+            cls._sinks.add(sink)
+            if cls._instance is None:
+                cls._instance = LogSinkFlusher()
+                cls._instance.start()
+                atexit.register(cls.flush_all)
+
+    @classmethod
+    def unregister(cls, sink: BufferedLogSink):
+        with cls._lock:
+            cls._sinks.discard(sink)
+
+    @classmethod
+    def wake(cls):
+        if cls._instance is not None:
+            cls._instance._wake.set()
+
+    @classmethod
+    def flush_all(cls, only_due=False):
+        with cls._lock:
+            sinks = list(cls._sinks)
+        for sink in sinks:
+            if only_due and not sink.is_due():
+                continue
+            try:
+                sink.flush()
+            except Exception as e:
+                Logger.debug(f"Couldn't write engine log to disk: {repr(e)}")
+
+    def run(self):
+        while True:
+            self._wake.wait(self.CHECK_INTERVAL_SECONDS)
+            self._wake.clear()
+            self.flush_all(only_due=True)
+
+
 class ProcessLogger(threading.Thread):
-    def __init__(self, process, prefix, logfp, error_keyword=None, exit_function=None):
+    def __init__(
+        self,
+        process,
+        prefix,
+        logfp,
+        error_keyword=None,
+        exit_function=None,
+        sink: Optional[BufferedLogSink] = None,
+    ):
         """
 
         :param process:
@@ -15,26 +178,31 @@ class ProcessLogger(threading.Thread):
         :param logfp:
         :param error_keyword: If this error keyword is found, stop the ProcessLogger and call the exit function
         :param exit_function: A function that is called if the process exits
+        :param sink: Where to write the log, defaults to a BufferedLogSink of logfp
         """
         threading.Thread.__init__(self)
         self.should_terminate = False
         self.process = process
         self.prefix = prefix
         self.logfp: IO = logfp
+        self.sink: Optional[BufferedLogSink] = sink or (
+            BufferedLogSink(logfp) if logfp else None
+        )
         self.rc = None
         self.error_keyword = error_keyword
         self.exit_function = exit_function
 
-        self.last_write = datetime.now()
-
         self.start()
 
+    def write_log(self, line: str):
+        if self.sink:
+            self.sink.write(line)
+
     def terminate(self):
         self.should_terminate = True
-        if self.logfp:
+        if self.sink:
             try:
-                self.logfp.flush()
-                os.fsync(self.logfp.fileno())
+                self.sink.close()
             except Exception as e:
                 # This isn't a proper error, there's nothing we could do
                 # and doesn't prohibit the rest of the shutdown of Janis.
@@ -51,6 +219,8 @@ class ProcessLogger(threading.Thread):
                 if rc is not None:
                     # process has terminated
                     self.rc = rc
+                    if self.sink:
+                        self.sink.sync()
                     print("Process has ended")
                     if self.exit_function:
                         self.exit_function(rc)
@@ -66,20 +236,13 @@ class ProcessLogger(threading.Thread):
                 # log to debug / critical the self.prefix + line
                 (Logger.critical if has_error else Logger.debug)(self.prefix + line)
 
-                should_write = (datetime.now() - self.last_write).total_seconds() > 5
-
-                if self.logfp and not self.logfp.closed:
-                    self.logfp.write(line + "\n")
-                    if should_write:
-                        self.last_write = datetime.now()
-                        self.logfp.flush()
-                        os.fsync(self.logfp.fileno())
+                self.write_log(line)
 
                 if has_error:
                     # process has terminated
                     self.rc = rc
-                    self.logfp.flush()
-                    os.fsync(self.logfp.fileno())
+                    if self.sink:
+                        self.sink.sync()
 
                     print("Process has ended")
                     if self.exit_function:
@@ -0,0 +1,71 @@
+import shutil
+import sys
+from typing import Optional, TextIO
+
+# ANSI escape sequences
+CURSOR_HOME = "\033[H"
+CLEAR_SCREEN = "\033[2J"
+CLEAR_TO_END_OF_LINE = "\033[K"
+CLEAR_TO_END_OF_SCREEN = "\033[J"
+
+
+class Screen:
+    """
+    Redraws text in place with ANSI cursor control, rather than calling
+    out to 'clear' (a subprocess) for every update.
+
+    While it's refreshing, output is limited to the height of the terminal, as
+    anything that scrolls off the top can't be redrawn. The final update (which
+    won't be redrawn) is always shown in full. If the stream isn't a terminal
+    (eg: redirected to a file), each update is just printed in full after the last.
+    """
+
+    def __init__(
+        self, stream: Optional[TextIO] = None, full_output_hint: Optional[str] = None
+    ):
+        """
+        :param full_output_hint: How to see everything, shown when the output is
+            limited (eg: 'janis watch <wid> --once')
+        """
+        self.stream = stream or sys.stdout
+        self.full_output_hint = full_output_hint
+        self.is_terminal = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.has_drawn = False
+
+    def draw(self, text: str, final=False):
+        """
+        :param final: This is the last update, so show all of it
+        """
+        if not self.is_terminal:
+            self.stream.write(text + "\n")
+            self.stream.flush()
+            return
+
+        # clear the whole screen the first time, so we don't leave the previous
+        # command's output above ours, and after that just overwrite each line.
+        prefix = CURSOR_HOME if self.has_drawn else CLEAR_SCREEN + CURSOR_HOME
+        lines = text.split("\n") if final else self.limit_lines(text)
+        lines = [line + CLEAR_TO_END_OF_LINE for line in lines]
+        self.stream.write(prefix + "\n".join(lines) + "\n" + CLEAR_TO_END_OF_SCREEN)
+        self.stream.flush()
+        self.has_drawn = True
+
+    def get_height(self) -> int:
+        return shutil.get_terminal_size().lines
+
+    def get_width(self) -> int:
+        return shutil.get_terminal_size().columns
+
+    def limit_lines(self, text: str):
+        lines = text.split("\n")
+        # leave a line for the cursor, otherwise the terminal scrolls
+        height = self.get_height() - 1
+        if height < 2 or len(lines) <= height:
+            return lines
+
+        hidden = len(lines) - height + 1
+        message = f"... {hidden} more lines"
+        if self.full_output_hint:
+            message += f" (to see everything: {self.full_output_hint})"
+        # a long hint would wrap onto a second line in a narrow terminal
+        return [*lines[: height - 1], message[: self.get_width()]]
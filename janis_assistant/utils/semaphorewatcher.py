@@ -0,0 +1,124 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import threading
+from typing import Callable, List, Optional
+
+from janis_core.utils.logger import Logger
+
+# from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+
+
+def _get_inotify_fd(directory: str) -> Optional[int]:
+    """
+    Returns a non-blocking inotify file descriptor watching for files being written
+    to the directory, or None if inotify isn't available (eg: not Linux).
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            return None
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_CREATE | IN_CLOSE_WRITE | IN_MODIFY | IN_MOVED_TO
+        mask |= IN_DELETE_SELF | IN_MOVE_SELF
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except Exception as e:
+        Logger.debug(f"Couldn't watch '{directory}' with inotify: {repr(e)}")
+        return None
+
+
+class SemaphoreWatcher(threading.Thread):
+    """
+    Calls on_semaphore(name) once when any of the semaphore files appear in the directory.
+
+    On Linux the directory is watched with inotify, so we're woken up immediately for
+    semaphores written from this host. Inotify doesn't see writes from other hosts on
+    network filesystems (NFS / Lustre), so we still check for the files every
+    fallback_interval seconds (or every poll_interval if inotify isn't available).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        semaphores: List[str],
+        on_semaphore: Callable[[str], None],
+        poll_interval: float = 2,
+        fallback_interval: float = 15,
+    ):
+        threading.Thread.__init__(self, daemon=True)
+        self.directory = directory
+        self.semaphores = semaphores
+        self.on_semaphore = on_semaphore
+        self.poll_interval = poll_interval
+        self.fallback_interval = fallback_interval
+
+        self.should_terminate = False
+        self._stop_read, self._stop_write = os.pipe()
+        self._inotify_fd = _get_inotify_fd(directory)
+
+    def terminate(self):
+        if self.should_terminate:
+            return
+        self.should_terminate = True
+        try:
+            # wake up the select in wait_for_change
+            os.write(self._stop_write, b"x")
+        except OSError:
+            # the watcher has already stopped
+            pass
+        os.close(self._stop_write)
+
+    def check_semaphores(self) -> Optional[str]:
+        for semaphore in self.semaphores:
+            if os.path.exists(os.path.join(self.directory, semaphore)):
+                return semaphore
+        return None
+
+    def run(self):
+        try:
+            while not self.should_terminate:
+                semaphore = self.check_semaphores()
+                if semaphore:
+                    Logger.log(f"Found semaphore '{semaphore}'")
+                    return self.on_semaphore(semaphore)
+
+                self.wait_for_change()
+        finally:
+            for fd in (self._inotify_fd, self._stop_read):
+                if fd is not None:
+                    os.close(fd)
+
+    def wait_for_change(self):
+        fds = [self._stop_read]
+        timeout = self.poll_interval
+        if self._inotify_fd is not None:
+            fds.append(self._inotify_fd)
+            timeout = self.fallback_interval
+
+        readable, _, _ = select.select(fds, [], [], timeout)
+        if self._inotify_fd in readable:
+            try:
+                # we only care that something changed, so just drain the events
+                while os.read(self._inotify_fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+            if not os.path.isdir(self.directory):
+                # the directory was removed, and our watch went with it
+                Logger.debug(
+                    f"Semaphore directory '{self.directory}' was removed, falling back to polling"
+                )
+                os.close(self._inotify_fd)
+                self._inotify_fd = None
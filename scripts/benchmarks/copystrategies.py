@@ -0,0 +1,81 @@
+"""
+Measure how long each local copy strategy (janis_assistant.utils.filecopy) takes.
+
+    python scripts/benchmarks/copystrategies.py --size-mb 4096 --source-dir /scratch/a --dest-dir /scratch/b
+
+Use a source-dir and dest-dir on the filesystems you want to compare (eg: the
+Cromwell execution dir and the output dir). Strategies the filesystems don't
+support are reported as unsupported rather than silently falling back.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from janis_assistant.utils.filecopy import (
+    CopyStrategy,
+    DEFAULT_COPY_STRATEGIES,
+    copy_file,
+    clear_copy_strategy_cache,
+)
+
+
+def write_file(path: str, size_mb: int):
+    chunk = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def benchmark(source: str, dest_dir: str, strategy: CopyStrategy, repeats: int):
+    timings = []
+    for i in range(repeats):
+        dest = os.path.join(dest_dir, f"{strategy}-{i}.bin")
+        clear_copy_strategy_cache()
+        start = time.perf_counter()
+        try:
+            copy_file(source, dest, [strategy])
+            with open(dest, "rb+") as f:
+                os.fsync(f.fileno())
+        except Exception as e:
+            return None, str(e)
+        finally:
+            timings.append(time.perf_counter() - start)
+            if os.path.exists(dest):
+                os.remove(dest)
+    return min(timings), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--source-dir", help="Defaults to a temporary directory")
+    parser.add_argument("--dest-dir", help="Defaults to the source-dir")
+    args = parser.parse_args()
+
+    source_dir = tempfile.mkdtemp(dir=args.source_dir)
+    dest_dir = tempfile.mkdtemp(dir=args.dest_dir or args.source_dir)
+    try:
+        source = os.path.join(source_dir, "source.bin")
+        print(f"Writing {args.size_mb} MB to {source}")
+        write_file(source, args.size_mb)
+
+        print(f"{'strategy':<16} {'seconds':>10} {'MB/s':>10}")
+        for strategy in DEFAULT_COPY_STRATEGIES:
+            best, error = benchmark(source, dest_dir, strategy, args.repeats)
+            if error:
+                print(f"{str(strategy):<16} {'unsupported':>21}  ({error})")
+            else:
+                print(f"{str(strategy):<16} {best:>10.3f} {args.size_mb / best:>10.1f}")
+    finally:
+        shutil.rmtree(source_dir, ignore_errors=True)
+        shutil.rmtree(dest_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compare the timestamp codec (janis_assistant.utils.dateutils) with dateutil.
+
+    python scripts/benchmarks/timestamps.py --jobs 5000 --polls 20
+
+Simulates polling Cromwell metadata for a workflow with --jobs calls: each poll
+parses every call's start and end timestamps again, and writes them to (and reads
+them back from) the database.
+"""
+
+import argparse
+import random
+import time
+from datetime import timedelta
+
+from dateutil import parser as dateparser, tz
+
+from janis_assistant.utils.dateutils import DateUtil, _parse_iso_str
+
+
+def generate_timestamps(n: int):
+    start = DateUtil.now() - timedelta(days=7)
+    stamps = []
+    for _ in range(n):
+        d = start + timedelta(seconds=random.uniform(0, 7 * 24 * 3600))
+        # Cromwell's format, eg: 2020-10-01T02:03:04.567Z
+        millis = f"{d.microsecond // 1000:03d}"
+        stamps.append(d.strftime("%Y-%m-%dT%H:%M:%S.") + millis + "Z")
+    return stamps
+
+
+def timeit(f, stamps, polls):
+    start = time.perf_counter()
+    for _ in range(polls):
+        for s in stamps:
+            f(s)
+    return time.perf_counter() - start
+
+
+def dateutil_path(s):
+    # how timestamps were parsed and stored before
+    d = dateparser.parse(s).astimezone(tz.UTC)
+    return dateparser.parse(str(d)).astimezone(tz.UTC)
+
+
+def codec_path(s):
+    d = DateUtil.parse_iso(s)
+    return DateUtil.parse_iso(DateUtil.to_epoch_micros(d))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--polls", type=int, default=20)
+    args = parser.parse_args()
+
+    # a start and an end per call
+    stamps = generate_timestamps(2 * args.jobs)
+    n = len(stamps) * args.polls
+
+    results = [("dateutil", timeit(dateutil_path, stamps, args.polls))]
+
+    _parse_iso_str.cache_clear()
+    results.append(("codec (cold)", timeit(codec_path, stamps, 1) * args.polls))
+    results.append(("codec (memoised)", timeit(codec_path, stamps, args.polls)))
+
+    print(f"{len(stamps)} timestamps, {args.polls} polls")
+    print(f"{'path':<18} {'seconds':>10} {'us/stamp':>10} {'speedup':>10}")
+    baseline = results[0][1]
+    for name, seconds in results:
+        print(
+            f"{name:<18} {seconds:>10.3f} {seconds / n * 10 ** 6:>10.2f}"
+            f" {baseline / seconds:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()